@@ -1,11 +1,17 @@
+import os
+import sys
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import driver_factory
+import driver_daemon
+
 def get_country_text(li_element):
     """
     Verilen li elementi içerisinde <a> etiketi varsa onun metnini,
@@ -37,11 +43,14 @@ def is_best_sellers_text(text):
             return True
     return False
 
-# ChromeDriver ayarları
-options = webdriver.ChromeOptions()
-options.add_argument("--disable-notifications")
-service = Service("/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver")
-driver = webdriver.Chrome(service=service, options=options)
+# ChromeDriver ayarları: ürün görselleri okunmadığı için görseller, reklamlar,
+# izleyiciler, yazı tipleri ve videolar engellenir. driver_daemon çalışıyorsa
+# ısıtılmış bir tarayıcı kiralanır.
+driver = driver_daemon.acquire_driver(
+    "amazon",
+    "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver",
+    arguments=["--disable-notifications"],
+)
 wait = WebDriverWait(driver, 10)
 
 try:
@@ -95,7 +104,7 @@ try:
             break
     if not country_found:
         print(f"'{desired_country}' listede bulunamadı.")
-        driver.quit()
+        driver_factory.quit_driver(driver)
         exit()
 
     # Onay butonuna tıklıyoruz.
@@ -113,6 +122,8 @@ try:
     all_windows = driver.window_handles
     if len(all_windows) > 1:
         driver.switch_to.window(all_windows[-1])
+        # Engelleme profili sekme başına uygulandığı için yeni sekmeye de uygula
+        driver_factory.apply_to_current(driver)
         print("Yeni açılan sekmeye geçildi.")
     else:
         print("Yeni sekme açılmadı, mevcut sekme üzerinden devam ediyor.")
@@ -279,6 +290,7 @@ try:
         driver.execute_script("window.scrollBy(0, 500);")
         time.sleep(3)
         print(f"{i+1}. alt kategori sayfası URL: {driver.current_url}")
+        driver_factory.measure_page(driver, "amazon_subcategory")
 
         # Ürün etkileşimine geçmeden (şimdilik boşveriyoruz) sadece bekleyip geri dönüyoruz.
         driver.back()
@@ -290,4 +302,5 @@ try:
 except Exception as e:
     print("Bir hata oluştu:", e)
 finally:
-    driver.quit()
\ No newline at end of file
+    driver_factory.quit_driver(driver)
+    driver_factory.stats.log_summary(log=print)
\ No newline at end of file
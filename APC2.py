@@ -4,19 +4,25 @@ import time
 import json
 import requests
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.service import Service
 from TRENDYOL import aybtrend  # Kendi modülünüz
-
-# Chromedriver servisini başlatma
-service = Service("/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver")
-driver = webdriver.Chrome(service=service)
+import crawl_journal
+import driver_factory
+import driver_daemon
+import normalize
+
+# Chromedriver servisini başlatma: driver_daemon çalışıyorsa ısıtılmış bir tarayıcı kiralanır.
+# Galeri görselleri ekranda gezildiği için görseller açık bırakılır.
+driver = driver_daemon.acquire_driver(
+    "trendyol",
+    "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver",
+    block_images=False,
+)
 
 # Arama terimi
 search_term = "elbise"
@@ -29,14 +35,23 @@ category_folder = os.path.join(os.getcwd(), search_term.replace(" ", "_"))
 if not os.path.exists(category_folder):
     os.makedirs(category_folder)
 
+# Yeniden başlatmada tamamlanmış ürünleri atlamak için tarama günlüğü
+journal = crawl_journal.CrawlJournal(os.path.join(category_folder, crawl_journal.DEFAULT_JOURNAL_NAME))
+
 def process_product(link_xpath, product_index):
+    link_url = None
+    navigated = False
     try:
         # Ürün linkini bulup detay sayfasına git
         link_element = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.XPATH, link_xpath))
         )
         link_url = link_element.get_attribute("href")
+        if journal.is_done(link_url):
+            print(f"Ürün {product_index} daha önce tamamlanmış, atlanıyor: {link_url}")
+            return
         driver.get(link_url)
+        navigated = True
         driver.fullscreen_window()
         time.sleep(3)
 
@@ -78,11 +93,8 @@ def process_product(link_xpath, product_index):
         # Klasör isimlerinde dosya ismi için geçersiz karakterleri temizleyelim
         product_folder_name = re.sub(r'[\\/*?:"<>|]', "", product_name)
         # review bilgisindeki sayı değeri kontrol edelim (200'ün üzerindeyse "(potential)" ibaresi ekleyelim)
-        try:
-            # Sadece rakamları alıp integer'a çeviriyoruz
-            review_digits = int(''.join(filter(str.isdigit, product_details.get('review', '0'))))
-        except Exception:
-            review_digits = 0
+        # Sadece rakamları alıp integer'a çeviriyoruz
+        review_digits = normalize.parse_count(product_details.get('review')) or 0
 
         if review_digits > 200:
             product_folder_name += " (potential)"
@@ -132,13 +144,22 @@ def process_product(link_xpath, product_index):
             except Exception as e:
                 print(f"Görsel indirme sırasında hata oluştu ({product_index}-{i}): {e}")
 
+        # Günlüğe galeri adımı da bittikten sonra yazılır; yarıda kalan ürün yeniden denenir
+        if product_details.get('name'):
+            journal.mark_done(link_url, product_folder)
+        else:
+            journal.mark_failed(link_url, "ürün adı bulunamadı")
+
     except Exception as e:
         print(f"Ürün işlenirken hata oluştu: {e}")
+        if link_url:
+            journal.mark_failed(link_url, e)
 
     finally:
         # Ürün detay sayfasından geri dön
-        driver.back()
-        time.sleep(3)
+        if navigated:
+            driver.back()
+            time.sleep(3)
 
 # Ürünleri sırayla işleme
 # Örneğin: 4 ile 20 arasında ürünleri işlemek isteyebilirsiniz
@@ -154,4 +175,5 @@ for product_index in range(start_index, end_index):
         time.sleep(2)
 
 # Tarayıcıyı kapatıyoruz
-driver.quit()
\ No newline at end of file
+journal.close()
+driver_factory.quit_driver(driver)
\ No newline at end of file
@@ -1,4 +1,3 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -12,18 +11,22 @@ import os
 import re
 from pathlib import Path
 from TRENDYOL import aybtrend
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 import os
 import re
 import time
 import json
 import requests
+import crawl_journal
+import driver_factory
+import driver_daemon
 
 
-# WebDriver kurulumu
-service = Service("/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver")
-driver = webdriver.Chrome(service=service)
+# WebDriver kurulumu: driver_daemon çalışıyorsa ısıtılmış bir tarayıcı kiralanır.
+driver = driver_daemon.acquire_driver(
+    "trendyol",
+    "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver",
+    block_images=False,
+)
 
 # Arama terimi ve ana klasör oluşturma
 search_term = "elbise"
@@ -31,11 +34,16 @@ sanitized_search_term = re.sub(r'[\\/*?:"<>|&]', '_', search_term).strip()
 main_folder = Path(sanitized_search_term)
 main_folder.mkdir(parents=True, exist_ok=True)
 
+# Yeniden başlatmada tamamlanmış ürünleri atlamak için tarama günlüğü
+journal = crawl_journal.CrawlJournal(main_folder / crawl_journal.DEFAULT_JOURNAL_NAME)
+
 aybtrend.search_trendyol(driver, search_term)
 driver.fullscreen_window()
 time.sleep(3)
 
 def process_product(link_xpath, product_index):
+    link_url = None
+    navigated = False
     try:
         # Ürün elementini bul ve scroll et
         link_element = WebDriverWait(driver, 10).until(
@@ -46,7 +54,11 @@ def process_product(link_xpath, product_index):
         
         # Ürün detay sayfasına git
         link_url = link_element.get_attribute('href')
+        if journal.is_done(link_url):
+            print(f"Ürün {product_index} daha önce tamamlanmış, atlanıyor: {link_url}")
+            return
         driver.get(link_url)
+        navigated = True
         time.sleep(3)
 
         # Konum bilgisi atlama
@@ -100,11 +112,20 @@ def process_product(link_xpath, product_index):
         except Exception as e:
             print(f"Görsel indirme hatası: {str(e)}")
 
+        # Günlüğe görseller de indirildikten sonra yazılır; yarıda kalan ürün yeniden denenir
+        if product_details['name']:
+            journal.mark_done(link_url, product_folder)
+        else:
+            journal.mark_failed(link_url, "ürün adı bulunamadı")
+
     except Exception as e:
         print(f"Genel hata: {str(e)}")
+        if link_url:
+            journal.mark_failed(link_url, e)
     finally:
-        driver.back()
-        time.sleep(2)
+        if navigated:
+            driver.back()
+            time.sleep(2)
 
 # Ürünleri işleme döngüsü
 for idx in range(2, 20):
@@ -121,4 +142,5 @@ for idx in range(2, 20):
         print(f"Ürün {idx} işlenemedi: {str(e)}")
         continue
 
-driver.quit()
\ No newline at end of file
+journal.close()
+driver_factory.quit_driver(driver)
\ No newline at end of file
@@ -1,13 +1,23 @@
 import os
+import sys
 import json
 import base64
 import requests
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EBAY import category_tree
+
+DEFAULT_CATEGORY_ID = "63863"
+
 class eBayProductUploader:
-    def __init__(self, ebay_token, folder_path):
+    def __init__(self, ebay_token, folder_path, categories=None):
         self.ebay_token = ebay_token
         self.folder_path = folder_path
         self.api_url = "https://api.ebay.com/ws/api.dll"
+        # GetCategories önbelleği (category_tree.CategoryTree); None ise kategori doğrulanmaz
+        self.categories = categories
 
     def get_product_data(self):
         """
@@ -136,6 +146,31 @@ class eBayProductUploader:
         specifics_xml += "</ItemSpecifics>"
         return specifics_xml
 
+    def resolve_category_id(self, product_data):
+        """
+        JSON'daki CategoryID'yi ya da CategoryPath'i ("A > B > C" veya liste)
+        kategori ağacından çözer. Ağaç yoksa ya da eşleşme bulunamazsa
+        CategoryID (o da yoksa varsayılan kategori) kullanılır.
+        """
+        category_id = str(product_data.get("CategoryID", "")).strip()
+        category_path = product_data.get("CategoryPath")
+        if self.categories is None:
+            return category_id or DEFAULT_CATEGORY_ID
+        if not category_id and category_path:
+            category_id = self.categories.id_for_path(category_path)
+            if category_id is None:
+                print(f"⚠️ Kategori yolu ağaçta bulunamadı: {category_path}")
+        if not category_id:
+            category_id = DEFAULT_CATEGORY_ID
+        if category_id not in self.categories:
+            print(f"⚠️ {category_id} kategori ağacında yok (sürüm {self.categories.version}).")
+        elif not self.categories.is_leaf(category_id):
+            print(f"⚠️ {category_id} ({self.categories.path_text(category_id)}) yaprak kategori değil; "
+                  f"eBay yalnızca yaprak kategorilerde listelemeye izin verir.")
+        else:
+            print(f"Kategori: {category_id} ({self.categories.path_text(category_id)})")
+        return category_id
+
     def list_product_on_ebay(self):
         """
         JSON'daki ürün bilgilerini ve klasördeki resimleri alarak
@@ -147,7 +182,7 @@ class eBayProductUploader:
         # JSON'dan ürün bilgilerini okuyalım
         title = product_data.get("Title", "Test Ürünü")
         description = product_data.get("Description", "Açıklama girilmedi.")
-        category_id = product_data.get("CategoryID", "63863")
+        category_id = self.resolve_category_id(product_data)
         start_price = product_data.get("StartPrice", "9.99")
         currency = product_data.get("Currency", "USD")
         condition_id = product_data.get("ConditionID", "1000")
@@ -232,5 +267,8 @@ if __name__ == "__main__":
     # Ürün görsellerinin ve product.json dosyasının bulunduğu klasör
     folder_path = "/Users/ayberkturk/ayb/Trendyol_Products/Kadın/Mavi ceket"
 
-    uploader = eBayProductUploader(ebay_token, folder_path)
+    # Kategori ağacı yalnızca eBay yeni bir CategoryVersion bildirdiğinde yeniden indirilir
+    categories = category_tree.load_or_refresh(ebay_token)
+
+    uploader = eBayProductUploader(ebay_token, folder_path, categories)
     uploader.list_product_on_ebay()
\ No newline at end of file
@@ -1,21 +1,59 @@
+import os
+import sys
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import csv
 import time
 from selenium.webdriver.chrome.service import Service
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EBAY import category_tree
+
 
 class EBayCategoryExplorer:
-    def __init__(self):
+    def __init__(self, categories=None):
         service = Service("/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver")
         self.driver = webdriver.Chrome(service=service)
         self.wait = WebDriverWait(self.driver, 15)
         self.base_url = "https://www.ebay.com/"
+        # GetCategories önbelleği (category_tree.CategoryTree); varsa menülere hover yapılmaz
+        self.categories = categories
         self.category_data = {}
+        self.category_ids = {}
+
+    def read_product_count(self):
+        try:
+            count_element = self.wait.until(
+                EC.presence_of_element_located((By.XPATH, '//*[@class="srp-controls__count-heading"]'))
+            )
+            return count_element.text.split()[0]
+        except TimeoutException:
+            return "N/A"
+
+    def navigate_tree_categories(self, level=2):
+        """
+        Kategori ağacındaki belirli seviyedeki (varsayılan: ana kategorilerin
+        hemen altı) her kategorinin arama sayfasını doğrudan açar ve ürün
+        sayısını okur; menü, hover ve geri dönüş yoktur.
+        """
+        for category_id in self.categories.at_level(level):
+            category_name = self.categories.path_text(category_id)
+            try:
+                self.driver.get(f"{self.base_url}sch/{category_id}/i.html")
+                self.category_data[category_name] = self.read_product_count()
+                self.category_ids[category_name] = category_id
+            except Exception as e:
+                print(f"Hata oluştu ({category_name}): {str(e)}")
 
     def navigate_categories(self):
+        if self.categories is not None:
+            self.navigate_tree_categories()
+            return
         self.driver.get(self.base_url)
         
         # Ana kategori menüsünü bul (vl-flyout-nav)
@@ -49,15 +87,7 @@ class EBayCategoryExplorer:
                     sub_category.click()
                     
                     # Ürün sayısını al
-                    try:
-                        count_element = self.wait.until(
-                            EC.presence_of_element_located((By.XPATH, '//*[@class="srp-controls__count-heading"]'))
-                        )
-                        product_count = count_element.text.split()[0]
-                    except TimeoutException:
-                        product_count = "N/A"
-                    
-                    self.category_data[category_name] = product_count
+                    self.category_data[category_name] = self.read_product_count()
                     self.driver.back()
                     time.sleep(2)
                     
@@ -66,13 +96,15 @@ class EBayCategoryExplorer:
                 continue
 
     def export_data(self):
-        with open('ebay_categories.csv', 'w') as f:
-            f.write("Category,ProductCount\n")
+        with open('ebay_categories.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["CategoryID", "Category", "ProductCount"])
             for cat, count in self.category_data.items():
-                f.write(f"{cat},{count}\n")
+                writer.writerow([self.category_ids.get(cat, ""), cat, count])
 
 # Kullanım
 if __name__ == "__main__":
-    explorer = EBayCategoryExplorer()
+    # Kayıtlı GetCategories ağacı varsa menüler taranmaz (bkz. python -m EBAY.category_tree --token ...)
+    explorer = EBayCategoryExplorer(category_tree.CategoryTree.load())
     explorer.navigate_categories()
     explorer.export_data()
\ No newline at end of file
@@ -1,6 +1,7 @@
 import json
 import time
 import os
+import sys
 import re
 import requests
 from selenium import webdriver
@@ -8,6 +9,11 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EBAY import card_extract
+
 class EnhancedProductCollectorAI:
     def __init__(self, driver_path):
         service = Service(driver_path)
@@ -69,25 +75,21 @@ class EnhancedProductCollectorAI:
             return 0
 
     def scrape_products(self):
-        product_elements = self.driver.find_elements(By.CSS_SELECTOR, "li.brwrvr__item-card.brwrvr__item-card--list")
+        # Tüm kartlar ve "sold" süzgeci tarayıcıda, tek execute_script çağrısıyla
+        cards = card_extract.extract_cards(self.driver)
         products_data = []
         
-        for product in product_elements:
+        for card in cards:
             try:
-                container = product.find_element(By.XPATH, "./div/div/div[2]")
-                container_text = container.text.strip()
-                
-                if "sold" not in container_text.lower():
-                    continue
-
                 # Ürün Detaylarını Topla
                 product_data = {
-                    "title": self._extract_product_title(container),
-                    "price": self._extract_product_price(container),
-                    "condition": self._extract_product_condition(container),
-                    "shipping_info": self._extract_shipping_info(container),
-                    "sold_status": self._extract_sold_status(container),
-                    "image_path": self._download_product_image(product)
+                    "title": card["title"] or "Başlık bulunamadı",
+                    "price": card["price"] or "Fiyat bilgisi yok",
+                    "condition": card["condition"] or "Durum bilgisi yok",
+                    "shipping_info": card["shipping"] or "Kargo bilgisi yok",
+                    "sold_status": card["sold"] or "Satış bilgisi yok",
+                    "url": card["url"],
+                    "image_path": self._download_product_image(card["image_url"], card["title"] or "")
                 }
 
                 products_data.append(product_data)
@@ -99,46 +101,12 @@ class EnhancedProductCollectorAI:
         if products_data:
             self._save_to_json(products_data)
 
-    def _extract_product_title(self, container):
-        try:
-            return container.find_element(By.CSS_SELECTOR, "div.brwrvr__item-title").text.strip()
-        except Exception:
-            return "Başlık bulunamadı"
-
-    def _extract_product_price(self, container):
-        try:
-            return container.find_element(By.CSS_SELECTOR, "span.brwrvr__item-price").text.strip()
-        except Exception:
-            return "Fiyat bilgisi yok"
-
-    def _extract_product_condition(self, container):
-        try:
-            return container.find_element(By.CSS_SELECTOR, "div.brwrvr__item-condition").text.strip()
-        except Exception:
-            return "Durum bilgisi yok"
-
-    def _extract_shipping_info(self, container):
-        try:
-            return container.find_element(By.CSS_SELECTOR, "div.brwrvr__item-shipping").text.strip()
-        except Exception:
-            return "Kargo bilgisi yok"
-
-    def _extract_sold_status(self, container):
-        try:
-            return container.find_element(By.CSS_SELECTOR, "div.brwrvr__item-sold").text.strip()
-        except Exception:
-            return "Satış bilgisi yok"
-
-    def _download_product_image(self, product_element):
+    def _download_product_image(self, image_url, product_title):
         try:
-            img_element = product_element.find_element(By.XPATH, ".//img")
-            image_url = img_element.get_attribute("src")
-            
             if not image_url:
                 return None
 
             # Dosya adını oluştur
-            product_title = self._extract_product_title(product_element)
             safe_title = re.sub(r'[^a-zA-Z0-9_]', '', product_title)[:30]
             timestamp = str(int(time.time()))
             filename = f"{safe_title}_{timestamp}.jpg"
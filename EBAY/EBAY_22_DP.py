@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -8,12 +9,24 @@ from selenium.common.exceptions import NoSuchElementException, ElementClickInter
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EBAY import card_extract
+from EBAY import card_screenshots
+from EBAY import category_crawler
+
+# Kart sırası (urun_<indeks> klasörleri) bu seçiciye göre sayılır
+PRODUCT_CARD_SELECTOR = "li.brwrvr__item-card.brwrvr__item-card--list"
+
 class ProductCollectorAI:
     def __init__(self, driver_path):
         service = Service(driver_path)
         options = webdriver.ChromeOptions()
         options.add_argument("--start-maximized")
         self.driver = webdriver.Chrome(service=service, options=options)
+        # Kartların ekran görüntüleri bant yakalamalarından kırpılır
+        self.screenshotter = card_screenshots.CardScreenshotter(self.driver, card_selector=PRODUCT_CARD_SELECTOR)
         
         self.base_dir = "ebay_data"
         os.makedirs(self.base_dir, exist_ok=True)
@@ -23,140 +36,67 @@ class ProductCollectorAI:
         time.sleep(2)
     
     def explore_main_categories(self):
-        """Sadece belirli ana kategorileri işler (li[3] ile li[11] arası)"""
-        main_categories = list(range(4, 12))  # li[3] - li[11]
-        for i in main_categories:
-            xpath = f'//*[@id="vl-flyout-nav"]/ul/li[{i}]'
-            try:
-                category_element = self.driver.find_element(By.XPATH, xpath)
-                category_name = category_element.text.strip().replace("/", "-")
-                print(f"\n[ANA KATEGORI] {category_name}")
-                category_element.click()
-                time.sleep(2)
-                
-                # Alt kategori işlemleri için kök klasör oluştur
-                category_dir = os.path.join(self.base_dir, category_name)
-                os.makedirs(category_dir, exist_ok=True)
-                
-                # Alt kategori işlemleri
-                self.process_category_level(category_path=[category_name])
-                
-                self.driver.back()
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"Ana kategori hatası: {str(e)}")
-                continue
-    
+        """
+        Sadece belirli ana kategorileri işler (li[4] ile li[11] arası). Menüye
+        tıklanmaz; kategori adresleri okunup tek bir kuyruğa eklenir ve tüm
+        ağaç genişlik öncelikli, her sayfa bir kez açılarak gezilir.
+        """
+        crawler = category_crawler.CategoryCrawler(self.driver)
+        for category_name, url in category_crawler.main_category_links(self.driver, range(4, 12)):
+            print(f"\n[ANA KATEGORI] {category_name}")
+            # Alt kategori işlemleri için kök klasör oluştur
+            os.makedirs(os.path.join(self.base_dir, category_name), exist_ok=True)
+            crawler.seed(url, [category_name])
+        self.save_category_tree(crawler.crawl(self.collect_category_products))
+
     def process_category_level(self, category_path, section_type=None):
         """
-        Rekürsif kategori işleme fonksiyonu
-        section_type: closed (section2) veya open (section1)
+        Geçerli sayfadaki kategoriyi ve altındaki tüm seviyeleri işler.
+        section_type: closed (section2) veya open (section1); verilmezse önce
+        kapalı, sonra açık kategoriler okunur. Alt seviyelerde kapalılar okunur.
         """
-        try:
-            # Önce kapalı kategorileri kontrol et (section2)
-            if not section_type or section_type == "closed":
-                self.check_and_process_section(
-                    category_path=category_path,
-                    section_num=2,
-                    section_type="closed"
-                )
-            
-            # Sonra açık kategorileri kontrol et (section1)
-            if not section_type or section_type == "open":
-                self.check_and_process_section(
-                    category_path=category_path,
-                    section_num=1,
-                    section_type="open"
-                )
-                
-        except Exception as e:
-            print(f"Kategori işleme hatası: {str(e)}")
-    
-    def check_and_process_section(self, category_path, section_num, section_type):
-        """Belirli bir section'daki kategorileri işler"""
-        section_xpath = f'/html/body/div[2]/div[2]/section[2]/section[{section_num}]/div/ul'
-        try:
-            section = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, section_xpath))
-            )
-            
-            categories = section.find_elements(By.TAG_NAME, "li")
-            print(f"  Bulunan {section_type} kategoriler: {len(categories)}")
-            
-            for idx, cat in enumerate(categories, 1):
-                try:
-                    cat_name = cat.text.strip().replace("/", "-")
-                    if not cat_name: continue
-                    
-                    print(f"\n  [{section_type.upper()} KATEGORI] {cat_name}")
-                    
-                    # Klasör yapısını oluştur
-                    current_path = category_path + [cat_name]
-                    dir_path = os.path.join(self.base_dir, *current_path)
-                    os.makedirs(dir_path, exist_ok=True)
-                    
-                    # Kategoriye tıkla ve işle
-                    cat.click()
-                    time.sleep(1.5)
-                    
-                    # Ürün kontrolü yap
-                    product_count = self.get_product_count()
-                    
-                    if product_count > 0:
-                        print(f"  !! Ürün bulundu ({product_count} adet), veri toplanıyor...")
-                        self.scrape_products(current_path)
-                        self.driver.back()
-                        time.sleep(1.5)
-                    else:
-                        # Derin kategorileri kontrol et
-                        print("  Ürün bulunamadı, derin kategoriler aranıyor...")
-                        self.process_category_level(
-                            category_path=current_path,
-                            section_type="closed"  # Önce kapalıları kontrol et
-                        )
-                        self.driver.back()
-                        time.sleep(1.5)
-                        
-                except Exception as e:
-                    print(f"  Alt kategori işleme hatası: {str(e)}")
-                    continue
-                    
-        except Exception:
-            print(f"  {section_type} section bulunamadı")
-    
+        sections = (section_type,) if section_type else (category_crawler.SECTION_CLOSED,
+                                                         category_crawler.SECTION_OPEN)
+        crawler = category_crawler.CategoryCrawler(self.driver, root_sections=sections)
+        crawler.seed(self.driver.current_url, category_path)
+        return crawler.crawl(self.collect_category_products)
+
+    def collect_category_products(self, node):
+        """Ürün kartı olan kategori sayfasında (sürücü o sayfadayken) ürünleri toplar."""
+        os.makedirs(os.path.join(self.base_dir, *node["path"]), exist_ok=True)
+        self.scrape_products(node["path"])
+
+    def save_category_tree(self, nodes):
+        """Gezilen kategorileri (yol, adres, bölüm, seviye, ürün sayısı) kaydeder."""
+        json_path = os.path.join(self.base_dir, "categories.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(nodes, f, indent=2, ensure_ascii=False)
+        print(f"{len(nodes)} kategori sayfası kaydedildi: {json_path}")
+
     def get_product_count(self):
         try:
-            return len(self.driver.find_elements(By.CSS_SELECTOR, "li.brwrvr__item-card.brwrvr__item-card--list"))
+            return len(self.driver.find_elements(By.CSS_SELECTOR, PRODUCT_CARD_SELECTOR))
         except Exception:
             return 0
     
     def scrape_products(self, category_path):
-        products = self.driver.find_elements(By.CSS_SELECTOR, "li.brwrvr__item-card.brwrvr__item-card--list")
-        products_data = []
+        # "sold" süzgeci tarayıcıda; tüm kartlar tek çağrıda okunur
+        cards = card_extract.extract_cards(self.driver, card_selector=PRODUCT_CARD_SELECTOR)
+        jobs = []
+        for card in cards:
+            # Ekran görüntüsü yolu
+            screenshot_path = os.path.join(self.base_dir, *category_path, f"urun_{card['index'] + 1}", "screenshot.png")
+            jobs.append((card, screenshot_path))
+        saved = self.screenshotter.capture(jobs)
         
-        for idx, product in enumerate(products, 1):
-            try:
-                self.scroll_to_element(product)
-                container = product.find_element(By.XPATH, "./div/div/div[2]")
-                text = container.text.strip()
-                
-                if "sold" not in text.lower():
-                    continue
-                
-                # Ekran görüntüsü yolu
-                screenshot_dir = os.path.join(self.base_dir, *category_path, f"urun_{idx}")
-                os.makedirs(screenshot_dir, exist_ok=True)
-                screenshot_path = os.path.join(screenshot_dir, "screenshot.png")
-                product.screenshot(screenshot_path)
-                
-                products_data.append({
-                    "text": text,
-                    "screenshot": screenshot_path
-                })
-                
-            except Exception as e:
-                print(f"  Ürün kaydetme hatası: {str(e)}")
+        products_data = []
+        for card, screenshot_path in jobs:
+            if not saved.get(screenshot_path):
+                continue
+            products_data.append({
+                "text": card["full_text"],
+                "screenshot": screenshot_path
+            })
         
         if products_data:
             json_path = os.path.join(self.base_dir, *category_path, "products.json")
@@ -188,6 +128,7 @@ class ProductCollectorAI:
         time.sleep(0.5)
     
     def close(self):
+        self.screenshotter.close()
         self.driver.quit()
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 import re
 import time
 from selenium import webdriver
@@ -9,6 +10,17 @@ from selenium.common.exceptions import NoSuchElementException, StaleElementRefer
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EBAY import category_crawler
+
+# Bu sürümün sayfa düzeninde kapalı/açık kategori bölümleri
+CATEGORY_SECTION_XPATHS = {
+    category_crawler.SECTION_CLOSED: '//section[@class="b-module b-carousel b-display--landscape"]/section[2]',
+    category_crawler.SECTION_OPEN: '//section[@class="b-module b-carousel b-display--landscape"]/section[1]',
+}
+
 class ProductCollectorAI:
     def __init__(self, driver_path):
         service = Service(driver_path)
@@ -18,7 +30,6 @@ class ProductCollectorAI:
         
         self.base_dir = "ebay_data"
         os.makedirs(self.base_dir, exist_ok=True)
-        self.processed_categories = set()
 
     def sanitize_filename(self, name):
         return re.sub(r'[\\/*?:"<>|]', '', name).strip()[:50]
@@ -30,78 +41,35 @@ class ProductCollectorAI:
         )
 
     def explore_main_categories(self):
-        main_categories = list(range(3, 12))
-        for i in main_categories:
-            try:
-                category = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, f'//*[@id="vl-flyout-nav"]/ul/li[{i}]'))
-                )
-                category_name = self.sanitize_filename(category.text)
-                if not category_name or category_name in self.processed_categories:
-                    continue
-
-                print(f"\n[ANA KATEGORI] {category_name}")
-                category.click()
-                time.sleep(1.5)
-
-                self.process_category_level([category_name])
-                self.processed_categories.add(category_name)
-                self.driver.back()
-                time.sleep(1.5)
-
-            except Exception as e:
-                print(f"Ana kategori hatası: {str(e)}")
-                continue
+        """
+        li[3] ile li[11] arasındaki ana kategorileri işler. Menüye tıklanmaz;
+        kategori adresleri tek bir kuyruğa eklenir ve ağaç genişlik öncelikli,
+        her sayfa bir kez açılarak gezilir (aynı kategori iki kez açılmaz).
+        """
+        crawler = self.create_crawler()
+        for category_name, url in category_crawler.main_category_links(self.driver, range(3, 12)):
+            print(f"\n[ANA KATEGORI] {category_name}")
+            crawler.seed(url, [self.sanitize_filename(category_name)])
+        crawler.crawl(self.handle_product_page)
+
+    def create_crawler(self):
+        # Ana kategoride önce kapalı sonra açık kategoriler, alt seviyelerde b-list listesi okunur
+        return category_crawler.CategoryCrawler(
+            self.driver,
+            root_sections=(category_crawler.SECTION_CLOSED, category_crawler.SECTION_OPEN),
+            child_sections=(category_crawler.SECTION_DEEP,),
+            section_xpaths=CATEGORY_SECTION_XPATHS,
+        )
 
     def process_category_level(self, category_path, depth=0):
-        for section_num in [2, 1]:  # Önce kapalı sonra açık kategoriler
-            try:
-                section = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, f'//section[@class="b-module b-carousel b-display--landscape"]/section[{section_num}]'))
-                )
-                self.process_category_section(section, category_path, depth)
-            except Exception:
-                continue
-
-    def process_category_section(self, section, category_path, depth):
-        categories = section.find_elements(By.XPATH, './/li[contains(@class, "brwrvr__nav-item")]')
-        print(f"  Bulunan kategoriler: {len(categories)}")
-
-        for idx in range(1, len(categories)+1):
-            try:
-                category = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, f'{section.get_attribute("xpath")}/div/ul/li[{idx}]'))
-                )
-                self.process_single_category(category, category_path, depth)
-            except (StaleElementReferenceException, NoSuchElementException):
-                continue
-
-    def process_single_category(self, category, category_path, depth):
-        category_name = self.sanitize_filename(category.text)
-        if not category_name:
-            return
-
-        print(f"\n{'  ' * depth}[KATEGORI] {category_name}")
-        current_path = category_path + [category_name]
-        dir_path = os.path.join(self.base_dir, *current_path)
-        os.makedirs(dir_path, exist_ok=True)
-
-        try:
-            category.click()
-            time.sleep(1.5)
-            
-            if self.handle_product_page(current_path):
-                return
-                
-            self.process_deep_categories(current_path, depth)
-            
-        except Exception as e:
-            print(f"Kategori işleme hatası: {str(e)}")
-        finally:
-            self.driver.back()
-            time.sleep(1.5)
-
-    def handle_product_page(self, current_path):
+        """Geçerli sayfadaki kategoriyi ve altındaki tüm seviyeleri işler."""
+        crawler = self.create_crawler()
+        crawler.seed(self.driver.current_url, category_path)
+        return crawler.crawl(self.handle_product_page)
+
+    def handle_product_page(self, node):
+        current_path = node["path"]
+        os.makedirs(os.path.join(self.base_dir, *current_path), exist_ok=True)
         self.scroll_page()
         products = self.driver.find_elements(By.CSS_SELECTOR, 'li[class*="brwrvr__item-card--"]')
         
@@ -111,25 +79,6 @@ class ProductCollectorAI:
             return True
         return False
 
-    def process_deep_categories(self, current_path, depth):
-        try:
-            deep_section = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, '//section[contains(@class, "b-module b-list")]'))
-            )
-            deep_categories = deep_section.find_elements(By.XPATH, './/li[contains(@class, "brwlv__item")]')
-            
-            for d_idx in range(1, len(deep_categories)+1):
-                try:
-                    deep_category = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, f'{deep_section.get_attribute("xpath")}/div/ul/li[{d_idx}]'))
-                    )
-                    self.process_single_category(deep_category, current_path, depth+1)
-                except Exception:
-                    continue
-                    
-        except Exception:
-            pass
-
     def scrape_products(self, category_path, products):
         products_data = []
         
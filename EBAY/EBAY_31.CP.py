@@ -1,26 +1,49 @@
-import json
 import os
+import sys
 import re
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_ready
+import driver_factory
+import driver_daemon
+import record_sink
+from EBAY import ebay_page
+from EBAY import card_extract
+from EBAY import card_screenshots
+
+# Kart sırası (ekran görüntüsü klasör adlarındaki indeks) bu seçiciye göre sayılır
+PRODUCT_CARD_SELECTOR = "li.brwrvr__item-card.brwrvr__item-card--list"
+
 class ProductCollectorAI:
     def __init__(self, driver_path):
-        service = Service(driver_path)
-        options = webdriver.ChromeOptions()
         # Gerekirse headless modunu açabilirsiniz.
         # options.add_argument("--headless")
-        options.add_argument("--start-maximized")
-        self.driver = webdriver.Chrome(service=service, options=options)
+        # Reklam, izleyici, yazı tipi ve video istekleri engellenir. Ürün kartlarının
+        # ekran görüntüsü alındığı için görseller açık bırakılır.
+        # driver_daemon çalışıyorsa ısıtılmış bir tarayıcı kiralanır.
+        self.driver = driver_daemon.acquire_driver(
+            "ebay",
+            driver_path,
+            arguments=["--start-maximized"],
+            block_images=False,
+        )
         
         # Ekran görüntülerinin kaydedileceği temel klasör
         self.base_screenshot_dir = "product_screenshots"
         os.makedirs(self.base_screenshot_dir, exist_ok=True)
+        # Ürünler sayfa sonunda toplu JSON yerine bulundukça ortak JSONL dosyasına eklenir;
+        # eski products_<ts>.json dosyaları "python record_sink.py expand products.jsonl" ile üretilir.
+        self.sink = record_sink.RecordSink(record_sink.DEFAULT_SINK_NAME)
+        # Kart başına element.screenshot yerine bant yakalamalarından kırpma (CDP gerekir)
+        self.batch_screenshots = True
+        self.screenshotter = card_screenshots.CardScreenshotter(self.driver, card_selector=PRODUCT_CARD_SELECTOR)
     
     def sanitize_filename(self, name):
         """Dosya adı için uygun karakterler kullanmak üzere string’i temizler."""
@@ -31,8 +54,8 @@ class ProductCollectorAI:
         eBay ana sayfasına gider.
         """
         self.driver.get("https://www.ebay.com/")
-        time.sleep(2)
-    
+        ebay_page.wait_for_page_ready(self.driver, ebay_page.MAIN_MENU_SELECTORS)
+
     def explore_main_categories(self):
         """
         Ana kategori seçiminde yalnızca 4, 6 ve 8 numaralı kategorilere tıklar.
@@ -53,7 +76,7 @@ class ProductCollectorAI:
                 
                 # Ana kategori sayfasına geri dön
                 self.driver.back()
-                time.sleep(2)
+                ebay_page.wait_for_page_ready(self.driver, ebay_page.MAIN_MENU_SELECTORS)
             except NoSuchElementException:
                 print(f"[WARNING] Kategori (li[{i}]) bulunamadı.")
                 break
@@ -104,13 +127,13 @@ class ProductCollectorAI:
                                 print("        [INFO] Daha derin kategoride ürün bulunamadı.")
                             # Daha derin kategori tamamlandıktan sonra alt kategoriye geri dön
                             self.driver.back()
-                            time.sleep(2)
+                            ebay_page.wait_for_page_ready(self.driver)
                     else:
                         print("    [INFO] Alt kategori için daha derin kategori bulunamadı.")
                 
                 # Alt kategori işlemi tamamlandıktan sonra ana kategoriye geri dön
                 self.driver.back()
-                time.sleep(2)
+                ebay_page.wait_for_page_ready(self.driver)
                 
                 # Alt kategoriler arasında gezinmeden önce sayfayı aşağı kaydır ve "Load More" butonunu kontrol et
                 self.scroll_down_a_bit()
@@ -142,7 +165,7 @@ class ProductCollectorAI:
         Sayfadaki ürünlerin (listelenmiş kartların) sayısını döndürür.
         """
         try:
-            return len(self.driver.find_elements(By.CSS_SELECTOR, "li.brwrvr__item-card.brwrvr__item-card--list"))
+            return len(self.driver.find_elements(By.CSS_SELECTOR, PRODUCT_CARD_SELECTOR))
         except Exception:
             return 0
     
@@ -155,11 +178,47 @@ class ProductCollectorAI:
         if count == 0:
             return
         
-        product_elements = self.driver.find_elements(By.CSS_SELECTOR, "li.brwrvr__item-card.brwrvr__item-card--list")
+        product_elements = self.driver.find_elements(By.CSS_SELECTOR, PRODUCT_CARD_SELECTOR)
         if not product_elements:
             return
         
         products_data = []
+        filename = f"products_{int(time.time())}.json"
+        if self.batch_screenshots:
+            # Kartlar ve "sold" süzgeci tek çağrıda; ekran görüntüleri birkaç bant yakalamasından kırpılır
+            cards = card_extract.extract_cards(self.driver, card_selector=PRODUCT_CARD_SELECTOR)
+            jobs = []
+            for card in cards:
+                card["product_name"] = card["full_text"].split("\n")[0].strip()
+                print(f"        [INFO] Ürün işleniyor: {card['product_name']}")
+                jobs.append((card, self.screenshot_path(card["index"] + 1, category_name, card["product_name"])))
+            saved = self.screenshotter.capture(jobs)
+            for card, screenshot_path in jobs:
+                products_data.append({
+                    "product_name": card["product_name"],
+                    "full_text": card["full_text"],
+                    "screenshot_path": screenshot_path if saved.get(screenshot_path) else None
+                })
+                self.sink.write(products_data[-1], group=filename)
+        else:
+            self.scrape_products_one_by_one(product_elements, category_name, filename, products_data)
+        
+        if products_data:
+            print(f"    [INFO] {len(products_data)} ürün kayıt dosyasına eklendi ({record_sink.DEFAULT_SINK_NAME}, grup: {filename})")
+        
+        # Ürünlerin tam yüklenmesi için sayfayı yavaşça kaydır
+        scroll_pause_time = 0.5
+        screen_height = self.driver.execute_script("return window.innerHeight")
+        scroll_amount = screen_height * 0.8
+        for i in range(5):
+            self.driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
+            time.sleep(scroll_pause_time)
+    
+    def scrape_products_one_by_one(self, product_elements, category_name, filename, products_data):
+        """
+        Eski yol: her kart için kaydırma, 1 sn bekleme ve element.screenshot.
+        Toplu yakalama kullanılamadığında (ör. CDP olmayan sürücü) kullanılır.
+        """
         for idx, product in enumerate(product_elements, start=1):
             try:
                 # Ürünle ilgili bilgi alanını bul
@@ -185,22 +244,9 @@ class ProductCollectorAI:
                     "full_text": container_text,
                     "screenshot_path": screenshot_path
                 })
+                self.sink.write(products_data[-1], group=filename)
             except Exception as e:
                 print(f"    [WARNING] Ürün {idx} işlenirken hata: {str(e)}")
-        
-        if products_data:
-            filename = f"products_{int(time.time())}.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(products_data, f, ensure_ascii=False, indent=2)
-            print(f"    [INFO] {len(products_data)} ürün kaydedildi: {filename}")
-        
-        # Ürünlerin tam yüklenmesi için sayfayı yavaşça kaydır
-        scroll_pause_time = 0.5
-        screen_height = self.driver.execute_script("return window.innerHeight")
-        scroll_amount = screen_height * 0.8
-        for i in range(5):
-            self.driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-            time.sleep(scroll_pause_time)
     
     def scroll_down_a_bit(self):
         """
@@ -246,26 +292,31 @@ class ProductCollectorAI:
         except Exception as e:
             print(f"    [ERROR] Buton kontrolünde beklenmeyen hata: {str(e)}")
     
+    def screenshot_path(self, index, category_name, product_name):
+        """
+        Ekran görüntüsünün yolunu döndürür (klasörleri oluşturur).
+        Dosya adı ürün ismi (temizlenmiş hali) ve kategoriye göre klasörlendirilir.
+        """
+        # Ürün ismini dosya adı için uygun hale getir
+        sanitized_product_name = self.sanitize_filename(product_name)
+        unique_id = f"{int(time.time())}_{index}"
+        
+        # Kategori adına göre klasör oluştur (kategori ismini de sanitize ediyoruz)
+        category_dir = os.path.join(self.base_screenshot_dir, self.sanitize_filename(category_name))
+        os.makedirs(category_dir, exist_ok=True)
+        # Her ürün için benzersiz bir klasör oluştur
+        product_dir = os.path.join(category_dir, f"{unique_id}_{sanitized_product_name}")
+        os.makedirs(product_dir, exist_ok=True)
+        
+        screenshot_filename = f"{sanitized_product_name}_product_screenshot.png"
+        return os.path.join(product_dir, screenshot_filename)
+    
     def take_product_screenshot(self, product_element, index, category_name, product_name):
         """
         Verilen web elementinin ekran görüntüsünü alır.
-        Ekran görüntüsü dosya adı ürün ismi (temizlenmiş hali) ve kategoriye göre klasörlendirilir.
         """
         try:
-            # Ürün ismini dosya adı için uygun hale getir
-            sanitized_product_name = self.sanitize_filename(product_name)
-            unique_id = f"{int(time.time())}_{index}"
-            
-            # Kategori adına göre klasör oluştur (kategori ismini de sanitize ediyoruz)
-            category_dir = os.path.join(self.base_screenshot_dir, self.sanitize_filename(category_name))
-            os.makedirs(category_dir, exist_ok=True)
-            # Her ürün için benzersiz bir klasör oluştur
-            product_dir = os.path.join(category_dir, f"{unique_id}_{sanitized_product_name}")
-            os.makedirs(product_dir, exist_ok=True)
-            
-            screenshot_filename = f"{sanitized_product_name}_product_screenshot.png"
-            screenshot_path = os.path.join(product_dir, screenshot_filename)
-            
+            screenshot_path = self.screenshot_path(index, category_name, product_name)
             product_element.screenshot(screenshot_path)
             return screenshot_path
         except Exception as e:
@@ -274,9 +325,11 @@ class ProductCollectorAI:
     
     def close(self):
         """
-        Tarayıcıyı kapatır.
+        Kayıt dosyasını kapatır ve tarayıcıyı kapatır.
         """
-        self.driver.quit()
+        self.sink.close()
+        self.screenshotter.close()
+        driver_factory.quit_driver(self.driver)
 
 if __name__ == "__main__":
     driver_path = "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver"
@@ -285,4 +338,6 @@ if __name__ == "__main__":
     # Ana akış
     collector.go_to_ebay()
     collector.explore_main_categories()
-    collector.close()
\ No newline at end of file
+    collector.close()
+    page_ready.stats.log_summary(log=print)
+    driver_factory.stats.log_summary(log=print)
\ No newline at end of file
@@ -1,30 +1,46 @@
-import json
 import os
+import sys
 import time
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_ready
+import driver_factory
+import driver_daemon
+import record_sink
+from EBAY import ebay_page
+
+
 class ProductCollectorAI:
     def __init__(self, driver_path):
-        service = Service(driver_path)
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        self.driver = webdriver.Chrome(service=service, options=options)
+        # Reklam, izleyici, yazı tipi ve video istekleri engellenir. Ürün kartlarının
+        # ekran görüntüsü alındığı için görseller açık bırakılır.
+        # driver_daemon çalışıyorsa ısıtılmış bir tarayıcı kiralanır.
+        self.driver = driver_daemon.acquire_driver(
+            "ebay",
+            driver_path,
+            arguments=["--start-maximized"],
+            block_images=False,
+        )
         
         self.base_screenshot_dir = "product_screenshots"
         self.current_main_category = "Unknown"
         self.current_sub_category = "Unknown"
         os.makedirs(self.base_screenshot_dir, exist_ok=True)
+        # Ürünler sayfa sonunda toplu JSON yerine bulundukça ortak JSONL dosyasına eklenir;
+        # eski products_<ts>.json dosyaları "python record_sink.py expand products.jsonl" ile üretilir.
+        self.sink = record_sink.RecordSink(record_sink.DEFAULT_SINK_NAME)
 
     def go_to_ebay(self):
         self.driver.get("https://www.ebay.com/")
-        time.sleep(2)
-    
+        ebay_page.wait_for_page_ready(self.driver, ebay_page.MAIN_MENU_SELECTORS)
+
     def explore_main_categories(self):
         """Sadece 4, 6 ve 8 numaralı ana kategorileri ziyaret eder"""
         for i in [4, 6, 8]:
@@ -38,7 +54,7 @@ class ProductCollectorAI:
                 
                 self.explore_sub_categories()
                 self.driver.back()
-                time.sleep(2)
+                ebay_page.wait_for_page_ready(self.driver, ebay_page.MAIN_MENU_SELECTORS)
                 
             except (NoSuchElementException, ElementClickInterceptedException) as e:
                 print(f"[WARNING] Kategori işlenirken hata: {str(e)}")
@@ -67,7 +83,7 @@ class ProductCollectorAI:
                 
                 # Alt kategoriye geri dön
                 self.driver.back()
-                time.sleep(2)
+                ebay_page.wait_for_page_ready(self.driver)
                 
             except (NoSuchElementException, ElementClickInterceptedException):
                 break
@@ -90,11 +106,11 @@ class ProductCollectorAI:
                     self.current_sub_category += f"_{deeper_category}"
                     self.scrape_products()
                     self.driver.back()
-                    time.sleep(2)
+                    ebay_page.wait_for_page_ready(self.driver)
                     return True  # Ürün bulunduğunu belirt
                 
                 self.driver.back()
-                time.sleep(2)
+                ebay_page.wait_for_page_ready(self.driver)
                 
             except (NoSuchElementException, ElementClickInterceptedException):
                 break
@@ -112,6 +128,7 @@ class ProductCollectorAI:
             return
         
         products_data = []
+        filename = f"products_{int(time.time())}.json"
         for product in product_elements:
             try:
                 container = product.find_element(By.XPATH, "./div/div/div[2]")
@@ -138,15 +155,13 @@ class ProductCollectorAI:
                     "full_text": container_text,
                     "screenshot_path": screenshot_path
                 })
+                self.sink.write(products_data[-1], group=filename)
                 
             except Exception as e:
                 print(f"    [WARNING] Ürün işlenirken hata: {str(e)}")
         
         if products_data:
-            filename = f"products_{int(time.time())}.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(products_data, f, ensure_ascii=False, indent=2)
-            print(f"    [INFO] {len(products_data)} ürün kaydedildi: {filename}")
+            print(f"    [INFO] {len(products_data)} ürün kayıt dosyasına eklendi ({record_sink.DEFAULT_SINK_NAME}, grup: {filename})")
     
     def full_scroll(self):
         """Sayfayı tamamen kaydırarak tüm ürünleri yükletme"""
@@ -171,7 +186,8 @@ class ProductCollectorAI:
             return None
     
     def close(self):
-        self.driver.quit()
+        self.sink.close()
+        driver_factory.quit_driver(self.driver)
 
 if __name__ == "__main__":
     driver_path = "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver"
@@ -181,4 +197,6 @@ if __name__ == "__main__":
         collector.go_to_ebay()
         collector.explore_main_categories()
     finally:
-        collector.close()
\ No newline at end of file
+        collector.close()
+        page_ready.stats.log_summary(log=print)
+        driver_factory.stats.log_summary(log=print)
\ No newline at end of file
@@ -1,14 +1,22 @@
-import json
 import os
+import sys
 import re
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_ready
+import driver_factory
+import driver_daemon
+import record_sink
+from EBAY import ebay_page
+
+
 def sanitize_filename(text):
     """
     Dosya ve klasör isimlerinde sorun çıkarabilecek karakterleri temizler.
@@ -18,23 +26,31 @@ def sanitize_filename(text):
 
 class ProductCollectorAI:
     def __init__(self, driver_path):
-        service = Service(driver_path)
-        options = webdriver.ChromeOptions()
         # Gerekirse headless'i açabilirsiniz, ancak görseller için kapalı olması genelde daha sağlıklı
         # options.add_argument("--headless")
-        options.add_argument("--start-maximized")
-        self.driver = webdriver.Chrome(service=service, options=options)
+        # Reklam, izleyici, yazı tipi ve video istekleri engellenir. Ürün kartlarının
+        # ekran görüntüsü alındığı için görseller açık bırakılır.
+        # driver_daemon çalışıyorsa ısıtılmış bir tarayıcı kiralanır.
+        self.driver = driver_daemon.acquire_driver(
+            "ebay",
+            driver_path,
+            arguments=["--start-maximized"],
+            block_images=False,
+        )
         
         # Ekran görüntüleri için temel klasör
         self.base_screenshot_dir = "product_screenshots"
         os.makedirs(self.base_screenshot_dir, exist_ok=True)
+        # Ürünler sayfa sonunda toplu JSON yerine bulundukça ortak JSONL dosyasına eklenir;
+        # eski products_<ts>.json dosyaları "python record_sink.py expand products.jsonl" ile üretilir.
+        self.sink = record_sink.RecordSink(record_sink.DEFAULT_SINK_NAME)
     
     def go_to_ebay(self):
         """
         eBay ana sayfasına gider.
         """
         self.driver.get("https://www.ebay.com/")
-        time.sleep(2)
+        ebay_page.wait_for_page_ready(self.driver, ebay_page.MAIN_MENU_SELECTORS)
 
     def explore_main_categories(self):
         """
@@ -55,7 +71,7 @@ class ProductCollectorAI:
                 
                 # Ana kategoriye geri dön
                 self.driver.back()
-                time.sleep(2)
+                ebay_page.wait_for_page_ready(self.driver, ebay_page.MAIN_MENU_SELECTORS)
             except NoSuchElementException:
                 print(f"[WARNING] Kategori (li[{i}]) bulunamadı.")
                 break
@@ -91,7 +107,7 @@ class ProductCollectorAI:
                 
                 # Alt kategoriden geri dön
                 self.driver.back()
-                time.sleep(2)
+                ebay_page.wait_for_page_ready(self.driver)
                 
                 # Alt kategorilerde ilerlemeden önce "Load more" butonunu kontrol et
                 self.check_and_click_more_button()
@@ -140,6 +156,8 @@ class ProductCollectorAI:
         
         products_data = []
         safe_subcat_name = sanitize_filename(sub_cat_text)
+        # JSON dosyası alt kategoriye göre isimlendirilir
+        filename = f"products_{safe_subcat_name}_{int(time.time())}.json"
         
         for idx, product in enumerate(product_elements, start=1):
             try:
@@ -172,16 +190,12 @@ class ProductCollectorAI:
                     "full_text": container_text,
                     "screenshot_path": screenshot_path
                 })
+                self.sink.write(products_data[-1], group=filename)
             except Exception as e:
                 print(f"    [WARNING] Ürün {idx} işlenirken hata: {str(e)}")
         
         if products_data:
-            # JSON dosyasını alt kategoriye göre isimlendiriyoruz
-            timestamp = int(time.time())
-            filename = f"products_{safe_subcat_name}_{timestamp}.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(products_data, f, ensure_ascii=False, indent=2)
-            print(f"    [INFO] {len(products_data)} ürün kaydedildi: {filename}")
+            print(f"    [INFO] {len(products_data)} ürün kayıt dosyasına eklendi ({record_sink.DEFAULT_SINK_NAME}, grup: {filename})")
 
         """
         Ürünlerin tam yüklenmesi için sayfayı yavaş kaydırır (isterseniz belirli durumlarda kullanabilirsiniz).
@@ -262,9 +276,10 @@ class ProductCollectorAI:
     
     def close(self):
         """
-        Tarayıcıyı kapatır.
+        Kayıt dosyasını kapatır ve tarayıcıyı kapatır.
         """
-        self.driver.quit()
+        self.sink.close()
+        driver_factory.quit_driver(self.driver)
 
 if __name__ == "__main__":
     driver_path = "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver"
@@ -273,4 +288,6 @@ if __name__ == "__main__":
     collector.go_to_ebay()
     collector.explore_main_categories()
     
-    collector.close()
\ No newline at end of file
+    collector.close()
+    page_ready.stats.log_summary(log=print)
+    driver_factory.stats.log_summary(log=print)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+eBay kategori sayfasındaki ürün kartlarının tek execute_script çağrısıyla okunması.
+
+EBAY_14_DP.scrape_products her kart için başlık, fiyat, durum, kargo ve satış
+bilgisini ayrı find_element çağrılarıyla (artı .text) okuyordu; 60 kartlık
+bir sayfa yüzlerce WebDriver gidiş-dönüşü demekti. Burada tüm kartlar
+tarayıcıda tek seferde gezilir ve her kart için yapılandırılmış bir kayıt
+döndürülür: başlık, fiyat, durum, kargo, satış metni, ürün ve görsel
+adresleri ve kartın sayfa üzerindeki dikdörtgeni. "sold" süzgeci de
+tarayıcıda uygulanır; süzülen kartlar Python'a hiç gelmez.
+
+    cards = card_extract.extract_cards(driver)
+    for card in cards:
+        print(card["title"], card["price"], card["rect"])
+"""
+
+CARD_SELECTOR = "li[class*='brwrvr__item-card']"
+# Kartın bilgi bölümü (EBAY_14'teki "./div/div/div[2]"); bulunamazsa kartın tamamı kullanılır
+INFO_XPATH = "./div/div/div[2]"
+
+# Alan -> sırayla denenecek CSS seçicileri (kartın içinde)
+FIELD_SELECTORS = {
+    "title": ["div.brwrvr__item-title", ".brwrvr__item-title", "h3"],
+    "price": ["span.brwrvr__item-price", ".brwrvr__item-price"],
+    "condition": ["div.brwrvr__item-condition", ".brwrvr__item-condition"],
+    "shipping": ["div.brwrvr__item-shipping", ".brwrvr__item-shipping"],
+    "sold": ["div.brwrvr__item-sold", ".brwrvr__item-sold"],
+}
+
+_CARDS_SCRIPT = """
+var cardSelector = arguments[0];
+var infoXPath = arguments[1];
+var fields = arguments[2];
+var soldOnly = arguments[3];
+var soldWord = arguments[4].toLowerCase();
+
+function first(root, selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        var el = root.querySelector(selectors[i]);
+        var text = el ? (el.innerText || '').trim() : '';
+        if (text) { return text; }
+    }
+    return null;
+}
+
+var items = [];
+document.querySelectorAll(cardSelector).forEach(function (card, index) {
+    var info = null;
+    if (infoXPath) {
+        info = document.evaluate(infoXPath, card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    info = info || card;
+    var text = (info.innerText || '').trim();
+    if (soldOnly && text.toLowerCase().indexOf(soldWord) === -1) { return; }
+
+    var item = {index: index, full_text: text};
+    Object.keys(fields).forEach(function (field) { item[field] = first(card, fields[field]); });
+    if (!item.title) { item.title = text.split('\\n')[0].trim() || null; }
+
+    var link = card.querySelector('a[href*="/itm/"]') || card.querySelector('a[href]');
+    item.url = link ? link.href : null;
+    var img = card.querySelector('img');
+    item.image_url = img ? (img.currentSrc || img.src || img.getAttribute('data-src') || null) : null;
+
+    // Sayfa koordinatları (CSS pikseli): kaydırmadan bağımsız
+    var r = card.getBoundingClientRect();
+    item.rect = {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+    items.push(item);
+});
+return items;
+"""
+
+
+def extract_cards(driver, sold_only=True, sold_word="sold", card_selector=CARD_SELECTOR, info_xpath=INFO_XPATH,
+                  fields=None):
+    """
+    Sayfadaki tüm ürün kartlarını tek çağrıda okur ve kayıt listesi döndürür.
+    Her kayıt: index (sayfadaki kart sırası), full_text, FIELD_SELECTORS'taki
+    alanlar (bulunamayan None), url, image_url ve rect {x, y, width, height}.
+    sold_only ise bilgi metninde sold_word geçmeyen kartlar tarayıcıda elenir.
+    """
+    return driver.execute_script(_CARDS_SCRIPT, card_selector, info_xpath, fields or FIELD_SELECTORS,
+                                 bool(sold_only), sold_word) or []
@@ -0,0 +1,223 @@
+"""
+eBay ürün kartları için "bir yakalama, çok kırpma" ekran görüntüsü hattı.
+
+Koleksiyoncular her kart için scrollIntoView (smooth), 1 sn bekleme ve
+product_element.screenshot(path) yapıyordu: kart başına bir WebDriver
+çağrısı, bir PNG kodlaması ve en az bir saniye. Burada kartlar sayfa
+üzerindeki dikdörtgenlerine (card_extract.extract_cards) göre görünüm alanı
+yüksekliğinde bantlara ayrılır. Her bant için:
+
+  1. tek bir execute_async_script bandı görünüme kaydırır, banttaki görseller
+     yüklenene kadar (en fazla settle_timeout) bekler ve kartların güncel
+     dikdörtgenlerini döndürür;
+  2. CDP Page.captureScreenshot ile yalnızca bandı kapsayan bölge (clip)
+     JPEG olarak yakalanır;
+  3. kartlar bu yakalamadan kırpılır; çözme, kırpma, kodlama ve diske yazma
+     bir iş parçacığı havuzunda yapılır, bu sırada tarayıcı bir sonraki bandı
+     yakalar.
+
+Çıktı dosyaları bugünkü yollarla aynıdır; biçim uzantıdan (.png, .jpg) seçilir.
+
+    shooter = CardScreenshotter(driver)
+    cards = card_extract.extract_cards(driver)
+    saved = shooter.capture([(card, path_for(card)) for card in cards])
+"""
+
+import io
+import os
+import time
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from EBAY import card_extract
+
+# Bandı görünüme kaydırır, banttaki görsellerin yüklenmesini bekler ve kartların
+# güncel (sayfa koordinatlarındaki) dikdörtgenlerini döndürür.
+_BAND_SCRIPT = """
+var cardSelector = arguments[0];
+var indexes = arguments[1];
+var scrollY = arguments[2];
+var timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+
+window.scrollTo(0, scrollY);
+var all = document.querySelectorAll(cardSelector);
+var cards = indexes.map(function (i) { return all[i] || null; });
+
+function pendingImages() {
+    var pending = 0;
+    cards.forEach(function (card) {
+        if (!card) { return; }
+        card.querySelectorAll('img').forEach(function (img) {
+            if (!img.complete) { pending++; }
+        });
+    });
+    return pending;
+}
+
+var started = Date.now();
+function finish() {
+    // Bir kare bekle: yüklenen görsellerin boyanması için
+    requestAnimationFrame(function () {
+        done({
+            rects: cards.map(function (card) {
+                if (!card) { return null; }
+                var r = card.getBoundingClientRect();
+                return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+            }),
+            pending: pendingImages()
+        });
+    });
+}
+(function poll() {
+    if (pendingImages() === 0 || Date.now() - started > timeoutMs) { finish(); return; }
+    setTimeout(poll, 50);
+})();
+"""
+
+_VIEWPORT_SCRIPT = "return [window.innerWidth, window.innerHeight, window.scrollY];"
+
+_FORMATS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+
+
+class CardScreenshotter:
+    def __init__(self, driver, workers=4, capture_format="jpeg", quality=90, settle_timeout=2.0,
+                 card_selector=card_extract.CARD_SELECTOR):
+        """
+        :param workers: Kırpma/kodlama/yazma için iş parçacığı sayısı.
+        :param capture_format: CDP yakalama biçimi ("jpeg" hızlı, "png" kayıpsız).
+        :param quality: JPEG yakalama ve JPEG çıktı kalitesi.
+        :param settle_timeout: Banttaki görsellerin yüklenmesi için en fazla bekleme (saniye).
+        """
+        self.driver = driver
+        self.capture_format = capture_format
+        self.quality = quality
+        self.settle_timeout = settle_timeout
+        self.card_selector = card_selector
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="card-crop")
+        self.captures = 0
+        self.crops = 0
+
+    # =====================
+    # Bantlar
+    # =====================
+    def _bands(self, jobs, viewport_height):
+        """İşleri y'ye göre sıralar ve her biri görünüm alanına sığan bantlara böler."""
+        jobs = sorted(jobs, key=lambda job: job[0]["rect"]["y"])
+        bands = []
+        band = []
+        top = None
+        for job in jobs:
+            rect = job[0]["rect"]
+            if band and rect["y"] + rect["height"] - top > viewport_height:
+                bands.append(band)
+                band = []
+            if not band:
+                top = rect["y"]
+            band.append(job)
+        if band:
+            bands.append(band)
+        return bands
+
+    def _settle(self, band, viewport_height):
+        """Bandı görünüm alanında ortalar; (güncel dikdörtgenler, bekleyen görsel sayısı) döndürür."""
+        top = min(card["rect"]["y"] for card, _ in band)
+        bottom = max(card["rect"]["y"] + card["rect"]["height"] for card, _ in band)
+        scroll_y = max(0, top - max(0, viewport_height - (bottom - top)) / 2)
+        self.driver.set_script_timeout(self.settle_timeout + 5)
+        result = self.driver.execute_async_script(_BAND_SCRIPT, self.card_selector,
+                                                  [card["index"] for card, _ in band], scroll_y,
+                                                  int(self.settle_timeout * 1000))
+        return result["rects"], result["pending"]
+
+    def _capture(self, clip, viewport_height):
+        params = {
+            "format": self.capture_format,
+            "clip": dict(clip, scale=1),
+            # Görünüm alanından uzun tek bir kart için sayfanın tamamı çizdirilir
+            "captureBeyondViewport": clip["height"] > viewport_height,
+        }
+        if self.capture_format == "jpeg":
+            params["quality"] = self.quality
+        result = self.driver.execute_cdp_cmd("Page.captureScreenshot", params)
+        self.captures += 1
+        return result["data"]
+
+    # =====================
+    # Kırpma (iş parçacığı havuzunda)
+    # =====================
+    def _crop_band(self, data, clip, crops):
+        """Yakalamayı çözer, kartları kırpar ve yollarına yazar; [(yol, başarılı)] döndürür."""
+        image = Image.open(io.BytesIO(base64.b64decode(data)))
+        image.load()
+        # Yakalama, CSS pikseli başına devicePixelRatio kadar görüntü pikseli içerir
+        ratio = image.width / clip["width"] if clip["width"] else 1.0
+        saved = []
+        for rect, path in crops:
+            try:
+                box = (
+                    round((rect["x"] - clip["x"]) * ratio),
+                    round((rect["y"] - clip["y"]) * ratio),
+                    round((rect["x"] + rect["width"] - clip["x"]) * ratio),
+                    round((rect["y"] + rect["height"] - clip["y"]) * ratio),
+                )
+                crop = image.crop(box)
+                image_format = _FORMATS.get(os.path.splitext(path)[1].lower(), "PNG")
+                folder = os.path.dirname(path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                if image_format == "JPEG":
+                    crop.convert("RGB").save(path, image_format, quality=self.quality)
+                else:
+                    crop.save(path, image_format)
+                saved.append((path, True))
+            except Exception as e:
+                print(f"    [ERROR] Kırpma hatası ({path}): {str(e)}")
+                saved.append((path, False))
+        return saved
+
+    def capture(self, jobs):
+        """
+        jobs: (kart kaydı, çıktı yolu) listesi; kart kaydı card_extract'tan
+        gelir (index ve rect alanları gerekir). Tüm dosyalar yazılınca
+        {yol: başarılı mı} sözlüğü döndürür.
+        """
+        if not jobs:
+            return {}
+        started = time.monotonic()
+        viewport_width, viewport_height, original_scroll = self.driver.execute_script(_VIEWPORT_SCRIPT)
+        futures = []
+        results = {}
+        for band in self._bands(jobs, viewport_height):
+            try:
+                rects, pending = self._settle(band, viewport_height)
+                if pending:
+                    print(f"    [WARNING] {pending} görsel {self.settle_timeout:.1f} sn içinde yüklenmedi.")
+                crops = []
+                for (card, path), rect in zip(band, rects):
+                    crops.append((rect or card["rect"], path))
+                left = max(0, min(rect["x"] for rect, _ in crops))
+                top = max(0, min(rect["y"] for rect, _ in crops))
+                right = min(viewport_width, max(rect["x"] + rect["width"] for rect, _ in crops))
+                bottom = max(rect["y"] + rect["height"] for rect, _ in crops)
+                clip = {"x": left, "y": top, "width": max(1, right - left), "height": max(1, bottom - top)}
+                data = self._capture(clip, viewport_height)
+            except Exception as e:
+                print(f"    [ERROR] Bant yakalanamadı ({len(band)} kart): {str(e)}")
+                results.update((path, False) for _, path in band)
+                continue
+            # Tarayıcı bir sonraki bandı yakalarken bu bant havuzda kırpılıp yazılır
+            futures.append(self.pool.submit(self._crop_band, data, clip, crops))
+        for future in futures:
+            for path, ok in future.result():
+                results[path] = ok
+                self.crops += ok
+        self.driver.execute_script("window.scrollTo(0, arguments[0]);", original_scroll)
+        print(f"    [INFO] {sum(results.values())}/{len(jobs)} kart ekran görüntüsü, "
+              f"{len(futures)} yakalama, {time.monotonic() - started:.1f} sn.")
+        return results
+
+    def close(self):
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,188 @@
+"""
+eBay kategori ağacı için URL sınırlı (frontier), genişlik öncelikli tarayıcı.
+
+ProductCollectorAI sürümleri kategori ağacını li elementlerine tıklayıp
+driver.back() ve sleep ile geri dönerek geziyordu: her adım tam bir sayfa
+yüklemesi demekti ve geri dönüşte eskiyen (stale) elementler döngüyü
+bozuyordu. Burada her sayfadaki kategori bağlantıları (href) tek bir
+execute_script çağrısıyla okunur ve kanonik URL'ye göre tekrarları atılarak
+bir FIFO kuyruğuna eklenir; her kategori sayfası yalnızca bir kez açılır,
+geri dönülmez.
+
+process_category_level'daki bölüm ayrımı korunur: kapalı kategoriler
+(section[2], "closed"), açık kategoriler (section[1], "open") ve alt
+seviyelerdeki liste ("deep"). Her düğüm bulunduğu bölümü, yolu ve derinliğiyle
+birlikte taşır.
+
+    crawler = CategoryCrawler(driver)
+    for name, url in main_category_links(driver, range(4, 12)):
+        crawler.seed(url, [name])
+    crawler.crawl(lambda node: scrape(node["path"]))
+"""
+
+import re
+import time
+from collections import deque
+
+import page_ready
+import crawl_journal
+
+SECTION_CLOSED = "closed"
+SECTION_OPEN = "open"
+SECTION_DEEP = "deep"
+
+# Bölüm -> kategori bağlantılarını içeren liste (XPath)
+SECTION_XPATHS = {
+    SECTION_CLOSED: "/html/body/div[2]/div[2]/section[2]/section[2]/div/ul",
+    SECTION_OPEN: "/html/body/div[2]/div[2]/section[2]/section[1]/div/ul",
+    SECTION_DEEP: "//section[contains(@class, 'b-module b-list')]//ul",
+}
+
+MAIN_MENU_XPATH = "//*[@id='vl-flyout-nav']/ul/li"
+PRODUCT_CARD_SELECTOR = "li[class*='brwrvr__item-card']"
+
+# İstenen bölümlerdeki kategori adlarını ve adreslerini tek çağrıda okur;
+# ürün kartı sayısını da döndürür.
+_PAGE_SCRIPT = """
+var sections = arguments[0];
+var cardSelector = arguments[1];
+var links = [];
+Object.keys(sections).forEach(function (section) {
+    var list = document.evaluate(sections[section], document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!list) { return; }
+    list.querySelectorAll('li').forEach(function (li) {
+        var a = li.querySelector('a[href]');
+        var name = (li.innerText || '').trim().split('\\n')[0];
+        if (a && name) { links.push({section: section, name: name, href: a.href}); }
+    });
+});
+return {cards: document.querySelectorAll(cardSelector).length, links: links};
+"""
+
+_MAIN_MENU_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var items = [];
+for (var i = 0; i < result.snapshotLength; i++) {
+    var li = result.snapshotItem(i);
+    var a = li.querySelector('a[href]');
+    items.push({index: i + 1, name: (li.innerText || '').trim().split('\\n')[0], href: a ? a.href : null});
+}
+return items;
+"""
+
+
+def _clean_name(name):
+    return re.sub(r'[\\/*?:"<>|]', "-", name).strip()
+
+
+def main_category_links(driver, indexes):
+    """Ana menüdeki li[indeks] öğelerinin (ad, adres) çiftleri; tıklama yapılmaz."""
+    wanted = set(indexes)
+    links = []
+    for item in driver.execute_script(_MAIN_MENU_SCRIPT, MAIN_MENU_XPATH) or []:
+        if item["index"] in wanted and item["href"] and item["name"]:
+            links.append((_clean_name(item["name"]), item["href"]))
+    return links
+
+
+class CategoryCrawler:
+    def __init__(self, driver, root_sections=(SECTION_CLOSED, SECTION_OPEN), child_sections=(SECTION_CLOSED,),
+                 max_depth=None, max_pages=None, ready_timeout=10, section_xpaths=None):
+        """
+        :param root_sections: Ana kategori sayfalarında okunacak bölümler (önce kapalılar).
+        :param child_sections: Alt kategori sayfalarında okunacak bölümler.
+        :param max_depth: Ana kategorinin altında en fazla bu kadar seviye inilir.
+        :param max_pages: En fazla bu kadar kategori sayfası açılır.
+        :param section_xpaths: Sayfa düzeni farklıysa bölüm -> liste XPath'i (SECTION_XPATHS'i ezer).
+        """
+        self.driver = driver
+        self.root_sections = tuple(root_sections)
+        self.child_sections = tuple(child_sections)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.ready_timeout = ready_timeout
+        self.section_xpaths = dict(SECTION_XPATHS)
+        self.section_xpaths.update(section_xpaths or {})
+        self.frontier = deque()
+        self.seen = set()
+        # Ziyaret edilen düğümler: url, path, depth, section, product_count
+        self.visited = []
+
+    def seed(self, url, path, section=None):
+        """Kuyruğa bir başlangıç kategorisi ekler; aynı adres daha önce eklendiyse False döner."""
+        return self._push({"url": url, "path": list(path), "depth": 0, "section": section})
+
+    def _push(self, node):
+        key = crawl_journal.canonical_url(node["url"])
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.frontier.append(node)
+        return True
+
+    def _read_page(self, sections):
+        spec = {section: self.section_xpaths[section] for section in sections}
+        return self.driver.execute_script(_PAGE_SCRIPT, spec, PRODUCT_CARD_SELECTOR) or {"cards": 0, "links": []}
+
+    def visit(self, node):
+        """Düğümün sayfasını bir kez açar; ürün sayısını ve bulunan alt kategori düğümlerini döndürür."""
+        self.driver.get(node["url"])
+        ready = [self.section_xpaths[SECTION_OPEN], self.section_xpaths[SECTION_CLOSED], PRODUCT_CARD_SELECTOR]
+        page_ready.wait_for(self.driver, ready, timeout=self.ready_timeout, label="ebay_category")
+        sections = self.root_sections if node["depth"] == 0 else self.child_sections
+        page = self._read_page(sections)
+        children = []
+        # Bölüm sırası korunur: önce kapalı, sonra açık kategoriler
+        for section in sections:
+            for link in page["links"]:
+                if link["section"] != section:
+                    continue
+                name = _clean_name(link["name"])
+                if name:
+                    children.append({"url": link["href"], "path": node["path"] + [name],
+                                     "depth": node["depth"] + 1, "section": section})
+        return page["cards"], children
+
+    def _next_node(self):
+        """Sıradaki düğüm; alt sınıflar (ör. paralel tarama) burada işi bölebilir."""
+        return self.frontier.popleft()
+
+    def crawl(self, on_products):
+        """
+        Kuyruk boşalana kadar kategorileri genişlik öncelikli gezer. Ürün kartı
+        olan sayfalarda on_products(node) çağrılır (sürücü o sayfadadır) ve o
+        daldan aşağı inilmez; olmayanlarda alt kategoriler kuyruğa eklenir.
+        """
+        pages = 0
+        while self.frontier:
+            if self.max_pages is not None and pages >= self.max_pages:
+                print(f"Sayfa sınırına ulaşıldı ({self.max_pages}); kuyrukta {len(self.frontier)} kategori kaldı.")
+                break
+            node = self._next_node()
+            indent = "  " * node["depth"]
+            label = f"{node['section'].upper()} " if node["section"] else ""
+            print(f"\n{indent}[{label}KATEGORI] {' / '.join(node['path'])}")
+            started = time.monotonic()
+            try:
+                product_count, children = self.visit(node)
+            except Exception as e:
+                print(f"{indent}  Kategori sayfası açılamadı: {str(e)}")
+                continue
+            pages += 1
+            node["product_count"] = product_count
+            self.visited.append(node)
+            if product_count > 0:
+                print(f"{indent}  !! Ürün bulundu ({product_count} adet), veri toplanıyor...")
+                try:
+                    on_products(node)
+                except Exception as e:
+                    print(f"{indent}  Ürün toplama hatası: {str(e)}")
+                continue
+            if self.max_depth is not None and node["depth"] >= self.max_depth:
+                continue
+            added = sum(1 for child in children if self._push(child))
+            print(f"{indent}  Ürün yok; {len(children)} alt kategori bulundu, {added} yeni "
+                  f"({time.monotonic() - started:.1f} sn).")
+        print(f"\nKategori taraması bitti: {pages} sayfa açıldı, {len(self.seen)} farklı kategori görüldü.")
+        return self.visited
@@ -0,0 +1,297 @@
+"""
+Trading API GetCategories çağrısından doldurulan, sürümlü eBay kategori ağacı.
+
+EBAY_1.EBayCategoryExplorer kategori ağacını her çalıştırmada menülerin
+üzerine gelip (hover) tıklayarak yeniden keşfediyordu. Burada ağacın tamamı
+bir kez GetCategories ile indirilir ve CategoryVersion ile birlikte JSON
+olarak saklanır. Sonraki çalıştırmalarda yalnızca sürüm sorulur (DetailLevel
+olmadan, birkaç yüz baytlık yanıt); eBay daha yeni bir sürüm bildirmedikçe
+ağaç yeniden indirilmez.
+
+Bellekte kimliğe ve yola göre sözlükler ile ebeveyn -> çocuklar indeksi
+tutulur; tüm aramalar O(1)'dir.
+
+    tree = category_tree.load_or_refresh(ebay_token)
+    tree.id_for_path("Clothing, Shoes & Accessories > Women > Women's Clothing")
+    tree.children("15724")
+
+Komut satırı:
+    python -m EBAY.category_tree --token <token> [--force]
+    python -m EBAY.category_tree --lookup 63863
+"""
+
+import io
+import os
+import re
+import json
+import time
+import argparse
+import xml.etree.ElementTree as ET
+
+import requests
+
+DEFAULT_TREE_PATH = os.path.join("ebay_data", "category_tree.json")
+API_URL = "https://api.ebay.com/ws/api.dll"
+COMPATIBILITY_LEVEL = "967"
+PATH_SEPARATOR = " > "
+
+# Kök kategoriler için eBay CategoryParentID'yi kategorinin kendi kimliği olarak döndürür
+ROOT_PARENT = None
+
+
+def _path_key(path):
+    """Yolu (liste ya da "A > B" metni) büyük/küçük harf ve boşluktan bağımsız anahtara çevirir."""
+    if isinstance(path, str):
+        path = path.split(PATH_SEPARATOR.strip())
+    return "\x1f".join(" ".join(part.split()).casefold() for part in path)
+
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-")
+
+
+class CategoryTree:
+    """Kategori kayıtlarını ve kimlik, yol ve çocuk indekslerini tutar."""
+
+    def __init__(self, categories, version=None, site_id=0, updated_at=None):
+        # categories: [{"id": "63863", "name": "...", "parent_id": "15724", "level": 3, "leaf": true}, ...]
+        self.version = version
+        self.site_id = site_id
+        self.updated_at = updated_at or time.time()
+        self.by_id = {}
+        self._children = {}
+        self._paths = {}
+        self._by_path = {}
+        for category in categories:
+            self.by_id[category["id"]] = category
+        for category in categories:
+            self._children.setdefault(category["parent_id"], []).append(category["id"])
+        for category_id in self.by_id:
+            path = self.path(category_id)
+            self._by_path[_path_key(path)] = category_id
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, category_id):
+        return str(category_id) in self.by_id
+
+    @classmethod
+    def load(cls, path=DEFAULT_TREE_PATH):
+        """Diskteki ağacı yükler; dosya yoksa ya da okunamazsa None döner."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Kategori ağacı okunamadı: {str(e)}")
+            return None
+        return cls(data.get("categories", []), version=data.get("version"),
+                   site_id=data.get("site_id", 0), updated_at=data.get("updated_at"))
+
+    def save(self, path=DEFAULT_TREE_PATH):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        data = {
+            "version": self.version,
+            "site_id": self.site_id,
+            "updated_at": self.updated_at,
+            "categories": list(self.by_id.values()),
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    # =====================
+    # Aramalar
+    # =====================
+    def get(self, category_id):
+        """Kategori kaydı; bilinmeyen kimlikte None."""
+        return self.by_id.get(str(category_id))
+
+    def path(self, category_id):
+        """Kökten kategoriye kadar ad listesi; bilinmeyen kimlikte boş liste."""
+        category_id = str(category_id)
+        if category_id in self._paths:
+            return self._paths[category_id]
+        category = self.by_id.get(category_id)
+        if category is None:
+            return []
+        parent_id = category["parent_id"]
+        path = (self.path(parent_id) if parent_id is not ROOT_PARENT else []) + [category["name"]]
+        self._paths[category_id] = path
+        return path
+
+    def path_text(self, category_id):
+        return PATH_SEPARATOR.join(self.path(category_id))
+
+    def id_for_path(self, path):
+        """Yol (ad listesi ya da "A > B > C") -> kategori kimliği; bulunamazsa None."""
+        return self._by_path.get(_path_key(path))
+
+    def children(self, category_id=ROOT_PARENT):
+        """Doğrudan alt kategorilerin kimlikleri; category_id verilmezse kök kategoriler."""
+        if category_id is not ROOT_PARENT:
+            category_id = str(category_id)
+        return list(self._children.get(category_id, []))
+
+    def roots(self):
+        return self.children(ROOT_PARENT)
+
+    def is_leaf(self, category_id):
+        category = self.get(category_id)
+        return bool(category and category["leaf"])
+
+    def at_level(self, level):
+        """Belirli seviyedeki (kökler 1) kategori kimlikleri."""
+        return [category_id for category_id, category in self.by_id.items() if category["level"] == level]
+
+    def category_url(self, category_id):
+        """Kategorinin tarayıcıda açılacak adresi (eBay /b/<ad>/<kimlik> düzeni)."""
+        category = self.get(category_id)
+        return f"https://www.ebay.com/b/{_slug(category['name']) if category else '_'}/{category_id}"
+
+    def seeds(self, category_ids=None):
+        """Tarayıcılar için (ad, adres) çiftleri; varsayılan olarak kök kategoriler."""
+        ids = self.roots() if category_ids is None else [str(category_id) for category_id in category_ids]
+        return [(self.by_id[category_id]["name"], self.category_url(category_id))
+                for category_id in ids if category_id in self.by_id]
+
+
+# =====================
+# GetCategories
+# =====================
+def _headers(token, site_id):
+    return {
+        "X-EBAY-API-CALL-NAME": "GetCategories",
+        "X-EBAY-API-SITEID": str(site_id),
+        "X-EBAY-API-COMPATIBILITY-LEVEL": COMPATIBILITY_LEVEL,
+        "X-EBAY-API-IAF-TOKEN": token,
+        "Content-Type": "text/xml",
+    }
+
+
+def _request_xml(site_id, detail_level=None):
+    detail = f"<DetailLevel>{detail_level}</DetailLevel><ViewAllNodes>true</ViewAllNodes>" if detail_level else ""
+    return ('<?xml version="1.0" encoding="utf-8"?>'
+            '<GetCategoriesRequest xmlns="urn:ebay:apis:eBLBaseComponents">'
+            f'<CategorySiteID>{site_id}</CategorySiteID>{detail}'
+            '</GetCategoriesRequest>')
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _call(token, site_id, detail_level=None, timeout=120):
+    response = requests.post(API_URL, headers=_headers(token, site_id),
+                             data=_request_xml(site_id, detail_level).encode("utf-8"), timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def _check_ack(ack, errors):
+    if ack not in ("Success", "Warning"):
+        raise RuntimeError(f"GetCategories başarısız ({ack}): {'; '.join(errors) or 'hata mesajı yok'}")
+
+
+def fetch_version(token, site_id=0):
+    """Yalnızca eBay'in güncel CategoryVersion değerini sorar (ağaç indirilmez)."""
+    root = ET.fromstring(_call(token, site_id, timeout=30))
+    values = {_local(element.tag): (element.text or "").strip() for element in root}
+    errors = [(element.text or "").strip() for element in root.iter() if _local(element.tag) == "LongMessage"]
+    _check_ack(values.get("Ack"), errors)
+    return values.get("CategoryVersion")
+
+
+def parse_categories(content):
+    """
+    GetCategories (DetailLevel=ReturnAll) yanıtını akış halinde ayrıştırır;
+    (sürüm, kategori listesi) döndürür. Yanıt on binlerce kategori içerdiğinden
+    her Category elementi işlendikten sonra bellekten atılır.
+    """
+    version = ack = None
+    errors = []
+    categories = []
+    for _, element in ET.iterparse(io.BytesIO(content), events=("end",)):
+        tag = _local(element.tag)
+        if tag == "Category":
+            fields = {_local(child.tag): (child.text or "").strip() for child in element}
+            category_id = fields.get("CategoryID")
+            if category_id:
+                parent_id = fields.get("CategoryParentID") or category_id
+                categories.append({
+                    "id": category_id,
+                    "name": fields.get("CategoryName", ""),
+                    "parent_id": ROOT_PARENT if parent_id == category_id else parent_id,
+                    "level": int(fields.get("CategoryLevel") or 1),
+                    "leaf": fields.get("LeafCategory", "false").lower() == "true",
+                })
+            element.clear()
+        elif tag == "CategoryVersion":
+            version = (element.text or "").strip()
+        elif tag == "Ack":
+            ack = (element.text or "").strip()
+        elif tag == "LongMessage":
+            errors.append((element.text or "").strip())
+    _check_ack(ack, errors)
+    return version, categories
+
+
+def fetch_tree(token, site_id=0):
+    """Ağacın tamamını indirir ve CategoryTree döndürür."""
+    started = time.monotonic()
+    version, categories = parse_categories(_call(token, site_id, detail_level="ReturnAll"))
+    print(f"GetCategories: {len(categories)} kategori, sürüm {version} ({time.monotonic() - started:.1f} sn).")
+    return CategoryTree(categories, version=version, site_id=site_id)
+
+
+def load_or_refresh(token, path=DEFAULT_TREE_PATH, site_id=0, force=False):
+    """
+    Diskteki ağacı döndürür; eBay daha yeni bir CategoryVersion bildiriyorsa
+    (ya da ağaç yoksa veya force verilmişse) ağacı yeniden indirip kaydeder.
+    Sürüm sorgusu başarısız olursa eldeki ağaçla devam edilir.
+    """
+    tree = CategoryTree.load(path)
+    if tree is not None and tree.site_id != site_id:
+        tree = None
+    if tree is not None and not force:
+        try:
+            version = fetch_version(token, site_id)
+        except Exception as e:
+            print(f"Kategori sürümü sorgulanamadı, kayıtlı ağaç kullanılıyor: {str(e)}")
+            return tree
+        if version == tree.version:
+            print(f"Kategori ağacı güncel (sürüm {version}, {len(tree)} kategori).")
+            return tree
+        print(f"Kategori ağacı sürümü değişmiş: {tree.version} -> {version}, yeniden indiriliyor...")
+    tree = fetch_tree(token, site_id)
+    tree.save(path)
+    print(f"Kategori ağacı kaydedildi: {path}")
+    return tree
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GetCategories ile eBay kategori ağacı önbelleği")
+    parser.add_argument("--token", help="eBay kullanıcı token'ı (verilmezse yalnızca kayıtlı ağaç okunur)")
+    parser.add_argument("--path", default=DEFAULT_TREE_PATH)
+    parser.add_argument("--site-id", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="Sürüme bakmadan yeniden indir")
+    parser.add_argument("--lookup", nargs="*", default=[], help="Kimlik ya da 'A > B' yolu")
+    args = parser.parse_args()
+
+    tree = load_or_refresh(args.token, args.path, args.site_id, args.force) if args.token else CategoryTree.load(args.path)
+    if tree is None:
+        print(f"Kayıtlı kategori ağacı yok: {args.path}")
+    else:
+        print(f"Sürüm {tree.version}: {len(tree)} kategori, {len(tree.roots())} kök.")
+        for query in args.lookup:
+            category_id = query if query in tree else tree.id_for_path(query)
+            if category_id is None:
+                print(f"{query}: bulunamadı")
+                continue
+            print(f"{category_id}: {tree.path_text(category_id)} "
+                  f"({'yaprak' if tree.is_leaf(category_id) else f'{len(tree.children(category_id))} alt kategori'})")
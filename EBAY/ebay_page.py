@@ -0,0 +1,24 @@
+"""
+eBay koleksiyoncularının ortak sayfa hazır olma beklemesi.
+
+Sabit 2 sn bekleme yerine kategori listesi veya ürün kartları DOM'a eklenir
+eklenmez devam edilir (page_ready); sayfa ölçümü driver_factory'ye yazılır.
+"""
+
+import page_ready
+import driver_factory
+
+# driver.back sonrasında sayfanın hazır olduğunu gösteren elementler:
+# kategori listesi veya ürün kartları
+PAGE_READY_SELECTORS = [
+    "/html/body/div[2]/div[2]/section[2]/section[1]/div/ul",
+    "li.brwrvr__item-card",
+]
+MAIN_MENU_SELECTORS = ["#vl-flyout-nav"]
+
+
+def wait_for_page_ready(driver, selectors=None, timeout=10):
+    """Seçicilerden biri (varsayılan: PAGE_READY_SELECTORS) görünene kadar bekler."""
+    ready = page_ready.wait_for(driver, selectors or PAGE_READY_SELECTORS, timeout=timeout, label="ebay_page")
+    driver_factory.measure_page(driver, "ebay_page")
+    return ready
@@ -0,0 +1,297 @@
+"""
+eBay kategori ağacının çok süreçli, iş çalmalı (work stealing) taranması.
+
+explore_main_categories ana kategorileri ([4, 6, 8]) tek tarayıcıda art arda
+işliyordu. Burada her işçi süreci kendi sürücüsünü açar ve ortak kuyruktan
+bir kategori alt ağacı alır; alt ağacı category_crawler ile kendi yerel
+kuyruğunda genişlik öncelikli gezer. Boşta bekleyen bir işçi varsa ve yerel
+kuyrukta birden fazla dal birikmişse, dalların yarısı (ağacın üst
+seviyelerine yakın, büyük olanlar) tek bir görev olarak ortak kuyruğa
+bırakılır; her boştaki işçiye bir pay düşer. Kanonik URL'ler süreçler arasında paylaşılan bir kümede
+tutulur, böylece hiçbir kategori iki kez açılmaz.
+
+Ürünler işçilerde tek bir execute_script çağrısıyla okunur ve ana sürece
+gönderilir; ana süreç hepsini tek bir JSONL kayıt dosyasına yazar. Bitiş
+bildirmeden ölen işçinin üzerindeki görev düşülür, tarama takılmadan biter.
+
+    python -m EBAY.parallel_crawl --workers 4 --indexes 4 6 8
+"""
+
+import os
+import sys
+import time
+import queue
+import argparse
+import multiprocessing
+
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_ready
+import record_sink
+import crawl_journal
+import driver_factory
+import driver_daemon
+from EBAY import card_extract
+from EBAY import category_crawler
+from EBAY import category_tree
+
+DRIVER_PATH = "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver"
+DEFAULT_OUTPUT = os.path.join("ebay_data", "parallel_products.jsonl")
+
+# Sonuç kuyruğunda işçinin bittiğini bildiren işaret
+_WORKER_DONE = "__done__"
+
+# WorkQueue.state: işçi görev beklemiyor ve görev taşımıyor / görev bekliyor / görev işliyor
+_STATE_RUNNING = 0
+_STATE_IDLE = 1
+_STATE_BUSY = 2
+
+
+class SharedSeen:
+    """Süreçler arası kanonik URL kümesi (Manager sözlüğü + kilit)."""
+
+    def __init__(self, manager):
+        self._seen = manager.dict()
+        self._lock = manager.Lock()
+
+    def claim(self, key):
+        """Anahtar daha önce alınmadıysa alır ve True döner."""
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen[key] = True
+            return True
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class WorkQueue:
+    """
+    Alt ağaç görevlerinin ortak kuyruğu; her görev bir düğüm listesidir.
+    pending, kuyruktaki ve işlenmekte olan görev sayısıdır; sıfıra indiğinde
+    tüm ağaç bitmiştir. idle görev bekleyen işçi, queued kuyruktaki görev
+    sayısıdır; idle queued'dan büyükse henüz payı ayrılmamış boştaki işçi
+    vardır ve dolu işçiler dal bölüşür. state, ölen işçinin görevinin
+    düşülebilmesi için her işçinin durumunu tutar.
+    """
+
+    def __init__(self, workers):
+        self.tasks = multiprocessing.Queue()
+        self._lock = multiprocessing.Lock()
+        self.pending = multiprocessing.Value("i", 0, lock=False)
+        self.idle = multiprocessing.Value("i", 0, lock=False)
+        self.queued = multiprocessing.Value("i", 0, lock=False)
+        self.state = multiprocessing.Array("i", workers + 1, lock=False)
+
+    def put(self, nodes, claimed=False):
+        """claimed: pay claim_idle ile önceden ayrıldıysa queued yeniden artırılmaz."""
+        with self._lock:
+            self.pending.value += 1
+            if not claimed:
+                self.queued.value += 1
+        self.tasks.put(nodes)
+
+    def claim_idle(self):
+        """Payı ayrılmamış boştaki işçi varsa ona bir pay ayırır ve True döner."""
+        with self._lock:
+            if self.idle.value <= self.queued.value:
+                return False
+            self.queued.value += 1
+            return True
+
+    def task_done(self, worker_id):
+        with self._lock:
+            self.pending.value -= 1
+            self.state[worker_id] = _STATE_RUNNING
+
+    def get(self, worker_id, poll_interval=0.5):
+        """Görev gelene kadar bekler; tüm ağaç bittiyse None döner."""
+        with self._lock:
+            self.idle.value += 1
+            self.state[worker_id] = _STATE_IDLE
+        nodes = None
+        try:
+            while True:
+                try:
+                    nodes = self.tasks.get(timeout=poll_interval)
+                    return nodes
+                except queue.Empty:
+                    if self.pending.value == 0:
+                        return None
+        finally:
+            # Boşta sayısı ile kuyruktaki görev sayısı birlikte düşülür: alınan
+            # görev başka bir boştaki işçi için yeni bölüşme tetiklemez
+            with self._lock:
+                self.idle.value -= 1
+                if nodes is not None:
+                    self.queued.value -= 1
+                self.state[worker_id] = _STATE_BUSY if nodes is not None else _STATE_RUNNING
+
+    def abandon(self, worker_id):
+        """
+        Ölen işçinin sayaçlarını düzeltir: görev bekliyorsa boşta sayısından,
+        görev işliyorsa pending'den düşülür. Görev düşüldüyse True döner.
+        """
+        with self._lock:
+            state = self.state[worker_id]
+            self.state[worker_id] = _STATE_RUNNING
+            if state == _STATE_IDLE:
+                self.idle.value -= 1
+            elif state == _STATE_BUSY:
+                self.pending.value -= 1
+        return state == _STATE_BUSY
+
+
+class SubtreeCrawler(category_crawler.CategoryCrawler):
+    """Yerel kuyruğu büyüyünce dallarını boştaki işçilere bırakan kategori tarayıcısı."""
+
+    def __init__(self, driver, work, seen, worker_id, split_threshold=2, **kwargs):
+        super().__init__(driver, **kwargs)
+        self.work = work
+        self.shared_seen = seen
+        self.worker_id = worker_id
+        self.split_threshold = split_threshold
+        self.donated = 0
+
+    def _push(self, node):
+        if not self.shared_seen.claim(crawl_journal.canonical_url(node["url"])):
+            return False
+        self.seen.add(crawl_journal.canonical_url(node["url"]))
+        self.frontier.append(node)
+        return True
+
+    def _next_node(self):
+        if len(self.frontier) >= self.split_threshold and self.work.claim_idle():
+            # Kuyruğun başındaki (daha sığ, daha büyük) dalların yarısı tek görev olarak bölüşülür
+            batch = [self.frontier.popleft() for _ in range(len(self.frontier) // 2)]
+            self.work.put(batch, claimed=True)
+            self.donated += len(batch)
+        return self.frontier.popleft()
+
+
+def _worker(worker_id, driver_path, work, seen, results, headless, crawler_kwargs):
+    driver = driver_daemon.acquire_driver("ebay", driver_path, headless=headless)
+    pages = products = 0
+    started = time.monotonic()
+
+    def collect(node):
+        nonlocal products
+        items = card_extract.extract_cards(driver)
+        for item in items:
+            item["product_name"] = item.pop("title")
+            item["category"] = "/".join(node["path"])
+            item["category_section"] = node["section"]
+            item["category_url"] = node["url"]
+            results.put(item)
+        products += len(items)
+        print(f"[İŞÇİ {worker_id}] {' / '.join(node['path'])}: {len(items)} ürün")
+
+    try:
+        while True:
+            nodes = work.get(worker_id)
+            if nodes is None:
+                break
+            crawler = SubtreeCrawler(driver, work, seen, worker_id, **crawler_kwargs)
+            crawler.frontier.extend(nodes)
+            try:
+                crawler.crawl(collect)
+            finally:
+                pages += len(crawler.visited)
+                work.task_done(worker_id)
+            if crawler.donated:
+                print(f"[İŞÇİ {worker_id}] {crawler.donated} dal boştaki işçilere bırakıldı.")
+    finally:
+        driver_factory.quit_driver(driver)
+        results.put((_WORKER_DONE, worker_id, pages, products, time.monotonic() - started))
+
+
+def read_seeds(driver_path, indexes):
+    """Ana menüden (ad, adres) çiftlerini okur; menüye tıklanmaz."""
+    driver = driver_daemon.acquire_driver("ebay", driver_path, headless=True)
+    try:
+        driver.get("https://www.ebay.com/")
+        page_ready.wait_for(driver, ["#vl-flyout-nav"], label="ebay_home")
+        return category_crawler.main_category_links(driver, indexes)
+    finally:
+        driver_factory.quit_driver(driver)
+
+
+def run(seeds, driver_path=DRIVER_PATH, workers=4, output_path=DEFAULT_OUTPUT, headless=True, **crawler_kwargs):
+    """
+    seeds: (ana kategori adı, adres) listesi. workers süreç başlatır, tüm ağaç
+    bitene kadar ürünleri output_path'e yazar ve yazılan ürün sayısını döndürür.
+    """
+    started = time.monotonic()
+    manager = multiprocessing.Manager()
+    seen = SharedSeen(manager)
+    work = WorkQueue(workers)
+    results = multiprocessing.Queue()
+    for name, url in seeds:
+        if seen.claim(crawl_journal.canonical_url(url)):
+            work.put([{"url": url, "path": [name], "depth": 0, "section": None}])
+
+    processes = [multiprocessing.Process(target=_worker, name=f"ebay-worker-{worker_id}",
+                                         args=(worker_id, driver_path, work, seen, results, headless, crawler_kwargs))
+                 for worker_id in range(1, workers + 1)]
+    for process in processes:
+        process.start()
+
+    written = 0
+    finished = set()
+    exited = set()
+    # Tek çıktı: tüm işçilerin ürünleri ana süreçte aynı kayıt dosyasına yazılır
+    with record_sink.RecordSink(output_path) as sink:
+        while len(finished) < len(processes):
+            try:
+                item = results.get(timeout=1.0)
+            except queue.Empty:
+                # Çıkmış bir işçinin bitiş işareti kuyruğa çıkıştan önce yazılmıştır;
+                # çıktığı görüldükten sonraki boş okumada da gelmediyse işçi ölmüştür.
+                for worker_id, process in enumerate(processes, start=1):
+                    if worker_id in finished or process.exitcode is None:
+                        continue
+                    if worker_id not in exited:
+                        exited.add(worker_id)
+                        continue
+                    dropped = work.abandon(worker_id)
+                    finished.add(worker_id)
+                    print(f"[İŞÇİ {worker_id}] bitiş bildirmeden sonlandı (çıkış kodu {process.exitcode})"
+                          f"{', işlediği alt ağaç düşüldü' if dropped else ''}.")
+                continue
+            if isinstance(item, tuple) and item[0] == _WORKER_DONE:
+                _, worker_id, pages, products, seconds = item
+                print(f"[İŞÇİ {worker_id}] bitti: {pages} kategori sayfası, {products} ürün, {seconds:.0f} sn.")
+                finished.add(worker_id)
+                continue
+            sink.write(item, group=item["category"])
+            written += 1
+    for process in processes:
+        process.join()
+    categories = len(seen)
+    manager.shutdown()
+    print(f"Paralel tarama bitti: {categories} kategori, {written} ürün, {time.monotonic() - started:.0f} sn "
+          f"({workers} işçi) -> {output_path}")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="eBay kategori ağacının çok süreçli taranması")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--indexes", type=int, nargs="+", default=[4, 6, 8], help="Ana menü li indeksleri")
+    parser.add_argument("--tree", nargs="?", const=category_tree.DEFAULT_TREE_PATH,
+                        help="Başlangıç kategorilerini menü yerine kayıtlı GetCategories ağacından al")
+    parser.add_argument("--categories", nargs="+", help="--tree ile: başlangıç kategori kimlikleri (varsayılan: kökler)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--driver-path", default=DRIVER_PATH)
+    parser.add_argument("--show", action="store_true", help="Tarayıcıları görünür aç")
+    args = parser.parse_args()
+
+    tree = category_tree.CategoryTree.load(args.tree) if args.tree else None
+    if tree is not None:
+        seeds = tree.seeds(args.categories)
+    else:
+        seeds = read_seeds(args.driver_path, args.indexes)
+    print(f"{len(seeds)} ana kategori: {', '.join(name for name, _ in seeds)}")
+    run(seeds, args.driver_path, args.workers, args.output, headless=not args.show)
@@ -1,12 +1,18 @@
 import re
 import json
 import os
+import sys
 from pathlib import Path
 from PIL import Image
 from google.cloud import vision
 import requests
 from urllib.parse import quote_plus
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import normalize
+
 def parse_product_data(json_data):
     products = json_data if isinstance(json_data, list) else [json_data]
     results = []
@@ -30,14 +36,15 @@ def parse_product_data(json_data):
                 result['description'] = lines[1] if len(lines) > 1 else ''
                 
                 # Fiyat çıkarımı
-                prices = re.findall(r'\$(\d+\.\d{2})', text)
+                prices = normalize.parse_ebay_prices(text)
                 if prices:
                     result['current_price'] = float(prices[0])
                     result['original_price'] = float(prices[1]) if len(prices) > 1 else None
                 
                 # Satış miktarı
-                sold_match = re.search(r'(\d+)\s+sold', text)
-                result['units_sold'] = int(sold_match.group(1)) if sold_match else 0
+                _, sold = normalize.parse_ebay_card(text)
+                if sold is not None:
+                    result['units_sold'] = sold
                 
                 # Görsel path düzeltme
                 raw_path = product.get('screenshot_path', '')
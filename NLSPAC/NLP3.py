@@ -1,6 +1,6 @@
-import re
 import json
 import os
+import sys
 from pathlib import Path
 from PIL import Image
 from google.cloud import vision
@@ -8,6 +8,11 @@ import requests
 from urllib.parse import quote_plus
 import spacy
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import normalize
+
 # NLP modelini yükle
 nlp = spacy.load("en_core_web_sm")
 
@@ -155,6 +160,7 @@ def main(json_file):
     products = raw_data if isinstance(raw_data, list) else [raw_data]
     
     for product in products:
+        current_price, units_sold = normalize.parse_ebay_card(product.get('full_text', ''))
         print("\n" + "="*50)
         print("Analiz Edilen Ürün:")
         print(json.dumps(product, indent=2, ensure_ascii=False))
@@ -163,8 +169,8 @@ def main(json_file):
         keywords = analyzer.generate_keywords({
             'product_name': product.get('full_text', '').split('\n')[0],
             'description': product.get('full_text', '').split('\n')[1] if '\n' in product.get('full_text', '') else '',
-            'current_price': float(re.findall(r'\$(\d+\.\d{2})', product.get('full_text', ''))[0]) if re.findall(r'\$(\d+\.\d{2})', product.get('full_text', '')) else None,
-            'units_sold': int(re.search(r'(\d+)\s+sold', product.get('full_text', '')).group(1)) if re.search(r'(\d+)\s+sold', product.get('full_text', '')) else 0,
+            'current_price': None if current_price is None else float(current_price),
+            'units_sold': units_sold or 0,
             'screenshot_path': product.get('screenshot_path', '')
         })
         
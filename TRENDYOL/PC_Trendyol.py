@@ -2,21 +2,45 @@ import os
 import re
 import json
 import time
+import sys
 import logging
-import requests
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_ready
+import driver_factory
+import driver_daemon
+import dom_extract
+import crawl_journal
+import record_sink
+import recrawl_scheduler
+import normalize
+import blob_store
+from TRENDYOL import trendyol_http
+from TRENDYOL import listing_harvester
+from TRENDYOL import gallery
+from TRENDYOL import category_index
+import image_downloader
+
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
+# Sabit beklemeler yerine sayfanın hazır olduğunu gösteren elementler
+COOKIE_BUTTON_XPATH = "/html/body/div[2]/div[2]/div/div[1]/div/div[2]/div/button[3]"
+SKIP_LOCATION_XPATH = '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/aside/div/div/div[2]/div/div[2]/div/div/button'
+PRODUCT_NAME_READY_SELECTOR = "#product-detail-app h1"
+# Konum modalı ürün adından sonra çizilebilir; bu kadar saniye daha beklenir
+SKIP_LOCATION_PROBE_TIMEOUT = 1.5
+SKIP_LOCATION_CLOSE_TIMEOUT = 5
+LISTING_READY_SELECTOR = listing_harvester.PRODUCT_LINK_SELECTOR
+
 
 
 #######################################################################
@@ -24,22 +48,28 @@ logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 #######################################################################
 class Trendyol_Category_Search:
     def __init__(self, driver_path, base_url="https://www.trendyol.com/butik/liste/2/erkek"):
-        # Chrome seçenekleri: bildirimleri kapatıyoruz.
-        options = webdriver.ChromeOptions()
-        options.add_argument("--disable-notifications")
-        service = Service("/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver")
-        self.driver = webdriver.Chrome(service=service, options=options)
+        # Chrome seçenekleri: bildirimleri kapatıyoruz; reklam, izleyici, yazı tipi ve
+        # video istekleri engellenir, görseller yalnızca ürün sayfalarında açılır.
+        # driver_daemon çalışıyorsa ısıtılmış bir tarayıcı kiralanır.
+        self.driver = driver_daemon.acquire_driver(
+            "trendyol",
+            "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver",
+            arguments=["--disable-notifications"],
+        )
         self.wait = WebDriverWait(self.driver, 10)
         self.action = ActionChains(self.driver)
         self.driver.get(base_url)
-        time.sleep(2)  # Sayfanın tam yüklenmesi için bekleme
+        # Sayfanın tam yüklenmesi için çerez butonu veya menü beklenir
+        page_ready.wait_for(self.driver, [COOKIE_BUTTON_XPATH, "#navigation-wrapper"], label="trendyol_home")
         self.dismiss_cookies()
 
     def dismiss_cookies(self):
-        """Sayfa yüklendikten sonra çıkan çerez popup’ını kapatır."""
+        """
+        Sayfa yüklendikten sonra çıkan çerez popup’ını kapatır. Kalıcı profilde
+        popup bir kez kapatıldıktan sonra tekrar çıkmadığı için kısa beklenir.
+        """
         try:
-            cookie_xpath = "/html/body/div[2]/div[2]/div/div[1]/div/div[2]/div/button[3]"
-            cookie_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, cookie_xpath)))
+            cookie_btn = WebDriverWait(self.driver, 3).until(EC.element_to_be_clickable((By.XPATH, COOKIE_BUTTON_XPATH)))
             cookie_btn.click()
             time.sleep(1)
         except Exception as e:
@@ -128,6 +158,15 @@ class Trendyol_Category_Search:
         kategori butonlarına tıklayarak ürünlerin listelendiği sayfaya yönlendirir.
         """
         try:
+            # Önce diskteki kategori indeksinden çözmeyi dene: tek driver.get yeterli olur.
+            index = category_index.load_or_build(self.driver)
+            entry = index.resolve(category_string) if index else None
+            if entry:
+                logging.info("Kategori indeksten çözüldü: %s", " / ".join(entry["path"]))
+                self.driver.get(entry["url"])
+                page_ready.wait_for(self.driver, LISTING_READY_SELECTOR, label="trendyol_listing")
+                return self.driver.current_url
+
             parts = category_string.split()
             if len(parts) != 3:
                 logging.error("Lütfen kategori ifadesini 'AnaKategori AltKategori ÜrünKategorisi' formatında verin.")
@@ -212,8 +251,8 @@ class Trendyol_Category_Search:
             return None
 
     def close(self):
-        """Tarayıcıyı kapatır."""
-        self.driver.quit()
+        """Tarayıcıyı kapatır ve kalıcı profil slotunu serbest bırakır."""
+        driver_factory.quit_driver(self.driver)
 
 
 #######################################################################
@@ -222,50 +261,143 @@ class Trendyol_Category_Search:
 def get_text_from_xpaths(driver, xpaths):
     """
     Verilen XPath listesinde sırayla arar ve ilk boş olmayan text değerini döndürür.
+    Tüm liste tarayıcıda tek execute_script çağrısıyla denenir.
     """
-    for xpath in xpaths:
-        try:
-            element = driver.find_element(By.XPATH, xpath)
-            text = element.text.strip()
-            if text:
-                return text
-        except Exception:
-            continue
-    return None
+    values, _ = dom_extract.extract_fields(driver, {"value": xpaths})
+    return values["value"]
 
 
 #######################################################################
 # 2. Ürün Sayfasındaki Detayları İşleme ve Dışa Aktarma
 #######################################################################
-def process_product(driver, link_xpath, product_index, category_folder):
+def create_product_folder(product_details, product_index, category_folder):
+    """
+    Ürüne ait klasörü (ürün ismine göre, 200'den fazla değerlendirmesi varsa
+    "(potential)" ekiyle) oluşturur ve yolunu döndürür. Bilgiler görseller
+    işlendikten sonra write_product_json ile bir kez yazılır.
+    """
+    product_name = product_details.get('name')
+    review = product_details.get('review')
+    product_folder_name = re.sub(r'[\\/*?:"<>|]', "", product_name) if product_name else f"product_{product_index}"
+    review_digits = normalize.parse_count(review) or 0
+    if review_digits > 200:
+        product_folder_name += " (potential)"
+    product_folder = os.path.join(category_folder, product_folder_name)
+    if not os.path.exists(product_folder):
+        os.makedirs(product_folder)
+    return product_folder
+
+
+def write_product_json(product_details, product_folder, sink=None, scheduler=None):
+    """
+    Ürün bilgilerini kaydeder. sink (record_sink.RecordSink) verilirse kayıt
+    ortak JSONL dosyasına eklenir; klasördeki product.json gerektiğinde
+    "python record_sink.py expand" ile üretilir. Verilmezse product.json yazılır.
+    scheduler (recrawl_scheduler.RecrawlScheduler) verilirse görülen fiyat ve
+    değerlendirme sayısı bir sonraki tarama zamanı için kaydedilir.
+    """
+    if scheduler is not None:
+        scheduler.observe_record(product_details)
+    if sink is not None:
+        sink.write(product_details, folder=product_folder)
+        logging.info(f"Ürün bilgileri kayıt dosyasına eklendi: {product_folder}")
+        return
+    json_file_path = os.path.join(product_folder, "product.json")
+    with open(json_file_path, 'w', encoding='utf-8') as f:
+        json.dump(product_details, f, ensure_ascii=False, indent=4)
+    logging.info(f"Ürün bilgileri JSON olarak kaydedildi: {json_file_path}")
+
+
+def download_product_images(image_urls, product_folder, product_details, image_store=None):
+    """
+    İlk 3 galeri görselini indirir ve kaydedilen yolları döndürür. image_store
+    verilirse görseller içerik adresli depoya alınır (aynı görsel farklı
+    kategorilerde tekrar yazılmaz), referanslar ürün bilgilerine "image_refs"
+    olarak eklenir ve klasörde depo görünümü (hardlink/symlink) oluşturulur.
+    """
+    if image_store is None:
+        return image_downloader.download_gallery(image_urls, product_folder)
+    refs = image_downloader.store_gallery(image_urls, product_folder, image_store)
+    product_details['image_refs'] = refs
+    if image_store.view == blob_store.VIEW_NONE:
+        return []
+    return [os.path.join(product_folder, ref['file']) for ref in refs]
+
+
+def process_product_http(link_url, product_index, category_folder, image_store=None, sink=None, scheduler=None):
+    """
+    Ürün detaylarını sayfanın ilk HTML'ine gömülü JSON durumundan okur, aynı
+    bağlantı havuzuyla ilk 3 görseli indirir. Tarayıcı gerekmez; başarılıysa
+    ürün klasörünü döndürür, durum okunamazsa None döner ve Selenium akışı kullanılır.
+    """
+    http_details = trendyol_http.fetch_product_details(link_url)
+    if not http_details:
+        return None
+    product_details = {
+        'name': http_details['name'],
+        'review': http_details['review'],
+        'average': http_details['average'],
+        'price': http_details['price'],
+        'ProductLink': link_url,
+        'position': product_index
+    }
+    logging.info(f"Ürün Adı (HTTP): {product_details['name']}")
+    product_folder = create_product_folder(product_details, product_index, category_folder)
+    download_product_images(http_details['images'], product_folder, product_details, image_store)
+    write_product_json(product_details, product_folder, sink, scheduler)
+    return product_folder
+
+
+def skip_location(driver):
+    """
+    Konum seçme modalı varsa "atla" butonuna tıklar ve modal kapanana kadar
+    (buton görünmez ya da DOM'dan kalkmış olana kadar) bekler. Modal geç
+    çizilebildiği için buton kısa bir süre beklenerek aranır.
+    """
+    if not page_ready.wait_for(driver, SKIP_LOCATION_XPATH, timeout=SKIP_LOCATION_PROBE_TIMEOUT,
+                               label="trendyol_skip_location_probe"):
+        return False
+    skip_buttons = driver.find_elements(By.XPATH, SKIP_LOCATION_XPATH)
+    if not skip_buttons:
+        return False
+    skip_buttons[0].click()
+    try:
+        WebDriverWait(driver, SKIP_LOCATION_CLOSE_TIMEOUT).until(EC.invisibility_of_element(skip_buttons[0]))
+    except TimeoutException:
+        logging.info("Konum modalı %s sn içinde kapanmadı.", SKIP_LOCATION_CLOSE_TIMEOUT)
+    return True
+
+
+def process_product(driver, link_url, product_index, category_folder, image_store=None, sink=None,
+                    scheduler=None):
     """
-    Verilen ürün link XPath’ine göre ürün detay sayfasına gidip;
+    Verilen ürün linkine göre ürün detay sayfasına gidip;
       - Ürün bilgilerini (ürün adı, review, average, fiyat) farklı XPath’lerden deneme yoluyla çeker,
       - Ürüne ait klasörü (ürün ismine göre) oluşturup bilgileri JSON olarak kaydeder,
       - Ürün linkini "ProductLink" anahtarı altında JSON’a ekler,
       - Görsel galerisindeki ilk 3 resmi indirir.
-    İşlem sonunda ürün detay sayfasından liste sayfasına geri döner.
+    Detaylar önce HTTP hızlı yoluyla denenir; başarılı olursa sayfaya hiç gidilmez.
+    Linkler önceden toplandığı için liste sayfasına geri dönülmez; sonraki ürün
+    doğrudan açılır. Ürün adı okunabildiyse ürün klasörünü, aksi halde None döndürür.
     """
     try:
-        # Ürün linkini bulup detay sayfasına geçiş yapıyoruz.
-        link_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, link_xpath))
-        )
-        link_url = link_element.get_attribute("href")
+        product_folder = process_product_http(link_url, product_index, category_folder, image_store, sink,
+                                              scheduler)
+    except Exception as e:
+        logging.info(f"HTTP hızlı yolu başarısız, tarayıcıya geçiliyor: {e}")
+        product_folder = None
+    if product_folder:
+        return product_folder
+
+    try:
+        driver_factory.set_images(driver, True)
         driver.get(link_url)
         driver.fullscreen_window()
-        time.sleep(3)
+        page_ready.wait_for(driver, [SKIP_LOCATION_XPATH, PRODUCT_NAME_READY_SELECTOR], label="trendyol_product")
+        driver_factory.measure_page(driver, "trendyol_product")
 
         # Step 2: Konum seçme butonunu atla (varsa)
-        try:
-            skip_location = '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/aside/div/div/div[2]/div/div[2]/div/div/button'
-            skip_button = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.XPATH, skip_location))
-            )
-            skip_button.click()
-            time.sleep(5)
-        except TimeoutException:
-            pass  # Buton görünmüyorsa devam et
+        skip_location(driver)
 
         # --- Ürün Bilgilerini Çekme ---
         # Ürün adı için çoklu XPath listesi
@@ -299,25 +431,33 @@ def process_product(driver, link_xpath, product_index, category_folder):
             '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[2]/div/div/div[3]/div/div/div/div[2]/span[2]'
         ]
 
-        product_name = get_text_from_xpaths(driver, name_xpaths)
+        # Tüm alanlar ve yedek XPath'leri tarayıcıda tek çağrıda denenir.
+        fields, matched = dom_extract.extract_fields(driver, {
+            'name': name_xpaths,
+            'review': review_xpaths,
+            'average': average_xpaths,
+            'price': price_xpaths,
+        })
+
+        product_name = fields['name']
         if product_name:
             logging.info(f"Ürün Adı: {product_name}")
         else:
             logging.error("Ürün adı bulunamadı.")
 
-        review = get_text_from_xpaths(driver, review_xpaths)
+        review = fields['review']
         if review:
             logging.info(f"Review: {review}")
         else:
             logging.error("Review bilgisi bulunamadı.")
 
-        average = get_text_from_xpaths(driver, average_xpaths)
+        average = fields['average']
         if average:
             logging.info(f"Average: {average}")
         else:
             logging.error("Average bilgisi bulunamadı.")
 
-        price = get_text_from_xpaths(driver, price_xpaths)
+        price = fields['price']
         if price:
             logging.info(f"Price: {price}")
         else:
@@ -331,65 +471,35 @@ def process_product(driver, link_xpath, product_index, category_folder):
             'review': review if review else "",
             'average': average if average else "",
             'price': price if price else "",
-            'ProductLink': product_link
+            'ProductLink': product_link,
+            # Sıralama yöntemine göre listelemedeki sıra (ranking.py skorunda kullanılır)
+            'position': product_index
         }
 
-        # --- Ürün Klasörü Oluşturma ---
-        product_folder_name = re.sub(r'[\\/*?:"<>|]', "", product_name) if product_name else f"product_{product_index}"
-        try:
-            review_digits = int(''.join(filter(str.isdigit, review))) if review else 0
-        except Exception:
-            review_digits = 0
-        if review_digits > 200:
-            product_folder_name += " (potential)"
-        product_folder = os.path.join(category_folder, product_folder_name)
-        if not os.path.exists(product_folder):
-            os.makedirs(product_folder)
-
-        json_file_path = os.path.join(product_folder, "product.json")
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(product_details, f, ensure_ascii=False, indent=4)
-        logging.info(f"Ürün bilgileri JSON olarak kaydedildi: {json_file_path}")
+        product_folder = create_product_folder(product_details, product_index, category_folder)
 
         # --- Görsel Galerisi İşlemleri ---
         step3_xpath = '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[1]/div'
         gallery_button = WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.XPATH, step3_xpath))
         )
-        gallery_button.click()
-        time.sleep(3)
-
         css_selector = '#product-detail-app > div > div.flex-container > div > div:nth-child(2) > div:nth-child(1) > div > div.gallery-modal > div > img'
-        for i in range(1, 4):
-            try:
-                image_element = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
-                )
-                image_url = image_element.get_attribute('src')
-                logging.info(f"Görsel URL'si ({product_index}-{i}): {image_url}")
-
-                if image_url:
-                    response = requests.get(image_url)
-                    if response.status_code == 200:
-                        img_file_path = os.path.join(product_folder, f"image_{i}.jpg")
-                        with open(img_file_path, "wb") as file:
-                            file.write(response.content)
-                        logging.info(f"Görsel başarıyla indirildi: {img_file_path}")
-                    else:
-                        logging.error(f"Görsel indirilemedi, HTTP Durum Kodu: {response.status_code}")
-                else:
-                    logging.error(f"Görsel URL'si bulunamadı ({product_index}-{i}).")
-
-                ActionChains(driver).send_keys(Keys.ARROW_RIGHT).perform()
-                time.sleep(2)
-            except Exception as e:
-                logging.error(f"Görsel indirme sırasında hata oluştu ({product_index}-{i}): {e}")
+        # Galerideki tüm görsel adresleri tek seferde okunur; sayfada yoksa
+        # galeri açıldıktan sonra tekrar denenir. Ok tuşuyla gezinme yapılmaz.
+        image_urls = gallery.collect_gallery_image_urls(driver)
+        if not image_urls:
+            gallery_button.click()
+            page_ready.wait_for(driver, css_selector, label="trendyol_gallery")
+            image_urls = gallery.collect_gallery_image_urls(driver)
+        logging.info(f"Galeri görselleri ({product_index}): {image_urls[:3]}")
+        for img_file_path in download_product_images(image_urls, product_folder, product_details, image_store):
+            logging.info(f"Görsel başarıyla indirildi: {img_file_path}")
+        write_product_json(product_details, product_folder, sink, scheduler)
+        return product_folder if product_name else None
 
     except Exception as e:
         logging.error(f"Ürün işlenirken hata oluştu: {e}")
-    finally:
-        driver.back()
-        time.sleep(3)
+        return None
 
 
 #######################################################################
@@ -405,23 +515,44 @@ if __name__ == "__main__":
     # Sıralama metodu: "BEST_SELLER", "MOST_FAVOURITE" veya "MOST_RATED"
     sorting_method = "BEST_SELLER"  # İstediğiniz metodu buradan değiştirebilirsiniz.
     
+    # İşlenecek ürün sayısı
+    num_products = 4
+
+    # Fiyat takibi: günlük tarayıcı dakikası bütçesi. Verilirse yalnızca yeniden
+    # tarama süresi dolmuş ürünler (sık değişenler önce) işlenir; None ise
+    # tarama günlüğünde tamamlanmamış tüm ürünler işlenir.
+    recrawl_budget_minutes = None
+
+    # İlk argüman olarak link listesi dosyası verilebilir ("-" ise stdin okunur);
+    # bu durumda kategori ve listeleme sayfaları hiç açılmaz.
+    url_list_path = sys.argv[1] if len(sys.argv) > 1 else None
+
     # Trendyol kategori sayfasına ulaşmak için nesneyi oluşturuyoruz.
     category_search = Trendyol_Category_Search(driver_path)
     
     try:
-        target_url = category_search.navigate_to_category_by_name(kategori_param)
-        if not target_url:
-            logging.error("Kategoriye yönlendirme tamamlanamadı.")
-            category_search.close()
-            exit(1)
-        logging.info("Final Yönlendirilen URL: %s", target_url)
-
-        # Sıralama metoduna göre URL'yi güncelleyelim.
-        sorted_url = target_url + "?sst=" + sorting_method
         driver = category_search.driver
-        driver.get(sorted_url)
-        time.sleep(3)
-        logging.info("Sıralama metoduna göre URL: %s", driver.current_url)
+        if url_list_path:
+            product_links = listing_harvester.read_url_list(url_list_path)
+            logging.info("%d ürün linki %s kaynağından okundu.", len(product_links), url_list_path)
+        else:
+            target_url = category_search.navigate_to_category_by_name(kategori_param)
+            if not target_url:
+                logging.error("Kategoriye yönlendirme tamamlanamadı.")
+                category_search.close()
+                exit(1)
+            logging.info("Final Yönlendirilen URL: %s", target_url)
+
+            # Sıralama metoduna göre URL'yi güncelleyelim.
+            sorted_url = target_url + "?sst=" + sorting_method
+            driver_factory.set_images(driver, False)
+            driver.get(sorted_url)
+            page_ready.wait_for(driver, LISTING_READY_SELECTOR, label="trendyol_listing")
+            driver_factory.measure_page(driver, "trendyol_listing")
+            logging.info("Sıralama metoduna göre URL: %s", driver.current_url)
+
+            # Ürün linklerini tek seferde (sonsuz kaydırma ile) topluyoruz.
+            product_links = listing_harvester.harvest_product_links(driver, num_products)
 
         # Ana kategori adı, klasör yapısında kullanılacak (örneğin "Kozmetik")
         main_category_name = kategori_param.split()[0]
@@ -429,18 +560,50 @@ if __name__ == "__main__":
         if not os.path.exists(base_output_folder):
             os.makedirs(base_output_folder)
 
-        # Artık ürün listeleme sayfasındayız; ürünleri sırayla işleyelim.
-        # Örneğin ürün indeksleri 2'den 6'ya kadar işlenecek (sayfa yapısına göre ayarlayın)
-        start_index = 2
-        end_index = 6
-        for product_index in range(start_index, end_index):
-            product_xpath = f'//*[@id="search-app"]/div/div/div/div[2]/div[4]/div[1]/div/div[{product_index}]/div/a'
-            process_product(driver, product_xpath, product_index, base_output_folder)
-            if (product_index - start_index + 1) % 8 == 0:
-                driver.execute_script("window.scrollBy(0, 400);")
-                time.sleep(2)
+        # Ürün detay sayfalarını doğrudan açarak sırayla işliyoruz. Tarama günlüğünde
+        # tamamlanmış görünen ürünler atlanır, başarısız olanlar yeniden denenir.
+        journal = crawl_journal.CrawlJournal(os.path.join(base_output_folder, crawl_journal.DEFAULT_JOURNAL_NAME))
+        # Görseller tüm kategoriler için ortak, içerik adresli depoda tutulur.
+        image_store = blob_store.BlobStore(os.path.join(os.getcwd(), "Trendyol_Products", "_blobs"))
+        # Ürün bilgileri tek bir JSONL dosyasına arka planda eklenir; günlük, kayıtlar
+        # diske yazılmadan "done" işaretini kalıcı yapmaz.
+        sink = record_sink.RecordSink(os.path.join(base_output_folder, record_sink.DEFAULT_SINK_NAME))
+        journal.flush_before_sync(sink)
+        scheduler = None
+        if recrawl_budget_minutes is not None:
+            scheduler = recrawl_scheduler.RecrawlScheduler(
+                os.path.join(base_output_folder, recrawl_scheduler.DEFAULT_SCHEDULE_NAME),
+                daily_budget_minutes=recrawl_budget_minutes)
+        try:
+            items = list(enumerate(product_links, start=1))
+            if scheduler is not None:
+                pending = scheduler.plan(items, key=lambda item: item[1])
+            else:
+                pending = journal.pending(items, key=lambda item: item[1])
+            for product_index, link_url in pending:
+                if scheduler is not None and scheduler.budget_left() == 0:
+                    logging.info("Günlük tarama bütçesi doldu, kalan ürünler sonraki çalışmaya kaldı.")
+                    break
+                started = time.monotonic()
+                product_folder = process_product(driver, link_url, product_index, base_output_folder,
+                                                 image_store, sink, scheduler)
+                if scheduler is not None:
+                    scheduler.record_cost(time.monotonic() - started)
+                if product_folder:
+                    journal.mark_done(link_url, product_folder)
+                else:
+                    journal.mark_failed(link_url, "ürün işlenemedi")
+        finally:
+            journal.close()
+            sink.close()
+            if scheduler is not None:
+                scheduler.close()
+            image_store.log_summary()
+            image_store.close()
 
     except Exception as e:
         logging.error("Ana program çalışırken hata oluştu: %s", e)
     finally:
-        category_search.close()
\ No newline at end of file
+        category_search.close()
+        page_ready.stats.log_summary()
+        driver_factory.stats.log_summary()
\ No newline at end of file
@@ -2,19 +2,33 @@ import time
 import logging
 import os
 import re
-import json
-import requests
+import sys
+import queue
+import threading
+from collections import deque
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.keys import Keys
+
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_ready
+import driver_factory
+import dom_extract
+import crawl_journal
+import record_sink
+import blob_store
+from TRENDYOL import trendyol_http
+from TRENDYOL import listing_harvester
+from TRENDYOL import gallery
+from TRENDYOL import category_index
+import image_downloader
 
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -44,6 +58,32 @@ class TrendyolScraper:
     XPATH_AVERAGE_RATING_INFO = '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[2]/div/div/div[2]/div/div[1]/div/div[1]/div/div[1]'
     XPATH_PRICE_INFO = '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[2]/div/div/div[3]/div/div/span'
 
+    # Her alan için önce yukarıdaki XPath, ardından farklı sayfa düzenleri için yedekler
+    # denenir; hepsi tarayıcıda tek execute_script çağrısıyla okunur.
+    PRODUCT_FIELDS = {
+        'product_info': [
+            XPATH_PRODUCT_INFO,
+            '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[1]/div/div/div[1]/h1',
+            '#product-detail-app h1',
+        ],
+        'rating_info': [
+            XPATH_RATING_INFO,
+            '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[1]/div/div/div[2]/div/div[3]',
+        ],
+        'average_rating': [
+            XPATH_AVERAGE_RATING_INFO,
+            '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[1]/div/div/div[2]/div/div[1]/div/div[1]/div/div[1]',
+        ],
+        'price_info': [
+            XPATH_PRICE_INFO,
+            '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[2]/div/div/div[3]/div/div/div',
+            '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[2]/div/div[1]/div[2]/div/div/div[3]',
+        ],
+    }
+
+    XPATH_COOKIE_BUTTON = "/html/body/div[2]/div[2]/div/div[1]/div/div[2]/div/button[3]"
+    XPATH_CATEGORIES_MENU = "/html/body/div[1]/div[2]/div/div/div[1]/nav/div/div/div/div"
+
     # Galeri butonunun XPath’i (sayfanın üst kısmında yer alır)
     XPATH_GALLERY_BUTTON = '//*[@id="product-detail-app"]/div/div[2]/div/div[2]/div[1]/div'
     # Galeri modalındaki görseli çeken CSS selector
@@ -54,29 +94,70 @@ class TrendyolScraper:
         :param driver_path: ChromeDriver'ın tam yolu.
         :param base_url: Başlangıç URL’si (kategori menüsü açılabilsin diye).
         """
-        options = webdriver.ChromeOptions()
-        options.add_argument("--disable-notifications")
-        service = Service("/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver")
-        self.driver = webdriver.Chrome(service=service, options=options)
+        self.driver_path = driver_path
+        self.driver = self._create_driver()
         self.wait = WebDriverWait(self.driver, 20)
         self.action = ActionChains(self.driver)
         self.driver.get(base_url)
-        time.sleep(2)  # Sayfanın tam yüklenmesi için bekleme
+        # Sayfanın tam yüklenmesi için sabit süre yerine çerez butonu veya menü beklenir
+        page_ready.wait_for(self.driver, [self.XPATH_COOKIE_BUTTON, self.XPATH_CATEGORIES_MENU], label="trendyol_home")
         self.dismiss_cookies()
 
         # Ürünlerin kaydedileceği ana klasörü oluşturuyoruz:
         self.base_folder = Path.cwd() / "Trendyol Product"
         self.base_folder.mkdir(exist_ok=True)
+        # Yeniden başlatmada tamamlanmış ürünleri atlamak için tarama günlüğü
+        self.journal = crawl_journal.CrawlJournal(self.base_folder / crawl_journal.DEFAULT_JOURNAL_NAME)
+        # Ürün bilgileri ürün başına product.json yerine tek bir JSONL dosyasına arka planda
+        # eklenir; günlük fsync edilmeden önce kayıtlar diske yazılır.
+        self.sink = record_sink.RecordSink(self.base_folder / record_sink.DEFAULT_SINK_NAME)
+        self.journal.flush_before_sync(self.sink)
+        # Aynı ürün farklı kategorilerde tekrar geldiğinde görseller yeniden yazılmasın diye
+        # tüm kategoriler için ortak, içerik adresli görsel deposu
+        self.image_store = blob_store.BlobStore(self.base_folder / "_blobs")
         # Kategori isimlerini saklamak için
         self.current_main = None
         self.current_alt = None
         self.current_prod = None
+        # Paralel modda sayfa açılışlarını seyreltmek için ortak zaman damgası
+        self._throttle_lock = threading.Lock()
+        self._last_request_at = 0.0
 
-    def dismiss_cookies(self):
-        """Çerez popup’ını kapatır."""
+    def _create_driver(self, headless=False):
+        """
+        Yeni bir Chrome sürücüsü oluşturur. Paralel işçiler headless çalışır;
+        XPath'ler masaüstü yerleşimine göre yazıldığı için pencere boyutu sabitlenir.
+        Reklam, izleyici, yazı tipi ve video istekleri engellenir; görseller
+        yalnızca ürün (galeri) sayfalarında açılır.
+        """
+        return driver_factory.create_driver(
+            "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver",
+            headless=headless,
+            arguments=["--disable-notifications"],
+            marketplace="trendyol",
+        )
+
+    def _open_listing(self, url):
+        """Listeleme sayfasını görseller kapalıyken açar."""
+        driver_factory.set_images(self.driver, False)
+        self.driver.get(url)
+
+    def _open_product(self, driver, link_url):
+        """Ürün detay sayfasını galeri için görseller açıkken açar ve hazır olmasını bekler."""
+        driver_factory.set_images(driver, True)
+        driver.get(link_url)
+        page_ready.wait_for(driver, self.XPATH_PRODUCT_INFO, timeout=20, label="trendyol_product")
+        driver_factory.measure_page(driver, "trendyol_product")
+
+    def dismiss_cookies(self, driver=None, wait=None):
+        """
+        Çerez popup’ını kapatır. Sürücü verilmezse ana sürücü kullanılır. Kalıcı
+        profilde popup bir kez kapatıldıktan sonra tekrar çıkmadığı için kısa beklenir.
+        """
+        driver = driver or self.driver
+        wait = wait or WebDriverWait(driver, 3)
         try:
-            cookie_xpath = "/html/body/div[2]/div[2]/div/div[1]/div/div[2]/div/button[3]"
-            cookie_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, cookie_xpath)))
+            cookie_btn = wait.until(EC.element_to_be_clickable((By.XPATH, self.XPATH_COOKIE_BUTTON)))
             cookie_btn.click()
             time.sleep(1)
         except Exception as e:
@@ -86,8 +167,7 @@ class TrendyolScraper:
     # Kategori Navigasyonu
     # =====================
     def open_categories_menu(self):
-        tum_kategoriler_xpath = "/html/body/div[1]/div[2]/div/div/div[1]/nav/div/div/div/div"
-        menu_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, tum_kategoriler_xpath)))
+        menu_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, self.XPATH_CATEGORIES_MENU)))
         menu_element.click()
         time.sleep(1)
         main_category_container_xpath = "//*[@id='navigation-wrapper']/nav/div/div/div/div[2]/div/div[1]"
@@ -151,7 +231,30 @@ class TrendyolScraper:
             logging.info("Ürün kategorileri alınırken hata: %s", e)
             return []
 
+    def navigate_to_category_from_index(self, main_cat, alt_cat, prod_cat):
+        """
+        Kategoriyi diskteki kategori indeksinden çözüp tek driver.get ile açar.
+        İndeks yoksa veya süresi dolduysa menüden bir kez yeniden oluşturulur.
+        """
+        index = category_index.load_or_build(self.driver)
+        if index is None:
+            return False
+        entry = index.resolve(f"{main_cat} {alt_cat} {prod_cat}")
+        if entry is None:
+            logging.info("Kategori indekste bulunamadı: %s / %s / %s", main_cat, alt_cat, prod_cat)
+            return False
+        logging.info("Kategori indeksten çözüldü: %s -> %s", " / ".join(entry["path"]), entry["url"])
+        self._open_listing(entry["url"])
+        page_ready.wait_for(self.driver, listing_harvester.PRODUCT_LINK_SELECTOR, label="trendyol_listing")
+        driver_factory.measure_page(self.driver, "trendyol_listing")
+        return True
+
     def navigate_to_category(self, main_cat, alt_cat, prod_cat):
+        if self.navigate_to_category_from_index(main_cat, alt_cat, prod_cat):
+            self.current_main = main_cat
+            self.current_alt = alt_cat
+            self.current_prod = prod_cat
+            return True
         try:
             self.open_categories_menu()
             time.sleep(1)
@@ -229,137 +332,346 @@ class TrendyolScraper:
         new_query = urlencode(query, doseq=True)
         new_url = urlunparse((parsed_url.scheme, parsed_url.netloc, parsed_url.path,
                               parsed_url.params, new_query, parsed_url.fragment))
-        self.driver.get(new_url)
+        self._open_listing(new_url)
         try:
             self.wait.until(EC.url_contains("sst=" + sst_value))
+            driver_factory.measure_page(self.driver, "trendyol_listing")
             logging.info("Yeni URL (filtre uygulanmış): %s", self.driver.current_url)
             return True
         except TimeoutException as e:
             logging.error("Filtre uygulanırken hata: %s", e)
             return False
 
-    def process_product(self, product_xpath, product_index, category_folder):
+    def process_product(self, link_url, product_index, category_folder):
         """
-        Ürün detay sayfasını yeni sekmede açıp, ürün bilgilerini (ürün adı, 
-        değerlendirme bilgisi, ortalama puan, fiyat) ve görselleri indirir.
+        Ürün bilgilerini (ürün adı, değerlendirme bilgisi, ortalama puan, fiyat)
+        ve görselleri indirir. Önce HTTP hızlı yolu denenir; olmazsa detay sayfası
+        doğrudan açılır. Linkler önceden toplandığı için listeye geri dönülmez.
+        Sonuç tarama günlüğüne yazılır; başarılıysa ürün klasörünü döndürür.
         """
         try:
-            # Ürün linkini bul ve yeni sekmede aç
-            link_element = self.wait.until(EC.presence_of_element_located((By.XPATH, product_xpath)))
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", link_element)
-            time.sleep(1)
-            link_url = link_element.get_attribute('href')
-
-            original_window = self.driver.current_window_handle
-            self.driver.execute_script("window.open(arguments[0]);", link_url)
-            time.sleep(3)
-            all_windows = self.driver.window_handles
-            for window in all_windows:
-                if window != original_window:
-                    self.driver.switch_to.window(window)
-                    break
+            product_folder = self.process_product_http(link_url, product_index, category_folder)
+        except Exception as e:
+            logging.info("Ürün %d için HTTP hızlı yolu başarısız: %s", product_index, e)
+            product_folder = None
+        try:
+            if not product_folder:
+                self._open_product(self.driver, link_url)
+                product_folder = self.scrape_product_page(self.driver, self.wait, product_index, category_folder)
+        except Exception as e:
+            logging.error("process_product sırasında genel hata: %s", e)
+            self.journal.mark_failed(link_url, e)
+            return None
+        self._record_result(link_url, product_folder)
+        return product_folder
+
+    def _record_result(self, link_url, product_folder):
+        if product_folder:
+            self.journal.mark_done(link_url, product_folder)
+        else:
+            self.journal.mark_failed(link_url, "ürün bilgisi okunamadı")
+
+    def _product_folder(self, product_info, product_index, category_folder):
+        # Klasör ismi oluşturma: Ürün isminden geçersiz karakterleri temizleyip kısaltıyoruz.
+        # Görseller de bu klasöre yazıldığı için paralel işçiler birbirinin dosyasını ezmez.
+        product_name_safe = re.sub(r'[\\/*?:"<>|]', '_', product_info or 'urun').strip()[:30]
+        folder_suffix = ""
+        product_folder = category_folder / f"{product_index}_{product_name_safe}{folder_suffix}"
+        product_folder.mkdir(parents=True, exist_ok=True)
+        return product_folder
+
+    def _save_details(self, details, product_folder, product_index):
+        # Ürün detayları ortak kayıt dosyasına eklenir; klasördeki product.json
+        # gerekirse "python record_sink.py expand" ile üretilir.
+        self.sink.write(details, folder=product_folder)
+        logging.info("Ürün %d işleme alındı: %s", product_index, details.get('product_info', ''))
+
+    def process_product_http(self, link_url, product_index, category_folder):
+        """
+        Ürün detaylarını sayfanın ilk HTML'ine gömülü JSON durumundan okur ve
+        görselleri aynı bağlantı havuzuyla indirir. Tarayıcı render'ı gerekmez.
+        Başarılıysa ürün klasörünü, durum okunamazsa None döner; bu durumda
+        çağıran Selenium akışına geçer.
+        """
+        http_details = trendyol_http.fetch_product_details(link_url)
+        if not http_details:
+            return None
+        details = {
+            'product_info': http_details['name'],
+            'rating_info': http_details['review'],
+            'average_rating': http_details['average'],
+            'price_info': http_details['price'],
+        }
+        product_folder = self._product_folder(details['product_info'], product_index, category_folder)
+        self._store_images(details, http_details['images'], product_folder)
+        self._save_details(details, product_folder, product_index)
+        return product_folder
 
-            details = {}
+    def scrape_product_page(self, driver, wait, product_index, category_folder):
+        """
+        Açık olan ürün detay sayfasından bilgileri ve ilk 3 görseli çekip
+        ürün klasörüne kaydeder. Hem tek sürücülü akışta hem de paralel
+        işçilerde kullanılır; bu yüzden sürücü ve wait dışarıdan verilir.
+        Ürün adı okunabildiyse ürün klasörünü, okunamadıysa None döndürür.
+        """
+        details = {}
 
-            try:
-                product_info_elem = self.wait.until(EC.visibility_of_element_located((By.XPATH, self.XPATH_PRODUCT_INFO)))
-                details['product_info'] = product_info_elem.text.strip()
-            except Exception as e:
-                details['product_info'] = ""
-                logging.error("Ürün bilgileri alınırken hata: %s", e)
+        # Ürün adı görünür olunca tüm alanlar tek çağrıda okunur (alan başına ayrı bekleme yok).
+        page_ready.wait_for(driver, self.PRODUCT_FIELDS['product_info'], timeout=20, visible=True,
+                            label="trendyol_product_fields")
+        try:
+            fields, _ = dom_extract.extract_fields(driver, self.PRODUCT_FIELDS)
+        except Exception as e:
+            logging.error("Ürün bilgileri alınırken hata: %s", e)
+            fields = {}
+        for field in self.PRODUCT_FIELDS:
+            details[field] = fields.get(field) or ""
+            if not details[field]:
+                logging.error("Ürün %d için '%s' alanı bulunamadı.", product_index, field)
+
+        product_folder = self._product_folder(details.get('product_info'), product_index, category_folder)
+
+        # Görsel işleme: Galerideki tüm görsel adresleri DOM'dan tek seferde okunur;
+        # sayfada yoksa galeri butonuna tıklanıp modal açıldıktan sonra tekrar okunur.
+        image_urls = []
+        try:
+            image_urls = gallery.collect_gallery_image_urls(driver)
+            if not image_urls:
+                gallery_button = wait.until(EC.element_to_be_clickable((By.XPATH, self.XPATH_GALLERY_BUTTON)))
+                gallery_button.click()
+                page_ready.wait_for(driver, self.CSS_SELECTOR_GALLERY_IMAGE, label="trendyol_gallery")
+                image_urls = gallery.collect_gallery_image_urls(driver)
+            logging.info("Ürün %d için %d galeri görseli bulundu.", product_index, len(image_urls))
+        except Exception as e:
+            logging.error("Görsel galerisi işlenirken hata: %s", e)
+        self._store_images(details, image_urls, product_folder)
+        self._save_details(details, product_folder, product_index)
+        return product_folder if details.get('product_info') else None
 
-            try:
-                rating_info_elem = self.wait.until(EC.visibility_of_element_located((By.XPATH, self.XPATH_RATING_INFO)))
-                details['rating_info'] = rating_info_elem.text.strip()
-            except Exception as e:
-                details['rating_info'] = ""
-                logging.error("Değerlendirme bilgileri alınırken hata: %s", e)
+    def _store_images(self, details, image_urls, product_folder):
+        """
+        Görselleri içerik adresli depoya alır; details'e depo referanslarını
+        (image_refs) ve klasördeki görünüm dosyalarının yollarını (images) yazar.
+        """
+        refs = []
+        try:
+            refs = image_downloader.store_gallery(image_urls, product_folder, self.image_store)
+        except Exception as e:
+            logging.error("Görseller depoya alınırken hata: %s", e)
+        details['image_refs'] = refs
+        if self.image_store.view == blob_store.VIEW_NONE:
+            details['images'] = []
+        else:
+            details['images'] = [str(product_folder / ref['file']) for ref in refs]
 
-            try:
-                average_rating_elem = self.wait.until(EC.visibility_of_element_located((By.XPATH, self.XPATH_AVERAGE_RATING_INFO)))
-                details['average_rating'] = average_rating_elem.text.strip()
-            except Exception as e:
-                details['average_rating'] = ""
-                logging.error("Ortalama puan alınırken hata: %s", e)
+    def _category_folder(self):
+        if not (self.current_main and self.current_alt and self.current_prod):
+            logging.error("Kategori bilgileri ayarlanmadı. navigate_to_category çağrılmalı.")
+            return None
+        category_folder = self.base_folder / self.current_main / self.current_alt / self.current_prod
+        category_folder.mkdir(parents=True, exist_ok=True)
+        return category_folder
+
+    def process_products(self, num_products, urls=None):
+        """
+        Ürünleri sırayla işler. urls verilirse (ör. dosyadan okunan liste)
+        listeleme sayfası hiç taranmaz. Tarama günlüğünde tamamlanmış görünen
+        ürünler atlanır; sıra numaraları korunduğu için klasör adları değişmez.
+        """
+        category_folder = self._category_folder()
+        if category_folder is None:
+            return
 
+        links = self.journal.pending(self.collect_product_links(num_products, urls), key=lambda item: item[1])
+        for idx, link_url in links:
             try:
-                price_info_elem = self.wait.until(EC.visibility_of_element_located((By.XPATH, self.XPATH_PRICE_INFO)))
-                details['price_info'] = price_info_elem.text.strip()
+                logging.info("Ürün %d işleniyor...", idx)
+                self.process_product(link_url, idx, category_folder)
             except Exception as e:
-                details['price_info'] = ""
-                logging.error("Fiyat bilgileri alınırken hata: %s", e)
+                logging.error("Ürün %d işlenemedi: %s", idx, e)
+                continue
+
+    # =====================
+    # Çok Sekmeli Boru Hattı
+    # =====================
+    def _open_background_tab(self, link_url):
+        """
+        Linki yeni sekmede açar. Sekme önce boş açılır ve ağ engelleme profili
+        (CDP hedef başına çalıştığı için) ona da uygulanır; ardından adres
+        atanır ve yüklenmesi beklenmeden ana pencereye dönülür.
+        """
+        main_handle = self.driver.current_window_handle
+        before = set(self.driver.window_handles)
+        self.driver.execute_script("window.open('about:blank', '_blank');")
+        new_handles = [handle for handle in self.driver.window_handles if handle not in before]
+        if not new_handles:
+            return None
+        self.driver.switch_to.window(new_handles[0])
+        driver_factory.apply_to_current(self.driver)
+        driver_factory.set_images(self.driver, True)
+        self.driver.execute_script("window.location.href = arguments[0];", link_url)
+        self.driver.switch_to.window(main_handle)
+        return new_handles[0]
+
+    def process_products_pipelined(self, num_products, tabs=3, urls=None):
+        """
+        Tek sürücüde en fazla tabs adet ürün sekmesini aynı anda yüklemede tutar:
+        sıradaki sekmeden bilgiler çekilirken sonraki sekmeler arka planda
+        yüklenir, böylece ağ gecikmesi tek tarayıcıda bile gizlenir. HTTP hızlı
+        yolu başarılı olan ürünler için sekme açılmaz.
+        """
+        category_folder = self._category_folder()
+        if category_folder is None:
+            return
 
-            # Görsel işleme: Galeri butonuna tıklayıp, açılan modaldan ilk 3 görseli indir
-            images = []
+        main_handle = self.driver.current_window_handle
+        pending = deque(self.journal.pending(self.collect_product_links(num_products, urls), key=lambda item: item[1]))
+        in_flight = deque()
+
+        def fill():
+            while pending and len(in_flight) < tabs:
+                product_index, link_url = pending.popleft()
+                if self._record_http(link_url, product_index, category_folder):
+                    continue
+                self.driver.switch_to.window(main_handle)
+                handle = self._open_background_tab(link_url)
+                if handle is None:
+                    logging.error("Ürün %d için sekme açılamadı.", product_index)
+                    self.journal.mark_failed(link_url, "sekme açılamadı")
+                    continue
+                in_flight.append((product_index, link_url, handle))
+
+        fill()
+        while in_flight:
+            product_index, link_url, handle = in_flight.popleft()
             try:
-                gallery_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, self.XPATH_GALLERY_BUTTON)))
-                gallery_button.click()
-                time.sleep(3)
-                for i in range(1, 4):
-                    try:
-                        image_element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, self.CSS_SELECTOR_GALLERY_IMAGE)))
-                        image_url = image_element.get_attribute('src')
-                        logging.info(f"Görsel URL'si ({product_index}-{i}): {image_url}")
-                        if image_url:
-                            response = requests.get(image_url)
-                            if response.status_code == 200:
-                                image_filename = f'image_{i}.jpg'
-                                image_path = category_folder / image_filename
-                                with open(image_path, 'wb') as f:
-                                    f.write(response.content)
-                                images.append(str(image_path))
-                            else:
-                                logging.error(f"Görsel indirilemedi, HTTP Durum Kodu: {response.status_code}")
-                        else:
-                            logging.error(f"Görsel URL'si bulunamadı ({product_index}-{i}).")
-                        # Galeride sonraki görsele geçmek için sağ ok tuşu gönderiyoruz
-                        ActionChains(self.driver).send_keys(Keys.ARROW_RIGHT).perform()
-                        time.sleep(2)
-                    except Exception as e:
-                        logging.error(f"Görsel indirme sırasında hata oluştu ({product_index}-{i}): {e}")
+                logging.info("Ürün %d işleniyor (%d sekme yüklemede)...", product_index, len(in_flight))
+                self.driver.switch_to.window(handle)
+                page_ready.wait_for(self.driver, self.XPATH_PRODUCT_INFO, timeout=20, label="trendyol_product")
+                driver_factory.measure_page(self.driver, "trendyol_product")
+                product_folder = self.scrape_product_page(self.driver, self.wait, product_index, category_folder)
+                self._record_result(link_url, product_folder)
             except Exception as e:
-                logging.error("Görsel galerisi açılırken hata: %s", e)
-            details['images'] = images
-
-            # Klasör ismi oluşturma: Ürün isminden geçersiz karakterleri temizleyip kısaltıyoruz.
-            product_name_safe = re.sub(r'[\\/*?:"<>|]', '_', details.get('product_info', 'urun')).strip()[:30]
-            folder_suffix = ""
-            product_folder = category_folder / f"{product_index}_{product_name_safe}{folder_suffix}"
-            product_folder.mkdir(parents=True, exist_ok=True)
+                logging.error("Ürün %d işlenemedi: %s", product_index, e)
+                self.journal.mark_failed(link_url, e)
+            finally:
+                try:
+                    if self.driver.current_window_handle != main_handle:
+                        self.driver.close()
+                except Exception as e:
+                    logging.info("Sekme kapatılamadı: %s", e)
+                self.driver.switch_to.window(main_handle)
+            # Bir sekme boşaldı: sonraki ürünü hemen yüklemeye başlat
+            fill()
+
+    def _record_http(self, link_url, product_index, category_folder):
+        """HTTP hızlı yolunu dener; başarılıysa günlüğe yazıp True döner."""
+        try:
+            product_folder = self.process_product_http(link_url, product_index, category_folder)
+        except Exception as e:
+            logging.info("Ürün %d için HTTP hızlı yolu başarısız: %s", product_index, e)
+            return False
+        if product_folder:
+            self.journal.mark_done(link_url, product_folder)
+            return True
+        return False
 
-            # JSON dosyasına ürün detaylarını kaydetme
-            json_path = product_folder / 'product.json'
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(details, f, ensure_ascii=False, indent=4)
+    # =====================
+    # Paralel İşçi Havuzu
+    # =====================
+    def collect_product_links(self, num_products, urls=None):
+        """
+        (sıra, link) çiftlerini döndürür. urls verilmezse listeleme ızgarasındaki
+        linkler tek script çağrısıyla, sonsuz kaydırma ile num_products'a kadar toplanır.
+        """
+        if urls is None:
+            urls = listing_harvester.harvest_product_links(self.driver, num_products)
+        else:
+            urls = listing_harvester.dedupe_links(urls)[:num_products]
+        return list(enumerate(urls, start=1))
 
-            logging.info("Ürün %d işleme alındı: %s", product_index, details.get('product_info', ''))
+    def _throttle(self, min_interval):
+        """
+        Tüm işçiler arasında iki sayfa açılışı arasında en az min_interval saniye
+        bırakır; sitenin hız sınırına takılmamak için kullanılır.
+        """
+        if min_interval <= 0:
+            return
+        with self._throttle_lock:
+            wait_for = self._last_request_at + min_interval - time.monotonic()
+            if wait_for > 0:
+                time.sleep(wait_for)
+            self._last_request_at = time.monotonic()
+
+    def _product_worker(self, worker_id, work_queue, category_folder, min_interval):
+        """Kuyruktan ürün linki çekip kendi headless sürücüsünde işleyen işçi."""
+        try:
+            driver = self._create_driver(headless=True)
         except Exception as e:
-            logging.error("process_product sırasında genel hata: %s", e)
+            logging.error("İşçi %d için sürücü başlatılamadı: %s", worker_id, e)
+            return
+        wait = WebDriverWait(driver, 20)
+        cookies_checked = False
+        try:
+            while True:
+                try:
+                    product_index, link_url = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    logging.info("İşçi %d: ürün %d işleniyor...", worker_id, product_index)
+                    self._throttle(min_interval)
+                    product_folder = self.process_product_http(link_url, product_index, category_folder)
+                    if not product_folder:
+                        self._open_product(driver, link_url)
+                        if not cookies_checked:
+                            self.dismiss_cookies(driver, WebDriverWait(driver, 5))
+                            cookies_checked = True
+                        product_folder = self.scrape_product_page(driver, wait, product_index, category_folder)
+                    self._record_result(link_url, product_folder)
+                except Exception as e:
+                    logging.error("İşçi %d: ürün %d işlenemedi: %s", worker_id, product_index, e)
+                    self.journal.mark_failed(link_url, e)
+                finally:
+                    work_queue.task_done()
         finally:
-            # Yeni sekmeyi kapatıp ana pencereye geri dönüyoruz
-            self.driver.close()
-            self.driver.switch_to.window(original_window)
-            time.sleep(2)
+            driver_factory.quit_driver(driver)
 
-    def process_products(self, num_products):
-        if not (self.current_main and self.current_alt and self.current_prod):
-            logging.error("Kategori bilgileri ayarlanmadı. navigate_to_category çağrılmalı.")
+    def process_products_parallel(self, num_products, workers=4, min_interval=0.0, urls=None):
+        """
+        Ürün linklerini ana sürücüden toplayıp ortak bir kuyruğa koyar; workers
+        adet headless Chrome bu kuyruktan ürün çekerek detay sayfalarını işler.
+        Sonuçlar tek sürücülü akışla aynı klasör yapısına yazılır.
+        """
+        category_folder = self._category_folder()
+        if category_folder is None:
             return
 
-        category_folder = self.base_folder / self.current_main / self.current_alt / self.current_prod
-        category_folder.mkdir(parents=True, exist_ok=True)
-
-        for idx in range(1, num_products + 1):
-            try:
-                product_xpath = f'//*[@id="search-app"]/div/div/div/div[2]/div[4]/div[1]/div/div[{idx}]/div/a'
-                logging.info("Ürün %d işleniyor...", idx)
-                self.process_product(product_xpath, idx, category_folder)
-            except Exception as e:
-                logging.error("Ürün %d işlenemedi: %s", idx, e)
-                continue
+        work_queue = queue.Queue()
+        links = self.journal.pending(self.collect_product_links(num_products, urls), key=lambda item: item[1])
+        for product_index, link_url in links:
+            if link_url:
+                work_queue.put((product_index, link_url))
+        logging.info("%d ürün %d işçiye dağıtılıyor.", work_queue.qsize(), workers)
+
+        threads = []
+        for worker_id in range(1, workers + 1):
+            thread = threading.Thread(
+                target=self._product_worker,
+                args=(worker_id, work_queue, category_folder, min_interval),
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
 
     def close(self):
-        self.driver.quit()
+        self.journal.close()
+        self.sink.close()
+        self.image_store.log_summary()
+        self.image_store.close()
+        driver_factory.quit_driver(self.driver)
 
 
 if __name__ == "__main__":
@@ -371,18 +683,35 @@ if __name__ == "__main__":
     product_category = "Dudak kalemi"
     sort_filter = "en çok satan"
     num_products = 4
+    # 1'den büyükse ürünler paralel headless sürücülerle işlenir
+    num_workers = 1
+    # 1'den büyükse tek sürücüde bu kadar ürün sekmesi aynı anda yüklemede tutulur
+    num_tabs = 1
+    # İlk argüman olarak link listesi dosyası verilebilir ("-" ise stdin okunur);
+    # bu durumda listeleme sayfası taranmaz, ürünler doğrudan açılır.
+    url_list_path = sys.argv[1] if len(sys.argv) > 1 else None
+    urls = listing_harvester.read_url_list(url_list_path) if url_list_path else None
+    if urls is not None:
+        num_products = len(urls)
 
     scraper = TrendyolScraper(driver_path=DRIVER_PATH)
     try:
         if scraper.navigate_to_category(main_category, alt_category, product_category):
-            if scraper.apply_sort_filter(sort_filter):
-                scraper.process_products(num_products)
+            if urls is not None or scraper.apply_sort_filter(sort_filter):
+                if num_workers > 1:
+                    scraper.process_products_parallel(num_products, workers=num_workers, urls=urls)
+                elif num_tabs > 1:
+                    scraper.process_products_pipelined(num_products, tabs=num_tabs, urls=urls)
+                else:
+                    scraper.process_products(num_products, urls=urls)
             else:
                 logging.error("Sıralama filtresi uygulanamadı.")
         else:
             logging.error("Kategoriye yönlendirme yapılamadı.")
     finally:
         scraper.close()
+        page_ready.stats.log_summary()
+        driver_factory.stats.log_summary()
 
 
 
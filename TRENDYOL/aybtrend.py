@@ -6,14 +6,21 @@ from selenium.webdriver.common.keys import Keys  # Keys sınıfını içe aktar
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
+from urllib.parse import quote_plus
 
 
 
 
+def search_url(query, sort="BEST_SELLER"):
+    """Arama terimi için sıralama parametreli Trendyol arama sayfası adresi."""
+    term = quote_plus(query)
+    return f"https://www.trendyol.com/sr?q={term}&qt={term}&st={term}&os=1&sst={sort}"
+
+
 def search_trendyol(driver, query):
     try:
         # BEST_SELLER parametresi dahil edilerek URL oluştur
-        url = f"https://www.trendyol.com/sr?q={query}&qt={query}&st={query}&os=1&sst=BEST_SELLER"
+        url = search_url(query)
         driver.get(url)
         print(f"'{query}' BEST_SELLER araması için sayfa açıldı.")
     except Exception as e:
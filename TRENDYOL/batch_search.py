@@ -0,0 +1,226 @@
+"""
+aybtrend.search_trendyol için çok terimli toplu arama.
+
+Bir dosyadaki yüzlerce arama terimi işçilere dağıtılır; her işçi kendi
+tarayıcısında terimi arar ve listeleme ızgarasından ürün linklerini toplar.
+Linkler kanonik URL'ye göre tek bir ortak kümede birleştirilir, böylece birden
+fazla terimle bulunan ürün yalnızca bir kez işlenir. Ürün detayları önce HTTP
+hızlı yoluyla, olmazsa tarayıcıda okunur ve her ürün, onu bulan tüm arama
+terimleriyle etiketlenerek tek bir JSONL veri setine yazılır.
+
+Kullanım:
+    python -m TRENDYOL.batch_search terimler.txt
+"""
+
+import os
+import sys
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Betik alt klasörden doğrudan çalıştırıldığında depo kökündeki modüller de bulunsun
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_ready
+import dom_extract
+import crawl_journal
+import record_sink
+import driver_factory
+import driver_daemon
+from TRENDYOL import aybtrend
+from TRENDYOL import trendyol_http
+from TRENDYOL import listing_harvester
+from TRENDYOL.Trendyol_Category_Search18 import TrendyolScraper
+
+DRIVER_PATH = "/Users/ayberkturk/Desktop/chromedriver-mac-arm64-2/chromedriver"
+
+# HTTP hızlı yolu başarısız olduğunda tarayıcıda TrendyolScraper'ın alan tanımı
+# okunur; alan adları veri setindeki kayıt alanlarına eşlenir.
+PRODUCT_FIELDS = TrendyolScraper.PRODUCT_FIELDS
+RECORD_KEYS = {
+    "product_info": "name",
+    "rating_info": "review",
+    "average_rating": "average",
+    "price_info": "price",
+}
+
+
+def read_queries(path):
+    """Her satırda bir arama terimi; boş ve # ile başlayan satırlar atlanır, tekrarlar çıkarılır."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    queries = []
+    seen = set()
+    for line in lines:
+        query = line.strip()
+        if not query or query.startswith("#") or query.lower() in seen:
+            continue
+        seen.add(query.lower())
+        queries.append(query)
+    return queries
+
+
+class BatchSearch:
+    def __init__(self, driver_path=DRIVER_PATH, workers=2, per_query=20, http_workers=8,
+                 output_dir="Trendyol_Batch"):
+        """
+        :param workers: Aramaları paralel yürüten tarayıcı sayısı.
+        :param per_query: Her arama teriminden toplanacak en fazla ürün linki.
+        :param http_workers: Ürün detaylarını HTTP ile çeken eşzamanlı istek sayısı.
+        """
+        self.driver_path = driver_path
+        self.workers = workers
+        self.per_query = per_query
+        self.http_workers = http_workers
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.dataset_path = os.path.join(output_dir, record_sink.DEFAULT_SINK_NAME)
+
+        # Kanonik URL -> {"url": ..., "queries": [...]}; tüm işçilerin ortak tekrar kümesi
+        self.products = {}
+        self._products_lock = threading.Lock()
+        self.sink = record_sink.RecordSink(self.dataset_path)
+        self.journal = crawl_journal.CrawlJournal(os.path.join(output_dir, crawl_journal.DEFAULT_JOURNAL_NAME))
+        self.journal.flush_before_sync(self.sink)
+        self.drivers = []
+
+    # =====================
+    # Tarayıcı işçileri
+    # =====================
+    def _start_drivers(self):
+        for _ in range(self.workers):
+            self.drivers.append(driver_daemon.acquire_driver("trendyol", self.driver_path, headless=True))
+
+    def _stop_drivers(self):
+        for driver in self.drivers:
+            try:
+                driver_factory.quit_driver(driver)
+            except Exception as e:
+                logging.info("Sürücü kapatılırken hata: %s", e)
+        self.drivers = []
+
+    def _run_on_drivers(self, items, task):
+        """items'ı ortak kuyruktan her sürücüye bir iş parçacığıyla dağıtır: task(driver, item)."""
+        work_queue = queue.Queue()
+        for item in items:
+            work_queue.put(item)
+
+        def worker(driver):
+            while True:
+                try:
+                    item = work_queue.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    task(driver, item)
+                except Exception as e:
+                    logging.error("Toplu arama işi başarısız (%s): %s", item, e)
+
+        threads = [threading.Thread(target=worker, args=(driver,), daemon=True) for driver in self.drivers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # =====================
+    # 1. Aşama: arama ve link toplama
+    # =====================
+    def _add_links(self, query, links):
+        added = 0
+        with self._products_lock:
+            for link in links:
+                key = crawl_journal.canonical_url(link)
+                product = self.products.get(key)
+                if product is None:
+                    self.products[key] = {"url": link, "queries": [query]}
+                    added += 1
+                elif query not in product["queries"]:
+                    product["queries"].append(query)
+        return added
+
+    def _search(self, driver, query):
+        driver_factory.set_images(driver, False)
+        aybtrend.search_trendyol(driver, query)
+        page_ready.wait_for(driver, listing_harvester.PRODUCT_LINK_SELECTOR, label="trendyol_search")
+        links = listing_harvester.harvest_product_links(driver, self.per_query)
+        added = self._add_links(query, links)
+        logging.info("'%s': %d link, %d yeni ürün.", query, len(links), added)
+
+    def harvest(self, queries):
+        self._run_on_drivers(queries, self._search)
+        logging.info("%d arama teriminden %d benzersiz ürün bulundu.", len(queries), len(self.products))
+
+    # =====================
+    # 2. Aşama: ürün detayları
+    # =====================
+    def _write_record(self, product, details, source):
+        record = {
+            "url": product["url"],
+            "queries": list(product["queries"]),
+            "name": details.get("name", ""),
+            "review": details.get("review", ""),
+            "average": details.get("average", ""),
+            "price": details.get("price", ""),
+            "images": details.get("images", []),
+            "source": source,
+        }
+        self.sink.write(record)
+        self.journal.mark_done(product["url"], self.dataset_path)
+
+    def _fetch_http(self, product):
+        details = trendyol_http.fetch_product_details(product["url"])
+        if details:
+            self._write_record(product, details, "http")
+            return True
+        return False
+
+    def _scrape_in_browser(self, driver, product):
+        driver_factory.set_images(driver, False)
+        driver.get(product["url"])
+        page_ready.wait_for(driver, PRODUCT_FIELDS["product_info"], timeout=20, visible=True,
+                            label="trendyol_product")
+        values, _ = dom_extract.extract_fields(driver, PRODUCT_FIELDS)
+        if not values.get("product_info"):
+            self.journal.mark_failed(product["url"], "ürün adı okunamadı")
+            return
+        details = {RECORD_KEYS[field]: value or "" for field, value in values.items()}
+        self._write_record(product, details, "browser")
+
+    def process_products(self):
+        pending = self.journal.pending(list(self.products.values()), key=lambda product: product["url"])
+        with ThreadPoolExecutor(max_workers=self.http_workers) as executor:
+            results = list(executor.map(self._fetch_http, pending))
+        fallback = [product for product, ok in zip(pending, results) if not ok]
+        logging.info("%d ürün HTTP ile işlendi, %d ürün tarayıcıda okunacak.",
+                     len(pending) - len(fallback), len(fallback))
+        if fallback:
+            self._run_on_drivers(fallback, self._scrape_in_browser)
+
+    def run(self, queries):
+        """Tüm terimleri arar, ürünleri bir kez işler ve veri setinin yolunu döndürür."""
+        self._start_drivers()
+        try:
+            self.harvest(queries)
+            self.process_products()
+        finally:
+            self._stop_drivers()
+            self.journal.close()
+            self.sink.close()
+        return self.dataset_path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    # İlk argüman arama terimleri dosyası ("-" ise stdin okunur)
+    queries_path = sys.argv[1] if len(sys.argv) > 1 else "queries.txt"
+    num_workers = 2
+
+    queries = read_queries(queries_path)
+    logging.info("%d arama terimi okundu: %s", len(queries), queries_path)
+    dataset = BatchSearch(workers=num_workers).run(queries)
+    logging.info("Veri seti yazıldı: %s", dataset)
+    page_ready.stats.log_summary()
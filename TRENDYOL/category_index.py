@@ -0,0 +1,216 @@
+"""
+Trendyol kategori ağacının (Ana / Alt / Ürün kategorisi) diskte saklanan,
+süreli (TTL) önbelleği ve bulanık isim araması.
+
+Ağaç bir kez menüden okunur ve JSON olarak kaydedilir; sonraki çalıştırmalarda
+"Kozmetik Makyaj Dudak kalemi" gibi bir ifade bellekteki indeksten doğrudan
+kategori URL'sine çözülür ve tek bir driver.get ile sayfaya gidilir.
+"""
+
+import os
+import json
+import time
+import logging
+from difflib import SequenceMatcher, get_close_matches
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+DEFAULT_INDEX_PATH = os.path.join(os.getcwd(), "trendyol_categories.json")
+DEFAULT_TTL = 7 * 24 * 3600  # saniye
+
+MENU_BUTTON_XPATH = "/html/body/div[1]/div[2]/div/div/div[1]/nav/div/div/div/div"
+MAIN_CONTAINER_XPATH = "//*[@id='navigation-wrapper']/nav/div/div/div/div[2]/div/div[1]"
+ALT_CONTAINER_XPATH = "//*[@id='navigation-wrapper']/nav/div/div/div/div[2]/div/div[2]/div"
+
+# Hover ile açılan alt kategori panelinin tamamını tek çağrıda okur.
+_ALT_PANEL_SCRIPT = """
+var container = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!container) { return []; }
+var blocks = [];
+Array.prototype.forEach.call(container.children, function (block) {
+    var title = (block.innerText || '').split('\\n')[0].trim();
+    if (!title) { return; }
+    var head = null;
+    block.querySelectorAll('a').forEach(function (a) {
+        if (!head && !a.closest('ul')) { head = a; }
+    });
+    var children = [];
+    block.querySelectorAll('ul li a').forEach(function (a) {
+        var name = (a.textContent || '').trim();
+        if (name && a.href) { children.push({name: name, url: a.href}); }
+    });
+    blocks.push({name: title, url: head ? head.href : null, children: children});
+});
+return blocks;
+"""
+
+_TURKISH_ASCII = str.maketrans("çğıöşü", "cgiosu")
+
+
+def fold(text):
+    """
+    Türkçe'ye duyarlı küçük harfe çevirme: "I" -> "ı", "İ" -> "i" dönüşümü
+    yapılır, ardından aksanlar atılarak (ç->c, ş->s ...) karşılaştırılabilir hale getirilir.
+    """
+    text = text.replace("I", "ı").replace("İ", "i").lower()
+    return text.translate(_TURKISH_ASCII)
+
+
+def _tokens(text):
+    return [token for token in fold(text).replace("&", " ").replace(",", " ").split() if token]
+
+
+class CategoryIndex:
+    """Kategori yollarını ve URL'lerini tutan bellek içi bulanık arama indeksi."""
+
+    def __init__(self, entries, created_at=None):
+        # entries: [{"path": ["Kozmetik", "Makyaj", "Dudak Kalemi"], "url": "..."}, ...]
+        self.entries = [entry for entry in entries if entry.get("url")]
+        self.created_at = created_at or time.time()
+        self._by_token = {}
+        self._entry_tokens = []
+        for position, entry in enumerate(self.entries):
+            tokens = _tokens(" ".join(entry["path"]))
+            self._entry_tokens.append(tokens)
+            for token in set(tokens):
+                self._by_token.setdefault(token, set()).add(position)
+        self._vocabulary = list(self._by_token)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH, ttl=DEFAULT_TTL):
+        """Diskteki indeksi yükler; dosya yoksa ya da süresi dolmuşsa None döner."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.info("Kategori indeksi okunamadı: %s", e)
+            return None
+        if time.time() - data.get("created_at", 0) > ttl:
+            logging.info("Kategori indeksinin süresi dolmuş, yeniden oluşturulacak.")
+            return None
+        return cls(data.get("entries", []), created_at=data.get("created_at"))
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": self.created_at, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _match_token(self, token):
+        """Sorgudaki bir kelimeye karşılık gelen indeks kelimelerini döndürür (tam, önek veya yakın eşleşme)."""
+        if token in self._by_token:
+            return [token]
+        matches = [word for word in self._vocabulary if word.startswith(token) or token.startswith(word)]
+        return matches or get_close_matches(token, self._vocabulary, n=3, cutoff=0.8)
+
+    def search(self, query, limit=5):
+        """
+        Sorguyu kategori yollarıyla karşılaştırır ve (puan, kapsama, kayıt) listesini
+        en iyi eşleşme başta olacak şekilde döndürür.
+        """
+        query_tokens = _tokens(query)
+        if not query_tokens:
+            return []
+        hits = {}
+        for token in query_tokens:
+            for word in self._match_token(token):
+                for position in self._by_token[word]:
+                    hits[position] = hits.get(position, 0) + 1
+        folded_query = " ".join(query_tokens)
+        scored = []
+        for position, matched in hits.items():
+            entry_tokens = self._entry_tokens[position]
+            coverage = matched / len(query_tokens)
+            similarity = SequenceMatcher(None, folded_query, " ".join(entry_tokens)).ratio()
+            # Aynı kapsamda daha derin (daha özel) kategori öne geçsin
+            score = coverage + 0.5 * similarity + 0.01 * len(self.entries[position]["path"])
+            scored.append((round(score, 4), round(coverage, 4), self.entries[position]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored[:limit]
+
+    def _leaf_matches(self, query_tokens, entry):
+        """
+        Sorgunun son kelimeleri kaydın son yol parçasıyla (yaprak kategori)
+        birebir eşleşiyor mu? "... Göz kalemi" sorgusu "Dudak Kalemi"
+        yaprağına, ortak kelimeleri yüzünden, çözülmesin.
+        """
+        leaf_tokens = _tokens(entry["path"][-1])
+        if not leaf_tokens or len(leaf_tokens) > len(query_tokens):
+            return False
+        trailing = query_tokens[-len(leaf_tokens):]
+        return all(leaf in self._match_token(token) for token, leaf in zip(trailing, leaf_tokens))
+
+    def resolve(self, query, min_coverage=0.75, candidates=10):
+        """
+        Sorguya en iyi uyan kategori kaydını döndürür. Sorgu kelimelerinin en az
+        min_coverage oranı eşleşmeli ve sorgunun son kelimeleri kaydın yaprak
+        kategorisiyle tam eşleşmelidir; uygun kayıt yoksa None döner (çağıran
+        menüden tıklama yoluna düşer).
+        """
+        query_tokens = _tokens(query)
+        for _, coverage, entry in self.search(query, limit=candidates):
+            if coverage >= min_coverage and self._leaf_matches(query_tokens, entry):
+                return entry
+        return None
+
+
+def snapshot_category_tree(driver, wait=None):
+    """
+    Kategori menüsünü açıp her ana kategori için bir hover ve tek bir
+    execute_script ile alt/ürün kategorilerini okur. Kayıt listesi döndürür.
+    """
+    wait = wait or WebDriverWait(driver, 10)
+    wait.until(EC.element_to_be_clickable((By.XPATH, MENU_BUTTON_XPATH))).click()
+    wait.until(EC.visibility_of_element_located((By.XPATH, MAIN_CONTAINER_XPATH)))
+    main_elements = driver.find_elements(By.XPATH, MAIN_CONTAINER_XPATH + "/div")
+
+    entries = []
+    previous_signature = None
+    for main_element in main_elements:
+        main_name = main_element.text.strip()
+        if not main_name:
+            continue
+        ActionChains(driver).move_to_element(main_element).perform()
+        # Panel içeriği bir önceki ana kategoriden farklılaşana kadar kısa aralıklarla bak
+        blocks = []
+        for _ in range(15):
+            blocks = driver.execute_script(_ALT_PANEL_SCRIPT, ALT_CONTAINER_XPATH) or []
+            signature = tuple(block["name"] for block in blocks)
+            if blocks and signature != previous_signature:
+                previous_signature = signature
+                break
+            time.sleep(0.2)
+        for block in blocks:
+            if block.get("url"):
+                entries.append({"path": [main_name, block["name"]], "url": block["url"]})
+            for child in block.get("children", []):
+                entries.append({"path": [main_name, block["name"], child["name"]], "url": child["url"]})
+        logging.info("Kategori ağacı: '%s' altında %d alt kategori okundu.", main_name, len(blocks))
+    return entries
+
+
+def load_or_build(driver, path=DEFAULT_INDEX_PATH, ttl=DEFAULT_TTL):
+    """
+    Süresi dolmamış indeks diskte varsa onu, yoksa menüden yeni bir anlık
+    görüntü alıp kaydederek indeksi döndürür. Menü okunamazsa None döner.
+    """
+    index = CategoryIndex.load(path, ttl)
+    if index is not None:
+        return index
+    try:
+        entries = snapshot_category_tree(driver)
+    except Exception as e:
+        logging.error("Kategori ağacı okunamadı: %s", e)
+        return None
+    if not entries:
+        return None
+    index = CategoryIndex(entries)
+    index.save(path)
+    logging.info("Kategori indeksi kaydedildi (%d kayıt): %s", len(entries), path)
+    return index
@@ -0,0 +1,45 @@
+import re
+
+# Galeri küçük resimleri "/mnresize/<genişlik>/<yükseklik>/" ile küçültülmüş
+# adresler kullanır; bu kısım atılınca CDN orijinal boyutu döndürür.
+_RESIZE_PATTERN = re.compile(r"/mnresize/\d+/\d+")
+
+# Galeri, küçük resim şeridi ve açılmış galeri modalındaki tüm ürün görsellerini
+# tek execute_script çağrısında toplar.
+_GALLERY_SCRIPT = """
+var selectors = [
+    '#product-detail-app .gallery-modal img',
+    '#product-detail-app [class*="gallery"] img',
+    '#product-detail-app [class*="slider"] img',
+    '#product-detail-app [class*="product-slide"] img',
+    '#product-detail-app [class*="base-product-image"] img'
+];
+var urls = [];
+selectors.forEach(function (sel) {
+    document.querySelectorAll(sel).forEach(function (img) {
+        var src = img.currentSrc || img.src || img.getAttribute('data-src');
+        if (src && src.indexOf('dsmcdn.com') !== -1) { urls.push(src); }
+    });
+});
+return urls;
+"""
+
+
+def full_size_url(url):
+    return _RESIZE_PATTERN.sub("", url)
+
+
+def collect_gallery_image_urls(driver):
+    """
+    Ürün detay sayfasındaki galeri görsellerinin adreslerini tek seferde, sırayı
+    koruyarak ve tekrarları atarak orijinal boyutlarıyla döndürür. Galeri ok
+    tuşlarıyla gezilmez.
+    """
+    seen = set()
+    urls = []
+    for url in driver.execute_script(_GALLERY_SCRIPT) or []:
+        url = full_size_url(url)
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
@@ -0,0 +1,90 @@
+import sys
+import logging
+
+import crawl_journal
+
+# Trendyol ürün detay linkleri yol içinde "-p-<ürün id>" taşır.
+PRODUCT_LINK_SELECTOR = '#search-app a[href*="-p-"]'
+
+# Tek çağrıda: mevcut ürün linklerini toplar, sayfanın sonuna kaydırır ve
+# yeni kartlar eklenene (ya da zaman aşımı dolana) kadar bekleyip listeyi döndürür.
+_HARVEST_SCRIPT = """
+var selector = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+
+function collect() {
+    var links = [];
+    document.querySelectorAll(selector).forEach(function (a) {
+        if (a.href) { links.push(a.href); }
+    });
+    return links;
+}
+
+var before = document.querySelectorAll(selector).length;
+window.scrollTo(0, document.body.scrollHeight);
+
+new Promise(function (resolve) {
+    var observer = new MutationObserver(function () {
+        if (document.querySelectorAll(selector).length > before) { finish(true); }
+    });
+    var timer = setTimeout(function () { finish(false); }, timeoutMs);
+    function finish(grew) {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve({links: collect(), grew: grew});
+    }
+    observer.observe(document.body, {childList: true, subtree: true});
+}).then(done);
+"""
+
+
+def dedupe_links(links):
+    """Sırayı koruyarak aynı ürüne giden linklerin yalnızca ilkini bırakır."""
+    seen = set()
+    unique = []
+    for link in links:
+        # Tarama günlüğüyle aynı anahtar: yeniden başlatmada atlanan ürünler burada da eşleşir
+        key = crawl_journal.canonical_url(link)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(link)
+    return unique
+
+
+def harvest_product_links(driver, count, max_rounds=30, grow_timeout=5, patience=2):
+    """
+    Arama/kategori ızgarasındaki ürün linklerini toplar. Her turda tek bir
+    execute_async_script ile linkler okunur ve sayfa sonsuz kaydırma için aşağı
+    kaydırılır. count kadar benzersiz link bulunduğunda ya da art arda patience
+    tur boyunca yeni kart gelmediğinde durur. En fazla count link döndürür.
+    """
+    driver.set_script_timeout(grow_timeout + 5)
+    links = []
+    idle_rounds = 0
+    for _ in range(max_rounds):
+        result = driver.execute_async_script(_HARVEST_SCRIPT, PRODUCT_LINK_SELECTOR, int(grow_timeout * 1000))
+        links = dedupe_links(result.get("links", []))
+        logging.info("Listeleme sayfasında %d benzersiz ürün linki bulundu.", len(links))
+        if len(links) >= count:
+            break
+        idle_rounds = 0 if result.get("grew") else idle_rounds + 1
+        if idle_rounds >= patience:
+            logging.info("Yeni ürün yüklenmiyor, toplama durduruldu.")
+            break
+    return links[:count]
+
+
+def read_url_list(path):
+    """
+    Her satırda bir ürün linki olan dosyayı okur; path "-" ise stdin kullanılır.
+    Boş satırlar ve # ile başlayan satırlar atlanır, tekrar eden linkler çıkarılır.
+    """
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    links = [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+    return dedupe_links(links)
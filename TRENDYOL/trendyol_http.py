@@ -0,0 +1,165 @@
+import json
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import fixture_replay
+
+
+# Trendyol görsel CDN adresi; sayfa durumundaki görsel yolları bu adrese göredir.
+IMAGE_CDN_URL = "https://cdn.dsmcdn.com"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "tr-TR,tr;q=0.9,en;q=0.8",
+}
+
+# Ürün detay sayfasının ilk HTML'ine gömülü JSON durumunun başladığı işaretler
+STATE_MARKERS = [
+    "window.__PRODUCT_DETAIL_APP_INITIAL_STATE__",
+    'window["__envoy_product-detail__PROPS"]',
+]
+
+_local = threading.local()
+
+
+def get_session(pool_size=10):
+    """
+    İş parçacığı başına bir kez oluşturulan, bağlantı havuzlu requests oturumu.
+    Aynı host'a giden istekler TCP/TLS bağlantısını yeniden kullanır.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(HEADERS)
+        _local.session = session
+    return session
+
+
+def parse_product_state(html):
+    """
+    Sayfa HTML'indeki gömülü durum nesnesini bulur ve içindeki ürün sözlüğünü
+    döndürür. Durum bulunamazsa None döner.
+    """
+    decoder = json.JSONDecoder()
+    for marker in STATE_MARKERS:
+        start = html.find(marker)
+        if start == -1:
+            continue
+        brace = html.find("{", start + len(marker))
+        if brace == -1:
+            continue
+        try:
+            state, _ = decoder.raw_decode(html, brace)
+        except ValueError as e:
+            logging.info("Gömülü ürün durumu çözümlenemedi (%s): %s", marker, e)
+            continue
+        product = _find_product(state)
+        if product:
+            return product
+    return None
+
+
+def _find_product(node, depth=0):
+    """Durum ağacında ad ile puan ya da fiyat sözlüğü taşıyan ilk ürün sözlüğünü arar."""
+    if depth > 6:
+        return None
+    if isinstance(node, dict):
+        if isinstance(node.get("name"), str) and (isinstance(node.get("ratingScore"), dict)
+                                                  or isinstance(node.get("price"), dict)):
+            return node
+        for value in node.values():
+            found = _find_product(value, depth + 1)
+            if found:
+                return found
+    elif isinstance(node, list):
+        for value in node[:20]:
+            found = _find_product(value, depth + 1)
+            if found:
+                return found
+    return None
+
+
+def product_details(product):
+    """
+    Ürün sözlüğünü Selenium ile okunan metinlerle aynı biçimde özetler:
+    ad, değerlendirme metni, ortalama puan, fiyat metni ve görsel URL'leri.
+    """
+    rating = product.get("ratingScore")
+    if not isinstance(rating, dict):
+        rating = {}
+    price = product.get("price")
+    if isinstance(price, dict):
+        selling = price.get("sellingPrice") or price.get("discountedPrice") or {}
+    else:
+        selling = "" if price is None else price
+
+    review = ""
+    if rating.get("totalRatingCount") is not None:
+        review = f"{rating['totalRatingCount']} Değerlendirme"
+    average = ""
+    if rating.get("averageRating") is not None:
+        try:
+            average = str(round(float(rating["averageRating"]), 1))
+        except (TypeError, ValueError):
+            average = ""
+    if isinstance(selling, dict):
+        price_text = selling.get("text") or (f"{selling['value']} TL" if selling.get("value") is not None else "")
+    else:
+        price_text = str(selling)
+
+    images = []
+    for image in product.get("images") or []:
+        if not isinstance(image, str):
+            continue
+        images.append(image if image.startswith("http") else IMAGE_CDN_URL + image)
+
+    return {
+        "name": (product.get("name") or "").strip(),
+        "review": review,
+        "average": average,
+        "price": price_text,
+        "images": images,
+    }
+
+
+def fetch_product_details(url, session=None, timeout=10):
+    """
+    Ürün detay sayfasını tarayıcı açmadan HTTP ile çeker ve product_details()
+    çıktısını döndürür. Sayfa alınamaz veya durum bulunamazsa None döner;
+    bu durumda çağıran taraf Selenium akışına düşmelidir. Kayıt/tekrar oynatma
+    modunda istek fixture'dan geçmeyeceği için hiç yapılmaz (None).
+    """
+    if fixture_replay.http_disabled("HTTP hızlı yolu"):
+        return None
+    session = session or get_session()
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        logging.info("HTTP ile ürün sayfası alınamadı: %s", e)
+        return None
+    if response.status_code != 200:
+        logging.info("HTTP ile ürün sayfası alınamadı, durum kodu: %s", response.status_code)
+        return None
+    product = parse_product_state(response.text)
+    if not product:
+        logging.info("Ürün sayfasında gömülü durum bulunamadı: %s", url)
+        return None
+    try:
+        details = product_details(product)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        # Beklenmeyen durum biçimi: çağıran Selenium akışına düşer
+        logging.info("Gömülü ürün durumu okunamadı (%s): %s", url, e)
+        return None
+    if not details["name"]:
+        return None
+    return details
@@ -0,0 +1,153 @@
+"""
+İçerik adresli (content-addressed) görsel deposu.
+
+Her görsel, içeriğinin SHA-256 özetiyle objects/ab/cd/<özet> yoluna bir kez
+yazılır; aynı görsel farklı kategori veya sıralamalarda tekrar geldiğinde
+diske yeniden yazılmaz. Aynı URL daha önce indirildiyse ağdan hiç
+çekilmez. Ürün klasörleri görsellere product.json içindeki referanslarla
+(image_refs) bağlanır; istenirse klasörlere image_1.jpg ... adlarıyla
+hardlink ya da symlink görünümü oluşturularak eski klasör düzeni korunur.
+"""
+
+import os
+import json
+import errno
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+
+VIEW_HARDLINK = "hardlink"
+VIEW_SYMLINK = "symlink"
+VIEW_NONE = "none"
+
+
+class BlobStore:
+    def __init__(self, root, view=VIEW_HARDLINK, chunk_size=64 * 1024):
+        """
+        :param root: Deponun kök klasörü (objects/, tmp/ ve url dizini burada tutulur).
+        :param view: Ürün klasörlerinde görünüm türü: "hardlink", "symlink" veya "none".
+        """
+        self.root = str(root)
+        self.view = view
+        self.chunk_size = chunk_size
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._url_index_path = os.path.join(self.root, "urls.jsonl")
+        self._urls = {}
+        self.stats = {"stored": 0, "deduplicated": 0, "url_hits": 0}
+        self._load_url_index()
+        self._url_index = open(self._url_index_path, "a", encoding="utf-8")
+
+    def _load_url_index(self):
+        if not os.path.exists(self._url_index_path):
+            return
+        with open(self._url_index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._urls[entry["url"]] = entry["sha256"]
+
+    def path_for(self, digest):
+        """Özetin depodaki yolu: objects/ab/cd/<özet> (dizin başına dosya sayısı düşük kalsın diye)."""
+        return os.path.join(self.objects_dir, digest[:2], digest[2:4], digest)
+
+    def has(self, digest):
+        return os.path.exists(self.path_for(digest))
+
+    def lookup(self, url):
+        """URL daha önce depoya alındıysa ve blob hâlâ duruyorsa özetini döndürür."""
+        digest = self._urls.get(url)
+        if digest and self.has(digest):
+            with self._lock:
+                self.stats["url_hits"] += 1
+            return digest
+        return None
+
+    def temp_path(self):
+        """İndirmelerin yazılacağı, depo ile aynı dosya sistemindeki geçici yol."""
+        fd, path = tempfile.mkstemp(prefix=".dl-", dir=self.tmp_dir)
+        os.close(fd)
+        return path
+
+    def _hash_file(self, path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def put_file(self, path, url=None):
+        """
+        Dosyayı depoya taşır ve özetini döndürür. Aynı içerik zaten varsa dosya
+        silinir, yeniden yazılmaz. url verilirse URL -> özet eşlemesi kaydedilir.
+        """
+        digest = self._hash_file(path)
+        blob_path = self.path_for(digest)
+        # Paralel işçiler aynı içeriği aynı anda ekleyebilir: varlık kontrolü,
+        # taşıma ve sayaçlar tek kilit altında tutarlı kalır
+        with self._lock:
+            if os.path.exists(blob_path):
+                os.remove(path)
+                self.stats["deduplicated"] += 1
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(path, blob_path)
+                self.stats["stored"] += 1
+        if url:
+            self._remember(url, digest)
+        return digest
+
+    def _remember(self, url, digest):
+        with self._lock:
+            if self._urls.get(url) == digest:
+                return
+            self._urls[url] = digest
+            self._url_index.write(json.dumps({"url": url, "sha256": digest}) + "\n")
+            self._url_index.flush()
+
+    def link(self, digest, dest_path):
+        """
+        Blobu dest_path'e görünüm türüne göre bağlar (hardlink/symlink). Hardlink
+        mümkün değilse (farklı disk) dosya kopyalanır. Görünüm kapalıysa None döner.
+        """
+        if self.view == VIEW_NONE:
+            return None
+        blob_path = self.path_for(digest)
+        folder = os.path.dirname(dest_path) or "."
+        tmp_path = os.path.join(folder, f".link-{digest[:12]}-{threading.get_ident()}")
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        if self.view == VIEW_SYMLINK:
+            os.symlink(os.path.relpath(blob_path, folder), tmp_path)
+        else:
+            try:
+                os.link(blob_path, tmp_path)
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                    raise
+                shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+        return dest_path
+
+    def ref(self, digest, url=None, name=None):
+        """product.json içinde saklanan görsel referansı."""
+        return {"sha256": digest, "url": url, "file": name, "blob": os.path.relpath(self.path_for(digest), self.root)}
+
+    def log_summary(self, log=logging.info):
+        with self._lock:
+            stats = dict(self.stats)
+        log(f"Görsel deposu: {stats['stored']} yeni blob, {stats['deduplicated']} aynı içerik, "
+            f"{stats['url_hits']} URL önbellekten (indirilmedi).")
+
+    def close(self):
+        with self._lock:
+            if not self._url_index.closed:
+                self._url_index.close()
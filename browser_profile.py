@@ -0,0 +1,127 @@
+"""
+Pazar yeri başına kalıcı Chrome profilleri (user-data-dir + disk-cache-dir).
+
+Profiller <kök>/<pazar_yeri>/slot-N altında tutulur. Her slot bir dosya
+kilidiyle (fcntl.flock) korunur; aynı anda çalışan sürücüler (paralel
+işçiler, aynı anda başlatılmış iki script) boştaki ilk slotu alır, hepsi
+doluysa yeni bir slot oluşturulur. Böylece iki Chrome aynı profile yazıp onu
+bozmaz. Profil kalıcı olduğu için bir kez kapatılan çerez/konum pencereleri
+sonraki çalışmalarda tekrar çıkmaz ve statik dosyalar diskteki önbellekten
+gelir. Bir slot bırakılırken (Chrome kapandıktan sonra) çerez ve yerel
+depolama verisi <pazar_yeri>/seed altına kopyalanır; yeni açılan slotlar bu
+kopyayla tohumlanır, böylece yeni işçiler de pencereleri tekrar görmez.
+"""
+
+import os
+import shutil
+import fcntl
+import logging
+
+DEFAULT_PROFILE_ROOT = os.environ.get(
+    "SCRAPER_PROFILE_ROOT", os.path.join(os.path.expanduser("~"), ".scraper_profiles"))
+
+# Tohumlamada kopyalanan, "pencere kapatıldı" bilgisini taşıyan profil dosyaları.
+# Güncel Chrome çerezleri Default/Network/Cookies'te tutar; Default/Cookies eski
+# sürümlerin yeridir. Kaynakta olmayan yollar atlanır.
+_SEED_PATHS = ["Default/Network/Cookies", "Default/Cookies", "Default/Local Storage", "Default/Preferences"]
+
+
+class BrowserProfile:
+    def __init__(self, marketplace, slot, path, lock_file):
+        self.marketplace = marketplace
+        self.slot = slot
+        self.path = path
+        self.user_data_dir = os.path.join(path, "user-data")
+        self.cache_dir = os.path.join(path, "cache")
+        self._lock_file = lock_file
+
+    def chrome_arguments(self):
+        return [f"--user-data-dir={self.user_data_dir}", f"--disk-cache-dir={self.cache_dir}"]
+
+    def release(self):
+        """
+        Slot kilidini bırakır; sürücü kapatıldıktan sonra çağrılmalıdır. Önce
+        profilin çerez/yerel depolama verisi yeni slotlar için seed'e kopyalanır.
+        """
+        if self._lock_file is None:
+            return
+        try:
+            base = os.path.dirname(self.path)
+            _copy_seed_files(self.user_data_dir, _seed_dir(base), base, overwrite=True)
+        except OSError as e:
+            logging.info("Profil seed'i güncellenemedi: %s", e)
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        finally:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def __repr__(self):
+        return f"BrowserProfile({self.marketplace!r}, slot={self.slot})"
+
+
+def _try_lock(path):
+    os.makedirs(path, exist_ok=True)
+    lock_file = open(os.path.join(path, ".lock"), "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _seed_dir(base):
+    return os.path.join(base, "seed")
+
+
+def _copy_seed_files(source_dir, target_dir, base, overwrite=False):
+    """_SEED_PATHS dosyalarını source_dir'den target_dir'e, base altındaki seed kilidiyle kopyalar."""
+    os.makedirs(base, exist_ok=True)
+    with open(os.path.join(base, ".seed.lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            for relative in _SEED_PATHS:
+                source = os.path.join(source_dir, relative)
+                target = os.path.join(target_dir, relative)
+                if not os.path.exists(source):
+                    continue
+                if os.path.exists(target):
+                    if not overwrite:
+                        continue
+                    if os.path.isdir(target):
+                        shutil.rmtree(target)
+                    else:
+                        os.remove(target)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if os.path.isdir(source):
+                    shutil.copytree(source, target)
+                else:
+                    shutil.copy2(source, target)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def acquire(marketplace, root=DEFAULT_PROFILE_ROOT, max_slots=32):
+    """
+    marketplace için boştaki ilk profil slotunu kilitleyip döndürür. Tüm
+    slotlar kullanımdaysa yeni slot açılır; max_slots aşılırsa RuntimeError.
+    """
+    base = os.path.join(root, marketplace)
+    for slot in range(max_slots):
+        path = os.path.join(base, f"slot-{slot}")
+        is_new = not os.path.exists(os.path.join(path, "user-data"))
+        lock_file = _try_lock(path)
+        if lock_file is None:
+            continue
+        profile = BrowserProfile(marketplace, slot, path, lock_file)
+        if is_new and os.path.exists(_seed_dir(base)):
+            try:
+                _copy_seed_files(_seed_dir(base), profile.user_data_dir, base)
+            except OSError as e:
+                logging.info("Profil tohumlanamadı: %s", e)
+        os.makedirs(profile.user_data_dir, exist_ok=True)
+        os.makedirs(profile.cache_dir, exist_ok=True)
+        logging.info("Kalıcı tarayıcı profili kullanılıyor: %s", path)
+        return profile
+    raise RuntimeError(f"{marketplace} için boş profil slotu kalmadı ({max_slots}).")
@@ -0,0 +1,164 @@
+"""
+Taranmış ürün kataloglarının ortak okuma katmanı.
+
+Trendyol_Products/, "Trendyol Product/" ve ebay_data/ altındaki product.json,
+products*.json ve record_sink JSONL dosyaları bulunur; her kayıt pazar yerine
+göre ortak alanlara (ad, Decimal fiyat, para birimi, değerlendirme sayısı,
+puan, satış adedi, URL, görsel referansları) çevrilir ve kategori yolu kayıttan
+ya da klasör düzeninden çıkarılır. parquet_export ve ranking aynı kuralları
+buradan kullanır.
+
+    for record, category_dir, path, mtime in iter_source_records("Trendyol_Products"):
+        fields = NORMALIZERS["trendyol"](record)
+        category = category_for("Trendyol_Products", category_dir, record)
+"""
+
+import os
+import json
+import logging
+
+import crawl_journal
+import record_sink
+from normalize import parse_price, parse_count, parse_rating, parse_ebay_card
+
+# Kaynak belirtilmezse taranan klasörler ve pazar yerleri
+DEFAULT_SOURCES = [
+    ("trendyol", "Trendyol_Products"),
+    ("trendyol", "Trendyol Product"),
+    ("ebay", "ebay_data"),
+]
+
+# Ürün verisi içermeyen yardımcı dosya ve klasörler
+SKIP_FILES = {crawl_journal.DEFAULT_JOURNAL_NAME, "urls.jsonl", "trendyol_categories.json"}
+SKIP_DIRS = {"_blobs", "objects"}
+
+
+# =====================
+# Alan dönüştürme
+# =====================
+def _image_refs(record):
+    refs = []
+    for ref in record.get("image_refs") or []:
+        if isinstance(ref, dict) and ref.get("sha256"):
+            refs.append(ref["sha256"])
+    if not refs:
+        refs = [str(image) for image in record.get("images") or [] if image]
+    return refs
+
+
+def normalize_trendyol(record):
+    """PC_Trendyol (name/review/...) ve TrendyolScraper (product_info/...) kayıtlarını ortak alanlara çevirir."""
+    price, currency = parse_price(record.get("price") or record.get("price_info"), "TRY")
+    return {
+        "name": record.get("name") or record.get("product_info") or None,
+        "price": price,
+        "currency": currency,
+        "review_count": parse_count(record.get("review") or record.get("rating_info")),
+        "rating": parse_rating(record.get("average") or record.get("average_rating")),
+        "sold_count": None,
+        "url": record.get("ProductLink") or record.get("url") or None,
+        "image_refs": _image_refs(record),
+    }
+
+
+def normalize_ebay(record):
+    """eBay kart kayıtları (product_name/full_text veya name/text) fiyat ve satış adedini metinden alır."""
+    price, sold = parse_ebay_card(record.get("full_text") or record.get("text"))
+    screenshot = record.get("screenshot_path") or record.get("screenshot")
+    return {
+        "name": record.get("product_name") or record.get("name") or None,
+        "price": price,
+        "currency": "USD",
+        "review_count": None,
+        "rating": None,
+        "sold_count": sold,
+        "url": record.get("url") or None,
+        "image_refs": [screenshot] if screenshot else [],
+    }
+
+
+NORMALIZERS = {"trendyol": normalize_trendyol, "ebay": normalize_ebay}
+
+
+# =====================
+# Kaynak dosyaları tarama
+# =====================
+def category_for(root, category_dir, record):
+    """Kaydın kategorisi: kayıtta varsa o, yoksa kategori klasörünün köke göre yolu."""
+    if record.get("category"):
+        return str(record["category"])
+    relative = os.path.relpath(category_dir, root)
+    return "" if relative == "." else relative.replace(os.sep, "/")
+
+
+def is_product_file(file_name):
+    return (file_name.endswith(".jsonl") or file_name == "product.json"
+            or (file_name.startswith("products") and file_name.endswith(".json")))
+
+
+def iter_source_files(root, skip_files=()):
+    """Kök altındaki ürün dosyalarını (klasör, dosya adı, yol) olarak sıralı döndürür."""
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for file_name in sorted(files):
+            if file_name in SKIP_FILES or file_name in skip_files or not is_product_file(file_name):
+                continue
+            yield folder, file_name, os.path.join(folder, file_name)
+
+
+def jsonl_category_dir(record, folder):
+    """
+    JSONL kaydındaki record_sink düzen anahtarlarını (_folder/_group) çıkarır ve
+    kaydın kategori klasörünü döndürür: ürün klasörü verilmişse onun bir üstü.
+    """
+    product_folder = record.pop(record_sink.FOLDER_KEY, None)
+    record.pop(record_sink.GROUP_KEY, None)
+    return os.path.dirname(os.path.join(folder, product_folder)) if product_folder else folder
+
+
+def json_records(data, folder, file_name):
+    """
+    product.json / products*.json içeriğinden (kayıt listesi, kategori klasörü)
+    döndürür. product.json'un klasörü ürün klasörüdür; kategori bir üsttedir.
+    """
+    if file_name == "product.json":
+        return ([data] if isinstance(data, dict) else []), os.path.dirname(folder)
+    if not isinstance(data, list):
+        return [], folder
+    return [record for record in data if isinstance(record, dict)], folder
+
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.info("JSON okunamadı, atlanıyor (%s): %s", path, e)
+        return None
+
+
+def iter_source_records(root, skip_files=()):
+    """
+    Kök altındaki tüm ürün kayıtlarını (kayıt, kategori klasörü, kaynak dosya,
+    dosya zamanı) olarak döndürür.
+    """
+    for folder, file_name, path in iter_source_files(root, skip_files):
+        mtime = os.path.getmtime(path)
+        if file_name.endswith(".jsonl"):
+            for record in record_sink.iter_records(path):
+                yield record, jsonl_category_dir(record, folder), path, mtime
+            continue
+        records, category_dir = json_records(read_json(path), folder, file_name)
+        for record in records:
+            yield record, category_dir, path, mtime
+
+
+def parse_sources(values):
+    """Komut satırındaki "pazar_yeri=klasör" değerlerini (pazar_yeri, kök) listesine çevirir."""
+    sources = []
+    for value in values:
+        marketplace, _, root = value.partition("=")
+        if marketplace not in NORMALIZERS or not root:
+            raise SystemExit(f"Geçersiz kaynak: {value} (ör. trendyol=Trendyol_Products)")
+        sources.append((marketplace, root))
+    return sources
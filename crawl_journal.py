@@ -0,0 +1,161 @@
+"""
+Yeniden başlatılabilir taramalar için yalnızca-ekleme (append-only) tarama günlüğü.
+
+Her ürün için kanonik URL anahtarıyla durum ("done" / "failed"), zaman damgası
+ve çıktı yolu JSONL satırı olarak yazılır. Yazmalar tamponlanır; her
+fsync_every kayıtta ya da fsync_interval saniyede bir diske fsync edilir.
+Açılışta dosya baştan okunur ve her URL'nin son durumu geçerli sayılır; yarım
+kalmış son satır (çökme sırasında yazılan) yok sayılır. Böylece yeniden
+başlatılan bir çalışma tamamlanmış ürünleri atlar, yalnızca başarısız veya hiç
+işlenmemiş olanları tekrar dener.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from urllib.parse import urlsplit
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+DEFAULT_JOURNAL_NAME = "crawl_journal.jsonl"
+
+
+def canonical_url(url):
+    """Sorgu ve fragment kısımlarını atarak aynı sayfanın farklı linklerini aynı anahtara indirger."""
+    parts = urlsplit(url.strip())
+    return f"{parts.scheme}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+class CrawlJournal:
+    def __init__(self, path, fsync_every=20, fsync_interval=2.0):
+        """
+        :param path: JSONL günlük dosyasının yolu (yoksa oluşturulur).
+        :param fsync_every: Bu kadar kayıt birikince diske fsync edilir.
+        :param fsync_interval: Son fsync'ten bu kadar saniye geçtiyse bir sonraki kayıtta fsync edilir.
+        """
+        self.path = str(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # fsync'ten önce boşaltılacak çıktı hedefleri (bkz. flush_before_sync)
+        self._outputs = []
+        self._load()
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._needs_newline():
+            # Çökme sırasında yarım kalan satıra yeni kayıt eklenmesin
+            self._file.write("\n")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logging.info("Tarama günlüğünde okunamayan satır atlandı (%s:%d).", self.path, line_no)
+                    continue
+                self.entries[entry["key"]] = entry
+        logging.info("Tarama günlüğü yüklendi: %d tamamlanmış, %d başarısız kayıt.",
+                     self.count(STATUS_DONE), self.count(STATUS_FAILED))
+
+    def _needs_newline(self):
+        if os.path.getsize(self.path) == 0:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def count(self, status):
+        return sum(1 for entry in self.entries.values() if entry.get("status") == status)
+
+    def status(self, url):
+        entry = self.entries.get(canonical_url(url))
+        return entry.get("status") if entry else None
+
+    def is_done(self, url):
+        return self.status(url) == STATUS_DONE
+
+    def pending(self, items, key=None):
+        """
+        Tamamlanmış olanları atarak items listesini döndürür. items URL listesi ya
+        da (sıra, url) gibi demetler olabilir; key, öğeden URL'yi çıkaran fonksiyondur.
+        """
+        key = key or (lambda item: item)
+        remaining = [item for item in items if not self.is_done(key(item))]
+        skipped = len(items) - len(remaining)
+        if skipped:
+            logging.info("Tarama günlüğü: %d ürün daha önce tamamlanmış, atlanıyor.", skipped)
+        return remaining
+
+    def record(self, url, status, output_path=None, error=None):
+        """URL için yeni durumu günlüğe ekler."""
+        entry = {
+            "key": canonical_url(url),
+            "url": url,
+            "status": status,
+            "ts": time.time(),
+            "output_path": str(output_path) if output_path else None,
+        }
+        if error:
+            entry["error"] = str(error)
+            entry["attempts"] = self.entries.get(entry["key"], {}).get("attempts", 0) + 1
+        with self._lock:
+            self.entries[entry["key"]] = entry
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def mark_done(self, url, output_path=None):
+        self.record(url, STATUS_DONE, output_path=output_path)
+
+    def mark_failed(self, url, error=None):
+        self.record(url, STATUS_FAILED, error=error or "bilinmeyen hata")
+
+    def flush_before_sync(self, output):
+        """
+        Günlük her fsync edilmeden önce output.flush() çağrılır (ör. RecordSink).
+        Böylece bir ürünün "done" kaydı, ürünün kendisi diske yazılmadan kalıcı olmaz.
+        """
+        self._outputs.append(output)
+
+    def _sync(self):
+        for output in self._outputs:
+            output.flush()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
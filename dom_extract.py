@@ -0,0 +1,62 @@
+"""
+Tek execute_script çağrısıyla çok alanlı DOM okuma.
+
+Alan tanımı {alan_adı: [seçici1, seçici2, ...]} biçimindedir; seçiciler "/"
+veya "(" ile başlıyorsa XPath, değilse CSS olarak yorumlanır (page_ready ile
+aynı kural). Her alan için seçiciler sırayla denenir ve görünür, boş olmayan
+ilk metin alınır. Böylece her yedek XPath için ayrı find_element gidiş-dönüşü
+yerine ürün başına tek bir WebDriver çağrısı yapılır.
+"""
+
+import logging
+
+_EXTRACT_SCRIPT = """
+var spec = arguments[0];
+
+function find(selector) {
+    if (selector.charAt(0) === '/' || selector.charAt(0) === '(') {
+        return document.evaluate(selector, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(selector);
+}
+
+var values = {};
+var matched = {};
+Object.keys(spec).forEach(function (field) {
+    values[field] = null;
+    matched[field] = -1;
+    var selectors = spec[field];
+    for (var i = 0; i < selectors.length; i++) {
+        var el;
+        try { el = find(selectors[i]); } catch (e) { el = null; }
+        // Selenium'un .text davranışı gibi: görüntülenmeyen elementin metni boş sayılır
+        if (!el || el.getClientRects().length === 0) { continue; }
+        var text = (el.innerText || '').trim();
+        if (text) {
+            values[field] = text;
+            matched[field] = i;
+            break;
+        }
+    }
+});
+return {values: values, matched: matched};
+"""
+
+
+def extract_fields(driver, spec):
+    """
+    spec içindeki tüm alanları tek çağrıda okur. (değerler, eşleşenler) döndürür:
+    değerler {alan: metin veya None}, eşleşenler {alan: kullanılan seçicinin
+    listedeki sırası, hiçbiri tutmadıysa -1}.
+    """
+    result = driver.execute_script(_EXTRACT_SCRIPT, spec) or {}
+    values = result.get("values") or {}
+    matched = result.get("matched") or {}
+    for field in spec:
+        values.setdefault(field, None)
+        matched.setdefault(field, -1)
+    fallbacks = {field: index for field, index in matched.items() if index > 0}
+    if fallbacks:
+        logging.info("Yedek seçiciler kullanıldı: %s", fallbacks)
+    return values, matched
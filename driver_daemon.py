@@ -0,0 +1,328 @@
+"""
+Isıtılmış tarayıcıları çalıştırmalar arasında açık tutan yerel sürücü daemon'u.
+
+Daemon, her pazar yeri için --remote-debugging-port ile açılmış, ana sayfası
+yüklenmiş ve çerez penceresi kapatılmış Chrome örneklerinden bir havuz tutar.
+Scriptler yerel bir TCP soketi üzerinden (satır başına bir JSON mesajı)
+tarayıcı kiralar, debuggerAddress ile ona bağlanır ve işi bitince iade eder.
+Kiralama soket bağlantısına bağlıdır: istemci çökerse bağlantı kopar ve
+tarayıcı otomatik olarak havuza döner. İade edilen tarayıcıda fazla sekmeler
+kapatılıp ana sayfaya dönülür; tarayıcı yanıt vermiyorsa yeniden başlatılır.
+
+Çalıştırma:
+    python driver_daemon.py --driver-path /yol/chromedriver --pool trendyol=2 --pool ebay=1
+
+Scriptlerde acquire_driver() daemon çalışıyorsa ondan kiralar, çalışmıyorsa
+driver_factory.create_driver ile normal bir sürücü açar; her iki durumda da
+sürücü driver_factory.quit_driver ile kapatılır.
+"""
+
+import sys
+import json
+import time
+import queue
+import socket
+import logging
+import argparse
+import threading
+import socketserver
+
+from selenium.webdriver.common.by import By
+
+import driver_factory
+import fixture_replay
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEBUG_PORT_BASE = 9300
+
+# Pazar yeri başına ısıtma: ana sayfa ve varsa kapatılacak çerez/uyarı butonları
+WARMUPS = {
+    "trendyol": {
+        "url": "https://www.trendyol.com/",
+        "dismiss": ["/html/body/div[2]/div[2]/div/div[1]/div/div[2]/div/button[3]"],
+    },
+    "ebay": {"url": "https://www.ebay.com/", "dismiss": ["//*[@id='gdpr-banner-accept']"]},
+    "amazon": {"url": "https://www.amazon.com/", "dismiss": ["//input[@data-action-type='DISMISS']"]},
+}
+
+
+def _free_port(start):
+    port = start
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            if probe.connect_ex((DEFAULT_HOST, port)) != 0:
+                return port
+        port += 1
+
+
+# =====================
+# Daemon tarafı
+# =====================
+class PooledBrowser:
+    def __init__(self, marketplace, driver_path, debug_port):
+        self.marketplace = marketplace
+        self.driver_path = driver_path
+        self.debug_port = debug_port
+        self.driver = None
+
+    @property
+    def debugger_address(self):
+        return f"{DEFAULT_HOST}:{self.debug_port}"
+
+    def start(self):
+        # Ağ engelleme istemci oturumunda uygulanır; daemon oturumu yalnızca ısıtma yapar.
+        self.driver = driver_factory.create_driver(
+            self.driver_path,
+            arguments=[f"--remote-debugging-port={self.debug_port}", "--start-maximized"],
+            marketplace=self.marketplace,
+            block_images=False,
+            measure=False,
+        )
+        self.warm_up()
+
+    def warm_up(self):
+        warmup = WARMUPS.get(self.marketplace)
+        if not warmup:
+            return
+        self.driver.get(warmup["url"])
+        for xpath in warmup.get("dismiss", []):
+            for button in self.driver.find_elements(By.XPATH, xpath):
+                try:
+                    if button.is_displayed():
+                        button.click()
+                except Exception:
+                    pass
+
+    def reset(self):
+        """İade sonrası: fazla sekmeleri kapatır ve ana sayfaya döner."""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+        self.warm_up()
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def stop(self):
+        if self.driver is not None:
+            try:
+                driver_factory.quit_driver(self.driver)
+            except Exception as e:
+                logging.info("Tarayıcı kapatılırken hata: %s", e)
+            self.driver = None
+
+
+class BrowserPool:
+    def __init__(self, marketplace, size, driver_path, port_start):
+        self.marketplace = marketplace
+        self.browsers = []
+        self.idle = queue.Queue()
+        port = port_start
+        for _ in range(size):
+            port = _free_port(port)
+            self.browsers.append(PooledBrowser(marketplace, driver_path, port))
+            port += 1
+
+    def start(self):
+        for browser in self.browsers:
+            started = time.monotonic()
+            browser.start()
+            logging.info("[%s] tarayıcı hazır (%s, %.1f sn).", self.marketplace,
+                         browser.debugger_address, time.monotonic() - started)
+            self.idle.put(browser)
+
+    def lease(self, timeout):
+        try:
+            return self.idle.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def give_back(self, browser):
+        try:
+            browser.reset()
+        except Exception as e:
+            logging.info("[%s] tarayıcı yanıt vermiyor, yeniden başlatılıyor: %s", self.marketplace, e)
+            try:
+                browser.restart()
+            except Exception as e:
+                logging.error("[%s] tarayıcı yeniden başlatılamadı: %s", self.marketplace, e)
+                return
+        self.idle.put(browser)
+
+    def stop(self):
+        for browser in self.browsers:
+            browser.stop()
+
+
+class _LeaseHandler(socketserver.StreamRequestHandler):
+    def _send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        pools = self.server.pools
+        leased = None
+        try:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self._send({"ok": False, "error": "geçersiz JSON"})
+                    continue
+                op = request.get("op")
+                if op == "lease":
+                    if leased is not None:
+                        self._send({"ok": False, "error": "bu bağlantıda zaten kiralık bir tarayıcı var"})
+                        continue
+                    pool = pools.get(request.get("marketplace"))
+                    if pool is None:
+                        self._send({"ok": False, "error": f"havuz yok: {request.get('marketplace')}"})
+                        continue
+                    leased = (pool, pool.lease(request.get("timeout", 30)))
+                    if leased[1] is None:
+                        leased = None
+                        self._send({"ok": False, "error": "boş tarayıcı yok (zaman aşımı)"})
+                        continue
+                    self._send({"ok": True, "debugger_address": leased[1].debugger_address})
+                elif op == "release":
+                    if leased is not None:
+                        leased[0].give_back(leased[1])
+                        leased = None
+                    self._send({"ok": True})
+                elif op == "status":
+                    self._send({"ok": True, "pools": {name: {"size": len(pool.browsers), "idle": pool.idle.qsize()}
+                                                      for name, pool in pools.items()}})
+                elif op == "shutdown":
+                    self._send({"ok": True})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    break
+                else:
+                    self._send({"ok": False, "error": f"bilinmeyen işlem: {op}"})
+        finally:
+            # İstemci iade etmeden bağlantıyı kapattıysa tarayıcı havuza döner
+            if leased is not None:
+                leased[0].give_back(leased[1])
+
+
+class DriverDaemon(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, pools, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.pools = pools
+        super().__init__((host, port), _LeaseHandler)
+
+
+def run_daemon(driver_path, pool_sizes, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    pools = {}
+    port_start = DEBUG_PORT_BASE
+    for marketplace, size in pool_sizes.items():
+        pools[marketplace] = BrowserPool(marketplace, size, driver_path, port_start)
+        port_start += size + 10
+    try:
+        for pool in pools.values():
+            pool.start()
+        server = DriverDaemon(pools, host, port)
+        logging.info("Sürücü daemon'u %s:%d adresinde dinliyor.", host, port)
+        with server:
+            server.serve_forever()
+    finally:
+        for pool in pools.values():
+            pool.stop()
+
+
+# =====================
+# İstemci tarafı
+# =====================
+class Lease:
+    """Daemon'dan kiralanmış tarayıcı; release() ile (veya bağlantı kapanınca) iade edilir."""
+
+    def __init__(self, sock, reader, debugger_address):
+        self._sock = sock
+        self._reader = reader
+        self.debugger_address = debugger_address
+
+    def release(self):
+        if self._sock is None:
+            return
+        try:
+            self._sock.sendall(b'{"op": "release"}\n')
+            self._reader.readline()
+        except OSError:
+            pass
+        finally:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+
+
+def lease_browser(marketplace, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=30):
+    """Daemon'dan tarayıcı kiralar; daemon çalışmıyorsa veya boş tarayıcı yoksa None döner."""
+    try:
+        sock = socket.create_connection((host, port), timeout=2)
+    except OSError:
+        return None
+    sock.settimeout(timeout + 5)
+    reader = sock.makefile("r", encoding="utf-8")
+    try:
+        sock.sendall((json.dumps({"op": "lease", "marketplace": marketplace, "timeout": timeout}) + "\n").encode("utf-8"))
+        reply = json.loads(reader.readline() or "{}")
+    except (OSError, ValueError) as e:
+        reply = {"ok": False, "error": str(e)}
+    if not reply.get("ok"):
+        logging.info("Daemon'dan tarayıcı kiralanamadı: %s", reply.get("error"))
+        reader.close()
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return Lease(sock, reader, reply["debugger_address"])
+
+
+def acquire_driver(marketplace, driver_path, host=DEFAULT_HOST, port=DEFAULT_PORT, **factory_kwargs):
+    """
+    Daemon çalışıyorsa ısıtılmış bir tarayıcı kiralayıp ona bağlanır, yoksa
+    driver_factory.create_driver ile yeni sürücü açar. factory_kwargs
+    (block, block_images, extra_patterns, measure ...) her iki yolda da
+    uygulanır; arguments/headless gibi başlatma seçenekleri yalnızca yeni
+    sürücüde geçerlidir. Sürücü driver_factory.quit_driver ile kapatılmalıdır.
+    """
+    # Tekrar oynatmada proxy ayarı tarayıcı açılırken verildiği için kiralama yapılmaz
+    lease = None if fixture_replay.replaying() else lease_browser(marketplace, host, port)
+    if lease is None:
+        return driver_factory.create_driver(driver_path, marketplace=marketplace, **factory_kwargs)
+    logging.info("Daemon'dan ısıtılmış tarayıcı kiralandı: %s", lease.debugger_address)
+    attach_kwargs = {key: value for key, value in factory_kwargs.items()
+                     if key in ("block", "block_images", "extra_patterns", "measure")}
+    try:
+        return driver_factory.attach_driver(driver_path, lease.debugger_address, marketplace=marketplace,
+                                            lease=lease, **attach_kwargs)
+    except Exception:
+        lease.release()
+        raise
+
+
+def _parse_pools(values):
+    pools = {}
+    for value in values:
+        marketplace, _, size = value.partition("=")
+        pools[marketplace] = int(size or 1)
+    return pools
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description="Isıtılmış tarayıcı havuzu daemon'u")
+    parser.add_argument("--driver-path", required=True, help="chromedriver yolu")
+    parser.add_argument("--pool", action="append", default=[],
+                        help="pazar_yeri=adet (ör. trendyol=2); birden fazla verilebilir")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    pool_sizes = _parse_pools(args.pool) or {"trendyol": 1}
+    try:
+        run_daemon(args.driver_path, pool_sizes, port=args.port)
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,398 @@
+"""
+Ağ kaynak engelleme profilli Chrome sürücü fabrikası.
+
+Tarayıcıların hiç okumadığımız reklam, izleyici, yazı tipi, video ve öneri
+kaynaklarını indirmemesi için CDP Network.setBlockedURLs ile URL kalıpları
+engellenir. Görseller sayfa türüne göre açılıp kapatılabilir (ör. listeleme
+sayfalarında kapalı, galeri/ürün sayfalarında açık). İstenirse her sayfa için
+aktarılan bayt, yükleme süresi ve engellenen istek sayısı ölçülür. Tasarruf,
+engelleme kapalı ölçümlere göre raporlanır: SCRAPER_NETWORK_CONTROL=1 ile
+yapılan kontrol çalışmasında engelleme hiç uygulanmaz ve sayfa ortalamaları
+SCRAPER_NETWORK_BASELINE dosyasına (varsayılan ~/.scraper_network_baseline.json)
+kaydedilir; sonraki çalışmalar tasarrufu bu taban çizgisine göre hesaplar.
+
+SCRAPER_RECORD_DIR / SCRAPER_REPLAY_PROXY ortam değişkenleri verilirse
+sürücüler fixture_replay ile kayıt ya da tekrar oynatma modunda açılır.
+"""
+
+import os
+import json
+import logging
+import weakref
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+import browser_profile
+import fixture_replay
+
+# Kaynak türleri URL kalıplarıyla ifade edilir (setBlockedURLs "*" joker karakterini destekler).
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.webp*", "*.gif*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*"],
+}
+
+# Reklam ve izleme servisleri
+AD_TRACKER_PATTERNS = [
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googleadservices.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*hotjar.com*",
+    "*criteo.com*",
+    "*criteo.net*",
+    "*adnxs.com*",
+    "*taboola.com*",
+    "*outbrain.com*",
+    "*scorecardresearch.com*",
+    "*bing.com/bat*",
+    "*clarity.ms*",
+    "*tiktok.com/i18n/pixel*",
+    "*amazon-adsystem.com*",
+]
+
+# Pazar yerine özgü, okunmayan widget/öneri uç noktaları
+MARKETPLACE_PATTERNS = {
+    "trendyol": ["*recommendation*", "*/widget/*", "*insider*", "*useinsider.com*"],
+    "ebay": ["*/gh/useracquisition*", "*ebayadservices*", "*/plmt/*", "*ir.ebaystatic.com/rs/c/*video*"],
+    "amazon": ["*fls-na.amazon*", "*unagi*", "*/uedata*", "*aax-*"],
+}
+
+DEFAULT_BLOCK = ("ads", "font", "media")
+
+# Engelleme kapalı kontrol çalışması ve taban çizgisi dosyası
+CONTROL_ENV = "SCRAPER_NETWORK_CONTROL"
+DEFAULT_BASELINE_PATH = os.environ.get(
+    "SCRAPER_NETWORK_BASELINE", os.path.join(os.path.expanduser("~"), ".scraper_network_baseline.json"))
+
+_blockers = weakref.WeakKeyDictionary()
+# Sürücü kapatılınca bırakılacak kaynak (kalıcı profil slotu veya daemon kiralaması)
+_releases = weakref.WeakKeyDictionary()
+
+
+def build_patterns(block=DEFAULT_BLOCK, marketplace=None, extra_patterns=()):
+    """block içindeki adlardan ("ads", "font", "media") engellenecek URL kalıp listesini oluşturur."""
+    patterns = []
+    for name in block:
+        if name == "ads":
+            patterns.extend(AD_TRACKER_PATTERNS)
+        else:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(name, []))
+    if marketplace:
+        patterns.extend(MARKETPLACE_PATTERNS.get(marketplace, []))
+    patterns.extend(extra_patterns)
+    return patterns
+
+
+def control_run():
+    """Engelleme kapalı, taban çizgisi ölçen kontrol çalışması mı?"""
+    return os.environ.get(CONTROL_ENV, "") not in ("", "0")
+
+
+class NetworkStats:
+    """
+    Sayfa başına aktarılan bayt / yükleme süresi ölçümleri. Paralel işçiler
+    aynı nesneyi paylaştığı için kayıtlar kilitle eklenir. Engelleme kapalı
+    ölçümlerin etiket başına ortalamaları baseline_path'e kaydedilir.
+    """
+
+    def __init__(self, baseline_path=DEFAULT_BASELINE_PATH):
+        # (etiket, engelleme_açık) -> ölçüm listesi
+        self.samples = {}
+        self.baseline_path = baseline_path
+        self._lock = threading.Lock()
+
+    def record(self, label, blocking, transferred, load_ms, blocked):
+        with self._lock:
+            self.samples.setdefault((label, blocking), []).append((transferred, load_ms, blocked))
+
+    @staticmethod
+    def _average(samples):
+        count = len(samples)
+        return (sum(s[0] for s in samples) / count, sum(s[1] for s in samples) / count,
+                sum(s[2] for s in samples) / count)
+
+    def _snapshot(self):
+        with self._lock:
+            return {key: list(samples) for key, samples in self.samples.items()}
+
+    def load_baseline(self):
+        """Kayıtlı taban çizgisi: etiket -> {"pages", "avg_bytes", "avg_ms"}; yoksa boş."""
+        if not self.baseline_path or not os.path.exists(self.baseline_path):
+            return {}
+        try:
+            with open(self.baseline_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.info("Ağ taban çizgisi okunamadı (%s): %s", self.baseline_path, e)
+            return {}
+
+    def save_baseline(self):
+        """
+        Bu süreçteki engelleme kapalı ölçümleri kayıtlı taban çizgisine sayfa
+        sayısıyla ağırlıklı olarak ekler ve ölçümleri boşaltır (aynı ölçüm iki
+        kez eklenmez). Kaydedilen etiket sayısını döndürür.
+        """
+        with self._lock:
+            samples = {label: self.samples.pop((label, blocking))
+                       for label, blocking in list(self.samples) if not blocking}
+        if not samples or not self.baseline_path:
+            return 0
+        baseline = self.load_baseline()
+        for label, values in samples.items():
+            transferred, load_ms, _ = self._average(values)
+            old = baseline.get(label) or {"pages": 0, "avg_bytes": 0, "avg_ms": 0}
+            pages = old["pages"] + len(values)
+            baseline[label] = {
+                "pages": pages,
+                "avg_bytes": round((old["avg_bytes"] * old["pages"] + transferred * len(values)) / pages),
+                "avg_ms": round((old["avg_ms"] * old["pages"] + load_ms * len(values)) / pages),
+            }
+        folder = os.path.dirname(self.baseline_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = self.baseline_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.baseline_path)
+        return len(samples)
+
+    def summary(self):
+        """Engelleme açık ölçümlerin özeti; tasarruf kayıtlı taban çizgisine göre hesaplanır."""
+        samples = self._snapshot()
+        baseline = self.load_baseline()
+        rows = {}
+        for (label, blocking), values in samples.items():
+            if not blocking:
+                continue
+            transferred, load_ms, blocked = self._average(values)
+            row = {"pages": len(values), "avg_bytes": round(transferred), "avg_ms": round(load_ms),
+                   "avg_blocked": round(blocked, 1)}
+            if label in baseline:
+                row["saved_bytes"] = round(baseline[label]["avg_bytes"] - transferred)
+                row["saved_ms"] = round(baseline[label]["avg_ms"] - load_ms)
+            rows[label] = row
+        return rows
+
+    def log_summary(self, log=logging.info):
+        saved = self.save_baseline()
+        if saved:
+            log(f"[ağ] {saved} etiket için engelleme kapalı ölçümler taban çizgisine eklendi ({self.baseline_path}).")
+        for label, row in sorted(self.summary().items()):
+            line = (f"[ağ] {label}: {row['pages']} sayfa, ort. {row['avg_bytes'] / 1024:.0f} KB, "
+                    f"{row['avg_ms']} ms, ort. {row['avg_blocked']} istek engellendi")
+            if "saved_bytes" in row:
+                line += f", sayfa başına tasarruf ~{row['saved_bytes'] / 1024:.0f} KB / {row['saved_ms']} ms"
+            log(line)
+
+
+stats = NetworkStats()
+
+_PAGE_TIMING_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return 0; }
+return nav.loadEventEnd > 0 ? nav.loadEventEnd : nav.domContentLoadedEventEnd;
+"""
+
+
+class NetworkBlocker:
+    def __init__(self, driver, patterns, block_images=True, measure=True, control=False):
+        self.driver = driver
+        # Kontrol çalışmasında hiçbir şey engellenmez; ölçümler taban çizgisi olur
+        self.control = control
+        self.patterns = [] if control else list(patterns)
+        self.images_blocked = block_images and not control
+        self.measure = measure
+        # Performans günlüğü mesajlarını alan dinleyiciler (ör. fixture_replay kaydedicisi)
+        self.listeners = []
+        self._pending_transferred = 0
+        self._pending_blocked = 0
+        self._drain_lock = threading.Lock()
+
+    @property
+    def blocking(self):
+        return bool(self.patterns) or self.images_blocked
+
+    def blocked_urls(self):
+        urls = list(self.patterns)
+        if self.images_blocked:
+            urls.extend(RESOURCE_TYPE_PATTERNS["image"])
+        return urls
+
+    def apply(self):
+        """
+        Engelleme listesini etkin sekmeye (CDP hedefine) uygular. Yeni açılan
+        sekme veya pencereye geçildiğinde tekrar çağrılmalıdır.
+        """
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls()})
+
+    def set_images(self, enabled):
+        """Görselleri açar/kapatır; durum değişmiyorsa veya kontrol çalışmasındaysa CDP çağrısı yapılmaz."""
+        if self.control or self.images_blocked == (not enabled):
+            return
+        self.images_blocked = not enabled
+        self.apply()
+
+    def drain(self):
+        """
+        Performans günlüğünü okur: ağ mesajları dinleyicilere iletilir, aktarılan
+        bayt ve engellenen istekler bir sonraki measure_page için biriktirilir.
+        """
+        with self._drain_lock:
+            try:
+                entries = self.driver.get_log("performance")
+            except Exception:
+                return
+            messages = []
+            for entry in entries:
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, ValueError):
+                    continue
+                messages.append(message)
+                method = message.get("method")
+                params = message.get("params", {})
+                if method == "Network.loadingFinished":
+                    self._pending_transferred += params.get("encodedDataLength", 0)
+                elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                    self._pending_blocked += 1
+            for listener in self.listeners:
+                listener(messages)
+
+    def _drain_network_log(self):
+        self.drain()
+        with self._drain_lock:
+            transferred, blocked = self._pending_transferred, self._pending_blocked
+            self._pending_transferred = self._pending_blocked = 0
+        return transferred, blocked
+
+    def measure_page(self, label):
+        """Son ölçümden bu yana aktarılan baytı, engellenen istekleri ve sayfa yükleme süresini kaydeder."""
+        if not self.measure:
+            return None
+        transferred, blocked = self._drain_network_log()
+        try:
+            load_ms = self.driver.execute_script(_PAGE_TIMING_SCRIPT) or 0
+        except Exception:
+            load_ms = 0
+        stats.record(label, self.blocking, transferred, load_ms, blocked)
+        return transferred, load_ms, blocked
+
+
+def create_driver(driver_path, headless=False, arguments=(), block=DEFAULT_BLOCK, block_images=True,
+                  marketplace=None, extra_patterns=(), measure=True, options=None, persistent_profile=True):
+    """
+    Engelleme profili uygulanmış bir Chrome sürücüsü döndürür.
+
+    :param block: Engellenecek kaynak grupları ("ads", "font", "media"); boş verilirse
+                  engelleme yapılmaz (tasarruf ölçümü için karşılaştırma çalışması).
+    :param block_images: Görseller başlangıçta engellensin mi (sonradan set_images ile değişir).
+    :param marketplace: "trendyol", "ebay" veya "amazon"; pazar yerine özgü kalıpları ekler.
+    :param measure: Sayfa başına bayt/süre ölçümü için performans günlüğünü açar.
+    :param persistent_profile: marketplace verildiyse kilitli, kalıcı bir profil slotu
+                               (user-data-dir + disk-cache-dir) kullanılır. Sürücü
+                               quit_driver ile kapatılmalıdır ki slot serbest kalsın.
+    """
+    options = options or webdriver.ChromeOptions()
+    for argument in list(arguments) + fixture_replay.replay_arguments():
+        options.add_argument(argument)
+    # Kayıt modunda yanıtlar performans günlüğünden okunur
+    measure = measure or fixture_replay.recording()
+    profile = None
+    if persistent_profile and marketplace:
+        profile = browser_profile.acquire(marketplace)
+        for argument in profile.chrome_arguments():
+            options.add_argument(argument)
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    if measure:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    except Exception:
+        if profile is not None:
+            profile.release()
+        raise
+    if profile is not None:
+        _releases[driver] = profile
+    _install_blocker(driver, build_patterns(block, marketplace, extra_patterns), block_images, measure)
+    return driver
+
+
+def _install_blocker(driver, patterns, block_images, measure):
+    control = control_run()
+    if control:
+        logging.info("Ağ kontrol çalışması: engelleme kapalı, ölçümler taban çizgisine kaydedilecek.")
+    blocker = NetworkBlocker(driver, patterns, block_images=block_images, measure=measure, control=control)
+    try:
+        blocker.apply()
+    except Exception as e:
+        logging.error("Ağ engelleme profili uygulanamadı: %s", e)
+    _blockers[driver] = blocker
+    fixture_replay.attach(driver, blocker)
+
+
+def attach_driver(driver_path, debugger_address, block=DEFAULT_BLOCK, block_images=True,
+                  marketplace=None, extra_patterns=(), measure=True, lease=None):
+    """
+    --remote-debugging-port ile zaten çalışan bir Chrome'a bağlanan sürücü
+    döndürür (ör. driver_daemon'dan kiralanan tarayıcı). Engelleme profili bu
+    oturuma da uygulanır. lease verilirse quit_driver tarayıcıyı kapatmaz,
+    yalnızca oturumu bitirip kiralamayı iade eder.
+    """
+    options = webdriver.ChromeOptions()
+    options.debugger_address = debugger_address
+    measure = measure or fixture_replay.recording()
+    if measure:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    if lease is not None:
+        _releases[driver] = lease
+    _install_blocker(driver, build_patterns(block, marketplace, extra_patterns), block_images, measure)
+    return driver
+
+
+def quit_driver(driver):
+    """
+    Sürücüyü kapatır ve bağlı kaynağı bırakır: kalıcı profil slotunun kilidi
+    ya da daemon'dan kiralanan tarayıcı (o durumda tarayıcı açık kalır).
+    """
+    resource = _releases.pop(driver, None)
+    try:
+        fixture_replay.detach(driver)
+        driver.quit()
+    finally:
+        if resource is not None:
+            resource.release()
+
+
+def network(driver):
+    """create_driver ile oluşturulmuş sürücünün engelleyicisini döndürür (yoksa None)."""
+    return _blockers.get(driver)
+
+
+def set_images(driver, enabled):
+    blocker = network(driver)
+    if blocker is not None:
+        blocker.set_images(enabled)
+
+
+def apply_to_current(driver):
+    """Yeni sekmeye/pencereye geçildikten sonra engelleme listesini o hedefe de uygular."""
+    blocker = network(driver)
+    if blocker is not None:
+        blocker.apply()
+
+
+def measure_page(driver, label):
+    blocker = network(driver)
+    if blocker is None:
+        return None
+    return blocker.measure_page(label)
@@ -0,0 +1,558 @@
+"""
+Çevrimdışı benchmark için sayfa kaydı ve tekrar oynatma (record & replay).
+
+Kayıt modunda driver_factory ile açılan her sürücünün performans günlüğü
+izlenir: yüklenen her belge, XHR/fetch ve alt kaynak yanıtı durum kodu,
+başlıklar ve gövdesiyle (CDP Network.getResponseBody) HAR benzeri bir
+fixture.jsonl dosyasına, gövdeler içerik adresli bodies/ deposuna yazılır.
+
+Tekrar oynatmada yerel bir HTTP proxy'si kaydedilen yanıtları, ayarlanabilir
+gecikmeyle geri verir. Chrome bu proxy'ye --proxy-server ile yönlendirilir;
+HTTPS bağlantıları tek bir yerel sertifikayla açılır (tarayıcı
+--ignore-certificate-errors ile başlatılır). Scriptlerde kod değişikliği
+gerekmez; driver_factory ortam değişkenlerine bakar. Tarayıcı dışından
+requests ile giden yollar (trendyol_http hızlı yolu, image_downloader) bu
+modlarda kapatılır, ürünler tarayıcıda okunur:
+
+    # Canlı sitede bir kez kaydet
+    python fixture_replay.py record fixtures/trendyol -- python Trendyol_Category_Search18.py
+
+    # Aynı girdilerle çevrimdışı ölç; sonuç commit'iyle bench_results.jsonl'e eklenir
+    python fixture_replay.py bench fixtures/trendyol --latency 0.05 --repeat 3 -- python Trendyol_Category_Search18.py
+
+    # Yalnızca proxy'yi çalıştır
+    python fixture_replay.py serve fixtures/trendyol --port 8899
+"""
+
+import os
+import ssl
+import time
+import base64
+import socket
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import record_sink
+import blob_store
+
+RECORD_ENV = "SCRAPER_RECORD_DIR"
+REPLAY_ENV = "SCRAPER_REPLAY_PROXY"
+
+FIXTURE_NAME = "fixture.jsonl"
+BODIES_DIR = "bodies"
+BENCH_RESULTS_NAME = "bench_results.jsonl"
+DEFAULT_PORT = 8899
+
+# Tekrar oynatmada yeniden hesaplanan ya da gövdeyle uyuşmayan başlıklar
+# (getResponseBody gövdeyi açılmış olarak verir)
+SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive",
+                "alt-svc", "strict-transport-security"}
+
+_recorders = {}
+_recorders_lock = threading.Lock()
+_writer = None
+_http_notices = set()
+
+
+def recording():
+    return bool(os.environ.get(RECORD_ENV))
+
+
+def replaying():
+    return bool(os.environ.get(REPLAY_ENV))
+
+
+def http_disabled(name):
+    """
+    requests ile yapılan istekler (HTTP hızlı yolu, görsel indirici) tarayıcıdan
+    ve proxy'den geçmez: kayıtta fixture'a yazılmaz, tekrar oynatmada canlı
+    siteye gider. Kayıt ya da tekrar oynatma modunda True döner; çağıran bu
+    yolu kapatır (HTTP hızlı yolu yerine tarayıcı akışı kullanılır).
+    """
+    if not (recording() or replaying()):
+        return False
+    with _recorders_lock:
+        first = name not in _http_notices
+        _http_notices.add(name)
+    if first:
+        logging.info("Kayıt/tekrar oynatma modu: %s kapalı (istekleri fixture'dan geçmez).", name)
+    return True
+
+
+def replay_arguments():
+    """Tekrar oynatma modundaysa Chrome'u yerel proxy'ye yönlendiren argümanlar."""
+    proxy = os.environ.get(REPLAY_ENV)
+    if not proxy:
+        return []
+    return [f"--proxy-server={proxy}", "--proxy-bypass-list=<-loopback>", "--ignore-certificate-errors"]
+
+
+# =====================
+# Kayıt
+# =====================
+class FixtureWriter:
+    """Aynı süreçteki tüm sürücülerin yanıtlarını tek fixture'a yazar."""
+
+    def __init__(self, fixture_dir):
+        self.fixture_dir = str(fixture_dir)
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        self.sink = record_sink.RecordSink(os.path.join(self.fixture_dir, FIXTURE_NAME))
+        self.bodies = blob_store.BlobStore(os.path.join(self.fixture_dir, BODIES_DIR), view=blob_store.VIEW_NONE)
+        self.stats = {"responses": 0, "missing_bodies": 0}
+        self._lock = threading.Lock()
+
+    def put_body(self, data):
+        path = self.bodies.temp_path()
+        with open(path, "wb") as f:
+            f.write(data)
+        return self.bodies.put_file(path)
+
+    def write(self, entry, missing_body=False):
+        with self._lock:
+            self.stats["responses"] += 1
+            if missing_body:
+                self.stats["missing_bodies"] += 1
+        self.sink.write(entry)
+
+    def close(self):
+        self.sink.close()
+        self.bodies.close()
+        logging.info("Fixture kaydı: %d yanıt, %d yanıtın gövdesi alınamadı (%s).",
+                     self.stats["responses"], self.stats["missing_bodies"], self.fixture_dir)
+
+
+def _serialize_commands(driver):
+    """
+    Sürücünün tüm WebDriver/CDP komutlarını tek bir kilitle sıralar. Kaydedicinin
+    arka plan iş parçacığı (get_log, getResponseBody) ana iş parçacığının
+    komutlarıyla aynı oturumda eşzamanlı çalışmasın diye driver.execute sarılır.
+    """
+    lock = threading.RLock()
+    execute = driver.execute
+
+    def locked_execute(driver_command, params=None):
+        with lock:
+            return execute(driver_command, params)
+
+    driver.execute = locked_execute
+    return lock
+
+
+class Recorder:
+    """
+    Bir sürücünün ağ mesajlarından istek/yanıt çiftlerini çıkarır. Gövdeler
+    sayfa değişmeden alınabilsin diye günlük arka planda interval saniyede bir
+    okunur; measure_page çağrıları da aynı mesajları dinleyiciye iletir.
+    Arka plan okumaları ana iş parçacığının sürücü komutlarıyla aynı kilidi
+    kullanır.
+    """
+
+    def __init__(self, driver, blocker, writer, interval=0.5):
+        self.driver = driver
+        self.blocker = blocker
+        self.writer = writer
+        self.interval = interval
+        self._requests = {}
+        self._responses = {}
+        self._stop = threading.Event()
+        _serialize_commands(driver)
+        try:
+            # Büyük sayfaların gövdeleri tampondan düşmesin
+            driver.execute_cdp_cmd("Network.enable", {"maxTotalBufferSize": 200 * 1024 * 1024,
+                                                      "maxResourceBufferSize": 20 * 1024 * 1024})
+        except Exception as e:
+            logging.info("Ağ tamponu büyütülemedi: %s", e)
+        blocker.listeners.append(self.on_messages)
+        self._thread = threading.Thread(target=self._run, name="fixture-recorder", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.blocker.drain()
+            except Exception as e:
+                logging.info("Performans günlüğü okunamadı: %s", e)
+
+    def _entry(self, request, response):
+        timing = response.get("timing") or {}
+        return {
+            "method": request.get("method", "GET"),
+            "url": request["url"],
+            "post_data": request.get("postData"),
+            "status": response.get("status", 200),
+            "headers": response.get("headers", {}),
+            "mime": response.get("mimeType"),
+            "type": request.get("type"),
+            "wait_ms": round(timing.get("receiveHeadersEnd", 0) or 0),
+            "body": None,
+            "ts": time.time(),
+        }
+
+    def on_messages(self, messages):
+        for message in messages:
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                redirect = params.get("redirectResponse")
+                previous = self._requests.get(request_id)
+                if redirect and previous:
+                    # Yönlendirme yanıtı gövdesizdir; Location başlığıyla kaydedilir
+                    self.writer.write(self._entry(previous, redirect))
+                request = dict(params.get("request", {}))
+                request["type"] = params.get("type")
+                self._requests[request_id] = request
+            elif method == "Network.responseReceived":
+                self._responses[request_id] = params.get("response", {})
+            elif method == "Network.loadingFinished":
+                self._finish(request_id)
+            elif method == "Network.loadingFailed":
+                self._requests.pop(request_id, None)
+                self._responses.pop(request_id, None)
+
+    def _finish(self, request_id):
+        request = self._requests.pop(request_id, None)
+        response = self._responses.pop(request_id, None)
+        if not request or response is None or request.get("url", "").startswith("data:"):
+            return
+        entry = self._entry(request, response)
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception:
+            # Sayfa değiştiyse ya da yanıt tampondan düştüyse gövde alınamaz
+            self.writer.write(entry, missing_body=True)
+            return
+        body = result.get("body", "")
+        data = base64.b64decode(body) if result.get("base64Encoded") else body.encode("utf-8")
+        entry["body"] = self.writer.put_body(data)
+        self.writer.write(entry)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.blocker.drain()
+        except Exception as e:
+            logging.info("Son ağ mesajları okunamadı: %s", e)
+        if self.on_messages in self.blocker.listeners:
+            self.blocker.listeners.remove(self.on_messages)
+
+
+def attach(driver, blocker):
+    """Kayıt modundaysa sürücüye bir kaydedici bağlar (driver_factory çağırır)."""
+    global _writer
+    fixture_dir = os.environ.get(RECORD_ENV)
+    if not fixture_dir:
+        return None
+    with _recorders_lock:
+        if _writer is None:
+            _writer = FixtureWriter(fixture_dir)
+        recorder = _recorders[id(driver)] = Recorder(driver, blocker, _writer)
+    return recorder
+
+
+def detach(driver):
+    """Sürücünün kaydedicisini durdurur; son sürücüyse fixture dosyasını kapatır."""
+    global _writer
+    with _recorders_lock:
+        recorder = _recorders.pop(id(driver), None)
+    if recorder is None:
+        return
+    recorder.stop()
+    with _recorders_lock:
+        if not _recorders and _writer is not None:
+            _writer.close()
+            _writer = None
+
+
+# =====================
+# Tekrar oynatma
+# =====================
+class Fixture:
+    """fixture.jsonl'i (yöntem, URL) -> yanıt listesi olarak yükler."""
+
+    def __init__(self, fixture_dir):
+        self.fixture_dir = str(fixture_dir)
+        self.bodies = blob_store.BlobStore(os.path.join(self.fixture_dir, BODIES_DIR), view=blob_store.VIEW_NONE)
+        self.exact = {}
+        self.by_path = {}
+        count = 0
+        for entry in record_sink.iter_records(os.path.join(self.fixture_dir, FIXTURE_NAME)):
+            key = (entry["method"], entry["url"])
+            self.exact.setdefault(key, []).append(entry)
+            self.by_path.setdefault((entry["method"], self._path_key(entry["url"])), entry)
+            count += 1
+        self.bodies.close()
+        self._served = {}
+        self._lock = threading.Lock()
+        logging.info("Fixture yüklendi: %d yanıt, %d farklı istek (%s).", count, len(self.exact), self.fixture_dir)
+
+    @staticmethod
+    def _path_key(url):
+        parts = urlsplit(url)
+        return f"{parts.netloc.lower()}{parts.path}"
+
+    def lookup(self, method, url):
+        """
+        Aynı istek birden çok kez kaydedildiyse yanıtlar sırayla, sonuncusu
+        tekrarlanarak verilir. Birebir eşleşme yoksa sorgu parametreleri
+        (zaman damgası, oturum kimliği vb.) yok sayılarak aranır.
+        """
+        entries = self.exact.get((method, url))
+        if entries:
+            with self._lock:
+                index = self._served.get((method, url), 0)
+                self._served[(method, url)] = index + 1
+            return entries[min(index, len(entries) - 1)]
+        return self.by_path.get((method, self._path_key(url)))
+
+    def body(self, entry):
+        if not entry.get("body"):
+            return b""
+        with open(self.bodies.path_for(entry["body"]), "rb") as f:
+            return f.read()
+
+
+def ensure_certificate(cert_dir=None):
+    """Tünellenen HTTPS bağlantıları için kendinden imzalı sertifikayı (yoksa openssl ile) oluşturur."""
+    cert_dir = cert_dir or os.path.join(tempfile.gettempdir(), "fixture_replay_cert")
+    cert_path = os.path.join(cert_dir, "cert.pem")
+    key_path = os.path.join(cert_dir, "key.pem")
+    if not (os.path.exists(cert_path) and os.path.exists(key_path)):
+        if shutil.which("openssl") is None:
+            raise RuntimeError("HTTPS tekrar oynatma için openssl gerekli.")
+        os.makedirs(cert_dir, exist_ok=True)
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+                        "-subj", "/CN=fixture-replay", "-keyout", key_path, "-out", cert_path],
+                       check=True, capture_output=True)
+    return cert_path, key_path
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    _tunnel_host = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_CONNECT(self):
+        # Tarayıcı HTTPS için tünel ister; bağlantı yerel sertifikayla açılır ve
+        # içindeki istekler aynı işleyiciyle yanıtlanır.
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self.wfile.flush()
+        try:
+            connection = self.server.ssl_context.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.close_connection = True
+            return
+        self._tunnel_host = self.path.split(":")[0]
+        self.connection = connection
+        self.rfile = connection.makefile("rb", self.rbufsize)
+        self.wfile = connection.makefile("wb", 0)
+        self.close_connection = False
+        while not self.close_connection:
+            try:
+                self.handle_one_request()
+            except (ssl.SSLError, OSError):
+                break
+
+    def _url(self):
+        if self._tunnel_host:
+            return f"https://{self._tunnel_host}{self.path}"
+        return self.path
+
+    def _replay(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        server = self.server
+        entry = server.fixture.lookup(self.command, self._url())
+        if entry is None:
+            server.count(missed=self._url())
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        delay = server.latency + server.latency_scale * entry.get("wait_ms", 0) / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+        body = server.fixture.body(entry)
+        server.count()
+        self.send_response(entry.get("status", 200))
+        for name, value in entry.get("headers", {}).items():
+            if name.lower() in SKIP_HEADERS:
+                continue
+            # CDP birden çok değerli başlıkları satır sonuyla birleştirir
+            for line in str(value).split("\n"):
+                self.send_header(name, line)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = do_PATCH = _replay
+
+
+class ReplayProxy(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixture_dir, host="127.0.0.1", port=DEFAULT_PORT, latency=0.0, latency_scale=0.0):
+        """
+        :param latency: Her yanıta eklenen sabit gecikme (saniye).
+        :param latency_scale: Kayıttaki sunucu bekleme süresinin bu katı kadar ek gecikme
+                              (1.0 canlı sitedeki gecikmeyi taklit eder).
+        """
+        super().__init__((host, port), _ReplayHandler)
+        self.fixture = Fixture(fixture_dir)
+        self.latency = latency
+        self.latency_scale = latency_scale
+        cert_path, key_path = ensure_certificate()
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ssl_context.load_cert_chain(cert_path, key_path)
+        self.stats = {"served": 0, "missed": 0}
+        self.missed_urls = {}
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def proxy_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, missed=None):
+        with self._stats_lock:
+            if missed is None:
+                self.stats["served"] += 1
+            else:
+                self.stats["missed"] += 1
+                self.missed_urls[missed] = self.missed_urls.get(missed, 0) + 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="replay-proxy", daemon=True)
+        self._thread.start()
+        logging.info("Tekrar oynatma proxy'si çalışıyor: %s", self.proxy_url)
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        for url, count in sorted(self.missed_urls.items(), key=lambda item: -item[1])[:10]:
+            logging.info("Fixture'da olmayan istek (%dx): %s", count, url)
+
+
+# =====================
+# Komut satırı
+# =====================
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_command(command, env_updates):
+    env = dict(os.environ)
+    env.update(env_updates)
+    started = time.perf_counter()
+    returncode = subprocess.call(command, env=env)
+    return returncode, time.perf_counter() - started
+
+
+def record(fixture_dir, command):
+    returncode, seconds = run_command(command, {RECORD_ENV: os.path.abspath(fixture_dir)})
+    logging.info("Kayıt tamamlandı (%.1f sn, çıkış kodu %d): %s", seconds, returncode, fixture_dir)
+    return returncode
+
+
+def bench(fixture_dir, command, repeat=1, port=DEFAULT_PORT, latency=0.0, latency_scale=0.0):
+    """
+    Komutu tekrar oynatma proxy'sine karşı repeat kez çalıştırır; süre ve
+    istek/sn sonuçları commit kimliğiyle bench_results.jsonl'e eklenir.
+    """
+    results_path = os.path.join(fixture_dir, BENCH_RESULTS_NAME)
+    previous = [result for result in (record_sink.iter_records(results_path) if os.path.exists(results_path) else [])
+                if result.get("command") == command]
+    proxy = ReplayProxy(fixture_dir, port=port, latency=latency, latency_scale=latency_scale).start()
+    runs = []
+    try:
+        for run in range(1, repeat + 1):
+            served_before = proxy.stats["served"]
+            returncode, seconds = run_command(command, {REPLAY_ENV: proxy.proxy_url})
+            served = proxy.stats["served"] - served_before
+            runs.append(seconds)
+            logging.info("Çalıştırma %d/%d: %.2f sn, %d yanıt (%.1f istek/sn), çıkış kodu %d.",
+                         run, repeat, seconds, served, served / seconds if seconds else 0, returncode)
+    finally:
+        proxy.stop()
+    result = {
+        "commit": _git_commit(),
+        "command": command,
+        "latency": latency,
+        "latency_scale": latency_scale,
+        "runs": [round(seconds, 3) for seconds in runs],
+        "best": round(min(runs), 3) if runs else None,
+        "served": proxy.stats["served"],
+        "missed": proxy.stats["missed"],
+        "ts": time.time(),
+    }
+    with record_sink.RecordSink(results_path) as sink:
+        sink.write(result)
+    for old in previous[-5:]:
+        logging.info("Önceki sonuç %s: en iyi %.2f sn (gecikme %s).", old.get("commit"), old.get("best") or 0,
+                     old.get("latency"))
+    logging.info("Bu commit %s: en iyi %.2f sn.", result["commit"], result["best"] or 0)
+    return result
+
+
+def _port_in_use(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description="Sayfa kaydı ve çevrimdışı tekrar oynatma")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    for name in ("record", "serve", "bench"):
+        sub = subparsers.add_parser(name)
+        sub.add_argument("fixture_dir", help="Fixture klasörü")
+        if name != "record":
+            sub.add_argument("--port", type=int, default=DEFAULT_PORT)
+            sub.add_argument("--latency", type=float, default=0.0, help="Yanıt başına sabit gecikme (sn)")
+            sub.add_argument("--latency-scale", type=float, default=0.0,
+                             help="Kayıttaki sunucu bekleme süresinin katı kadar gecikme")
+        if name == "bench":
+            sub.add_argument("--repeat", type=int, default=1)
+        if name != "serve":
+            sub.add_argument("command", nargs=argparse.REMAINDER, help="-- ardından çalıştırılacak komut")
+    args = parser.parse_args()
+
+    command = getattr(args, "command", None) or []
+    if command and command[0] == "--":
+        command = command[1:]
+    if args.action != "serve" and not command:
+        parser.error("Çalıştırılacak komut verilmedi (ör. -- python Trendyol_Category_Search18.py).")
+    if args.action != "record" and _port_in_use(args.port):
+        parser.error(f"Port kullanımda: {args.port}")
+
+    if args.action == "record":
+        raise SystemExit(record(args.fixture_dir, command))
+    if args.action == "bench":
+        bench(args.fixture_dir, command, args.repeat, args.port, args.latency, args.latency_scale)
+    else:
+        replay = ReplayProxy(args.fixture_dir, port=args.port, latency=args.latency,
+                             latency_scale=args.latency_scale).start()
+        logging.info("Scriptleri %s=%s ile çalıştırın; durdurmak için Ctrl+C.", REPLAY_ENV, replay.proxy_url)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            replay.stop()
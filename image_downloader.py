@@ -0,0 +1,180 @@
+"""
+Ürün galerileri için eşzamanlı, akışlı görsel indirici.
+
+Görseller ortak bir bağlantı havuzu üzerinden paralel indirilir. Her istek
+bağlantı/okuma zaman aşımına, toplam süre sınırına ve host başına eşzamanlılık
+sınırına tabidir; hatada rastgele gecikmeli (jitter) yeniden denenir. Gövde
+parça parça geçici dosyaya yazılır ve tamamlanınca atomik olarak hedef adına
+taşınır, yarım dosya hiçbir zaman hedef yolda görünmez.
+"""
+
+import os
+import time
+import random
+import logging
+import tempfile
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import fixture_replay
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "image/avif,image/webp,image/*,*/*;q=0.8",
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class ImageDownloader:
+    def __init__(self, max_workers=8, per_host=4, connect_timeout=5, read_timeout=15,
+                 deadline=60, retries=3, backoff=0.5, chunk_size=64 * 1024):
+        """
+        :param max_workers: Aynı anda çalışan toplam indirme sayısı.
+        :param per_host: Tek bir host'a (CDN) aynı anda açılan en fazla bağlantı.
+        :param deadline: Tek bir görsel için toplam süre sınırı (saniye).
+        :param retries: Hata durumunda en fazla deneme sayısı.
+        """
+        self.per_host = per_host
+        self.timeout = (connect_timeout, read_timeout)
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(HEADERS)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="img")
+        self._host_limits = {}
+        self._host_lock = threading.Lock()
+
+    def _host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def _fetch_once(self, url, dest_path):
+        started = time.monotonic()
+        folder = os.path.dirname(dest_path) or "."
+        with self._host_semaphore(url):
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                if response.status_code != 200:
+                    raise requests.HTTPError(f"HTTP Durum Kodu: {response.status_code}", response=response)
+                fd, tmp_path = tempfile.mkstemp(prefix=".part-", dir=folder)
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        for chunk in response.iter_content(self.chunk_size):
+                            if time.monotonic() - started > self.deadline:
+                                raise TimeoutError(f"{self.deadline} sn içinde tamamlanamadı")
+                            f.write(chunk)
+                    os.replace(tmp_path, dest_path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+        return dest_path
+
+    def download(self, url, dest_path):
+        """
+        Tek bir görseli indirir; başarılıysa hedef yolu, değilse None döndürür.
+        Kayıt/tekrar oynatma modunda istek fixture'dan geçmeyeceği için indirilmez.
+        """
+        if fixture_replay.http_disabled("görsel indirici"):
+            return None
+        for attempt in range(1, self.retries + 1):
+            try:
+                return self._fetch_once(url, dest_path)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in RETRY_STATUS or attempt == self.retries:
+                    logging.error("Görsel indirilemedi (%s): %s", url, e)
+                    return None
+            except (requests.RequestException, TimeoutError, OSError) as e:
+                if attempt == self.retries:
+                    logging.error("Görsel indirilemedi (%s): %s", url, e)
+                    return None
+            # Üstel bekleme + jitter: aynı anda düşen istekler aynı anda tekrar denemesin
+            time.sleep(self.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+        return None
+
+    def download_all(self, jobs):
+        """
+        jobs: (url, hedef_yol) çiftleri. Hepsini eşzamanlı indirir ve aynı
+        sırada, başarısız olanlar için None içeren yol listesi döndürür.
+        """
+        futures = [self._executor.submit(self.download, url, dest_path) for url, dest_path in jobs]
+        return [future.result() for future in futures]
+
+    def download_to_store(self, url, store):
+        """
+        Görseli içerik adresli depoya alır ve SHA-256 özetini döndürür. URL
+        depoda zaten varsa ağa hiç gidilmez. Başarısızsa None döner.
+        """
+        digest = store.lookup(url)
+        if digest:
+            return digest
+        tmp_path = store.temp_path()
+        if self.download(url, tmp_path) is None:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        return store.put_file(tmp_path, url=url)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_downloader():
+    """Süreç içinde paylaşılan varsayılan indirici (bağlantı havuzu ortak kullanılır)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ImageDownloader()
+        return _default
+
+
+def download_gallery(image_urls, folder, limit=3, downloader=None):
+    """
+    Galeri görsellerini folder altına image_1.jpg, image_2.jpg ... adlarıyla
+    eşzamanlı indirir ve başarıyla kaydedilen yolları döndürür.
+    """
+    downloader = downloader or default_downloader()
+    jobs = [(url, os.path.join(str(folder), f"image_{i}.jpg"))
+            for i, url in enumerate(image_urls[:limit], start=1)]
+    return [path for path in downloader.download_all(jobs) if path]
+
+
+def store_gallery(image_urls, folder, store, limit=3, downloader=None):
+    """
+    Galeri görsellerini içerik adresli depoya (blob_store.BlobStore) eşzamanlı
+    alır ve product.json'a yazılacak referans listesini döndürür. Deponun
+    görünümü açıksa folder altında image_1.jpg ... adlarıyla bağlantı oluşturulur.
+    """
+    downloader = downloader or default_downloader()
+    urls = image_urls[:limit]
+    futures = [downloader._executor.submit(downloader.download_to_store, url, store) for url in urls]
+    refs = []
+    for i, (url, future) in enumerate(zip(urls, futures), start=1):
+        digest = future.result()
+        if not digest:
+            continue
+        name = f"image_{i}.jpg"
+        store.link(digest, os.path.join(str(folder), name))
+        refs.append(store.ref(digest, url=url, name=name))
+    return refs
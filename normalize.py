@@ -0,0 +1,146 @@
+"""
+Fiyat, değerlendirme, puan ve satış adedi metinlerinin ortak normalizasyonu.
+
+Kayıt başına dağınık ayrıştırma (her seferinde derlenen re.findall'lar,
+''.join(filter(str.isdigit, ...)), ham bırakılan "1.299,99 TL" fiyatları)
+yerine tüm desenler modül yüklenirken bir kez derlenir ve her pazar yeri aynı
+kuralları kullanır:
+
+    parse_price("1.299,99 TL", "TRY")   # (Decimal("1299.99"), "TRY")
+    parse_count("4,5 (1.234)")           # 1234
+    parse_ebay_card(full_text)           # (Decimal güncel fiyat, satış adedi)
+
+Trendyol (TL, "1.299,99" ondalık virgül) ve eBay ("$1,299.99", kart metninde
+"1,234 sold") çıktıları aynı alanlara dönüşür.
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+
+# =====================
+# Derlenmiş desenler
+# =====================
+_NON_DIGIT_RE = re.compile(r"\D+")
+_RATING_RE = re.compile(r"\d(?:[.,]\d+)?")
+_USD_PRICE_RE = re.compile(r"\$\s?(\d[\d,]*(?:\.\d{1,2})?)")
+_SOLD_RE = re.compile(r"(\d[\d,.]*[KkMm]?)\+?\s+sold", re.IGNORECASE)
+# "1.2K", "3,5M" gibi kısaltılmış adetler; ardından harf gelmemeli ("5 Months" adet değil)
+_SUFFIXED_COUNT_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s?([KkMm])(?![^\W\d_])")
+_COUNT_MULTIPLIERS = {"k": 1000, "m": 1000000}
+# "4.5 (120)" gibi puan + parantez içi adet; adet parantezdeki sayıdır
+_PAREN_COUNT_RE = re.compile(r"\((\d[\d.,]*\s?[KkMm]?)\+?\)")
+# Sayı ve hemen önündeki/arkasındaki para birimi tek aramada okunur
+_PRICE_RE = re.compile(r"(TL|₺|\$|€|£|USD|EUR|GBP)?\s?(\d[\d.,]*)\s?(TL|₺|\$|€|£|USD|EUR|GBP)?", re.IGNORECASE)
+_CURRENCY_CODES = {"tl": "TRY", "₺": "TRY", "$": "USD", "usd": "USD", "€": "EUR", "eur": "EUR",
+                   "£": "GBP", "gbp": "GBP"}
+
+# "1.299,99" -> "1299.99": binlik noktalar silinir, ondalık virgül noktaya çevrilir
+_COMMA_DECIMAL = str.maketrans({".": None, ",": "."})
+
+def _canonical_number(number, currency):
+    """
+    "1.299,99" / "1,299.99" / "1.299" gibi sayı metnini "1299.99" biçimine
+    getirir. İki ayraç da varsa sondaki ondalıktır; tek ayraçta grup
+    uzunluklarına ve para birimine bakılır (TL'de "1.299" binliktir).
+    """
+    number = number.rstrip(".,")
+    has_comma = "," in number
+    has_dot = "." in number
+    if not (has_comma or has_dot):
+        return number
+    if has_comma and has_dot:
+        if number.rfind(",") > number.rfind("."):
+            return number.translate(_COMMA_DECIMAL)
+        return number.replace(",", "")
+    if has_comma:
+        head, _, tail = number.rpartition(",")
+        return f"{head.replace(',', '')}.{tail}" if len(tail) != 3 else number.replace(",", "")
+    groups = number.split(".")
+    if all(len(group) == 3 for group in groups[1:]) and (len(groups) > 2 or currency == "TRY"):
+        return number.replace(".", "")
+    return number
+
+
+def _match_currency(match, default_currency):
+    symbol = match.group(1) or match.group(3)
+    return _CURRENCY_CODES.get(symbol.lower(), default_currency) if symbol else default_currency
+
+
+def _find_price(text):
+    """
+    Metindeki fiyat eşleşmesi: para birimi taşıyan ilk sayı, hiçbiri taşımıyorsa
+    son sayı ("%20 İndirim 1.299,99 TL" -> 1.299,99). Sayı yoksa None.
+    """
+    last = None
+    for match in _PRICE_RE.finditer(text):
+        if match.group(1) or match.group(3):
+            return match
+        last = match
+    return last
+
+
+def parse_price(text, default_currency=None):
+    """
+    "1.299,99 TL", "$1,299.99", "249 TL" gibi metinleri (Decimal, para birimi)
+    çiftine çevirir; ondalık ayracı metinden çıkarılır. Okunamazsa (None, para birimi).
+    """
+    if text is None:
+        return None, default_currency
+    if isinstance(text, (int, float)):
+        return Decimal(str(text)).quantize(Decimal("0.01")), default_currency
+    match = _find_price(str(text))
+    if not match:
+        return None, default_currency
+    currency = _match_currency(match, default_currency)
+    try:
+        return Decimal(_canonical_number(match.group(2), currency)).quantize(Decimal("0.01")), currency
+    except InvalidOperation:
+        return None, currency
+
+
+def parse_count(text):
+    """
+    "1.234 Değerlendirme", "(1,234)" veya "1.2K sold" gibi metinlerdeki adedi
+    tamsayıya çevirir; K/M kısaltmaları bin/milyon olarak açılır. Metinde
+    parantez içinde sayı varsa ("4.5 (120)") adet odur. Yoksa None.
+    """
+    if text is None:
+        return None
+    if isinstance(text, int):
+        return text
+    text = str(text)
+    paren = _PAREN_COUNT_RE.search(text)
+    if paren:
+        text = paren.group(1)
+    match = _SUFFIXED_COUNT_RE.search(text)
+    if match:
+        return round(float(match.group(1).replace(",", ".")) * _COUNT_MULTIPLIERS[match.group(2).lower()])
+    digits = _NON_DIGIT_RE.sub("", text)
+    return int(digits) if digits else None
+
+
+def parse_rating(text):
+    """"4.5", "4,5" veya "4,5 / 5" gibi puan metnini float'a çevirir; yoksa None."""
+    if text is None:
+        return None
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = _RATING_RE.search(str(text))
+    return float(match.group(0).replace(",", ".")) if match else None
+
+
+def parse_ebay_prices(text):
+    """
+    eBay kart metnindeki USD fiyatlarını sırayla (Decimal) döndürür: ilki
+    güncel fiyat, ikincisi (varsa) indirim öncesi fiyattır.
+    """
+    return [parse_price(number, "USD")[0] for number in _USD_PRICE_RE.findall(text or "")]
+
+
+def parse_ebay_card(text):
+    """eBay kart metninden (güncel fiyat Decimal, satış adedi) çifti; bulunamayanlar None."""
+    text = text or ""
+    match = _USD_PRICE_RE.search(text)
+    price = parse_price(match.group(1), "USD")[0] if match else None
+    sold = _SOLD_RE.search(text)
+    return price, parse_count(sold.group(1)) if sold else None
@@ -0,0 +1,126 @@
+"""
+Sabit time.sleep beklemelerinin yerine kullanılan sayfa hazır olma modülü.
+
+Beklenen elementler tarayıcı içinde bir MutationObserver ile izlenir ve
+execute_async_script, elementler DOM'a eklendiği anda döner. WebDriverWait'in
+500 ms'lik yoklama döngüsü yoktur; sayfa yalnızca gerektiği kadar beklenir.
+Her beklemenin gerçek süresi `stats` üzerinde etiketiyle kaydedilir.
+"""
+
+import time
+import logging
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+# Seçiciler "/" veya "(" ile başlıyorsa XPath, aksi halde CSS seçici kabul edilir.
+_WAIT_SCRIPT = """
+var selectors = arguments[0];
+var mode = arguments[1];
+var timeoutMs = arguments[2];
+var requireVisible = arguments[3];
+var done = arguments[arguments.length - 1];
+
+function find(sel) {
+    var el;
+    if (sel.charAt(0) === '/' || sel.charAt(0) === '(') {
+        el = document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else {
+        el = document.querySelector(sel);
+    }
+    if (el && requireVisible) {
+        var rect = el.getBoundingClientRect();
+        if (rect.width === 0 && rect.height === 0) { return false; }
+    }
+    return !!el;
+}
+
+function check() {
+    var found = selectors.map(find);
+    var ok = mode === 'all' ? found.every(Boolean) : found.some(Boolean);
+    return {ok: ok, found: found};
+}
+
+new Promise(function (resolve) {
+    var first = check();
+    if (first.ok) { resolve(first); return; }
+    var pending = false;
+    var observer = new MutationObserver(function () {
+        if (pending) { return; }
+        pending = true;
+        Promise.resolve().then(function () {
+            pending = false;
+            var result = check();
+            if (result.ok) { finish(result); }
+        });
+    });
+    var timer = setTimeout(function () { finish(check()); }, timeoutMs);
+    function finish(result) {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(result);
+    }
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+}).then(done);
+"""
+
+
+class WaitStats:
+    """Etiket bazında bekleme sürelerini toplar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._timeouts = {}
+
+    def record(self, label, seconds, ok):
+        with self._lock:
+            self._durations.setdefault(label, []).append(seconds)
+            if not ok:
+                self._timeouts[label] = self._timeouts.get(label, 0) + 1
+
+    def summary(self):
+        """Her etiket için adet, toplam, ortalama, en uzun süre ve zaman aşımı sayısını döndürür."""
+        with self._lock:
+            result = {}
+            for label, durations in self._durations.items():
+                result[label] = {
+                    "count": len(durations),
+                    "total": round(sum(durations), 3),
+                    "avg": round(sum(durations) / len(durations), 3),
+                    "max": round(max(durations), 3),
+                    "timeouts": self._timeouts.get(label, 0),
+                }
+            return result
+
+    def log_summary(self, log=logging.info):
+        """Özeti satır satır yazar; logging kullanmayan scriptler log=print verebilir."""
+        for label, item in sorted(self.summary().items()):
+            log("Bekleme [%s]: %d kez, toplam %.2f sn, ortalama %.2f sn, en uzun %.2f sn, zaman aşımı %d" % (
+                label, item["count"], item["total"], item["avg"], item["max"], item["timeouts"]))
+
+
+# Tüm scraper'ların paylaştığı varsayılan istatistik nesnesi
+stats = WaitStats()
+
+
+def wait_for(driver, selectors, timeout=10, mode="any", visible=False, label=None):
+    """
+    Verilen seçicilerden biri (mode="any") ya da hepsi (mode="all") sayfada
+    belirene kadar bekler. Koşul sağlanırsa True, zaman aşımında False döner.
+    Sayfa bekleme sırasında değişirse (ör. yönlendirme) False döner.
+    """
+    if isinstance(selectors, str):
+        selectors = [selectors]
+    label = label or selectors[0]
+    started = time.monotonic()
+    ok = False
+    try:
+        driver.set_script_timeout(timeout + 2)
+        result = driver.execute_async_script(_WAIT_SCRIPT, list(selectors), mode, int(timeout * 1000), visible)
+        ok = bool(result and result.get("ok"))
+    except WebDriverException as e:
+        logging.info("Sayfa hazır beklemesi yarıda kaldı (%s): %s", label, e)
+    finally:
+        stats.record(label, time.monotonic() - started, ok)
+    return ok
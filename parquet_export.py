@@ -0,0 +1,158 @@
+"""
+Taranmış ürün kataloglarını tipli, sütunlu Parquet veri setine aktarır.
+
+Trendyol_Products/, "Trendyol Product/" ve ebay_data/ altındaki product.json,
+products*.json ve record_sink JSONL dosyaları catalog_sources ile taranır;
+her ürün ortak bir şemaya (ad, decimal fiyat, değerlendirme sayısı, puan,
+kategori yolu, URL, görsel referansları, tarama zamanı) dönüştürülür ve
+pazar yeri ile tarama tarihine göre Hive düzeninde bölümlenmiş Parquet
+dosyalarına yazılır:
+
+    catalog_parquet/marketplace=trendyol/crawl_date=2025-01-31/part-...parquet
+
+Sütun seçimi ve filtreler bölüm/satır grubu istatistikleriyle dosya okunmadan
+elenir, örneğin:
+
+    import pyarrow.dataset as ds
+    dataset = ds.dataset("catalog_parquet", format="parquet", partitioning="hive")
+    table = dataset.to_table(columns=["name", "price", "category"],
+                             filter=(ds.field("marketplace") == "trendyol") & (ds.field("price") < 500))
+
+Kullanım:
+    python parquet_export.py --out catalog_parquet trendyol=Trendyol_Products ebay=ebay_data
+"""
+
+import os
+import time
+import logging
+import argparse
+import datetime
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+import crawl_journal
+import record_sink
+import catalog_sources
+
+DEFAULT_OUTPUT_DIR = "catalog_parquet"
+
+PRICE_TYPE = pa.decimal128(14, 2)
+
+SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("price", PRICE_TYPE),
+    ("currency", pa.string()),
+    ("review_count", pa.int64()),
+    ("rating", pa.float32()),
+    ("sold_count", pa.int64()),
+    ("category", pa.string()),
+    ("url", pa.string()),
+    ("image_refs", pa.list_(pa.string())),
+    ("crawled_at", pa.timestamp("s", tz="UTC")),
+    ("source_file", pa.string()),
+    ("marketplace", pa.string()),
+    ("crawl_date", pa.date32()),
+])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("marketplace", pa.string()), ("crawl_date", pa.date32())]), flavor="hive")
+
+
+# =====================
+# Kaynak dosyaları tarama
+# =====================
+def _load_crawl_times(root):
+    """Kök altındaki tarama günlüklerinden kanonik URL -> tamamlanma zamanı eşlemesi."""
+    times = {}
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in catalog_sources.SKIP_DIRS]
+        if crawl_journal.DEFAULT_JOURNAL_NAME not in files:
+            continue
+        for record in record_sink.iter_records(os.path.join(folder, crawl_journal.DEFAULT_JOURNAL_NAME)):
+            if record.get("status") == crawl_journal.STATUS_DONE and record.get("key"):
+                times[record["key"]] = record.get("ts")
+    return times
+
+
+def iter_rows(sources):
+    """(pazar_yeri, kök) kaynaklarından şemaya uygun satırlar üretir; aynı ürün bir kez yazılır."""
+    seen = set()
+    for marketplace, root in sources:
+        if not os.path.isdir(root):
+            logging.info("Kaynak klasör yok, atlanıyor: %s", root)
+            continue
+        normalize = catalog_sources.NORMALIZERS[marketplace]
+        crawl_times = _load_crawl_times(root)
+        count = 0
+        for record, category_dir, source_file, mtime in catalog_sources.iter_source_records(root):
+            row = normalize(record)
+            if not row["name"]:
+                continue
+            row["category"] = catalog_sources.category_for(root, category_dir, record)
+            if row["url"]:
+                key = (marketplace, crawl_journal.canonical_url(row["url"]))
+            else:
+                key = (marketplace, row["category"], row["name"])
+            if key in seen:
+                continue
+            seen.add(key)
+            # Kayda yazılırken işlenen zaman; eski kayıtlarda tarama günlüğü,
+            # o da yoksa son çare olarak dosya zamanı
+            crawled_ts = record.get(record_sink.CRAWLED_AT_KEY)
+            if not crawled_ts and row["url"]:
+                crawled_ts = crawl_times.get(crawl_journal.canonical_url(row["url"]))
+            crawled_ts = crawled_ts or mtime
+            crawled_at = datetime.datetime.fromtimestamp(crawled_ts, tz=datetime.timezone.utc)
+            row.update({
+                "crawled_at": crawled_at,
+                "source_file": os.path.relpath(source_file, root),
+                "marketplace": marketplace,
+                "crawl_date": crawled_at.date(),
+            })
+            count += 1
+            yield row
+        logging.info("%s (%s): %d ürün okundu.", root, marketplace, count)
+
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield pa.RecordBatch.from_pylist(batch, schema=SCHEMA)
+            batch = []
+    if batch:
+        yield pa.RecordBatch.from_pylist(batch, schema=SCHEMA)
+
+
+def export(sources=catalog_sources.DEFAULT_SOURCES, output_dir=DEFAULT_OUTPUT_DIR, batch_size=50000,
+           row_group_size=128 * 1024):
+    """
+    Kaynakları tek geçişte okuyup bölümlenmiş Parquet veri setine yazar.
+    Satırlar batch_size'lık parçalar halinde akar; tüm katalog belleğe alınmaz.
+    Her çalışma kendi dosya adlarıyla yazar, önceki dışa aktarımlar silinmez.
+    """
+    run_id = time.strftime("%Y%m%d-%H%M%S")
+    ds.write_dataset(
+        _batches(iter_rows(sources), batch_size),
+        output_dir,
+        schema=SCHEMA,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"part-{run_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, batch_size),
+    )
+    logging.info("Parquet veri seti yazıldı: %s", output_dir)
+    return output_dir
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description="Ürün kataloglarını Parquet'e aktarır")
+    parser.add_argument("sources", nargs="*", help="pazar_yeri=klasör (ör. ebay=ebay_data)")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT_DIR, help="Parquet veri seti klasörü")
+    args = parser.parse_args()
+    export(catalog_sources.parse_sources(args.sources) or catalog_sources.DEFAULT_SOURCES, args.out)
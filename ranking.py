@@ -0,0 +1,320 @@
+"""
+Taranmış tüm katalog üzerinde "potansiyel ürün" sıralaması.
+
+PC_Trendyol'daki tek eşik (200'den fazla değerlendirme -> klasör adına
+" (potential)") yerine her ürüne değerlendirme sayısı, puan, fiyat bandı,
+listeleme sırası ve eBay satış adedinden ayarlanabilir ağırlıklarla bir skor
+verilir ve her kategori için en iyi k ürün bir min-heap'te tutulur.
+
+Durum (kategori heap'leri, okunan JSONL offset'leri ve dosya zamanları)
+ranking_state.json'a kaydedilir. Sonraki güncellemelerde record_sink JSONL
+dosyalarının yalnızca yeni eklenen satırları, product.json/products*.json
+dosyalarından da yalnızca değişenler okunur; kısa liste tüm klasörler
+yeniden taranmadan okunur:
+
+    python ranking.py --k 20
+    python ranking.py --category trendyol/Kozmetik --weights reviews=0.5,sold=0.3
+
+Ağırlığı olmayan ya da üründe bulunmayan bileşenler (ör. eBay'de puan)
+skora katılmaz; skor mevcut bileşenlerin ağırlıklı ortalamasıdır (0-1).
+"""
+
+import os
+import json
+import math
+import heapq
+import logging
+import argparse
+
+import crawl_journal
+import record_sink
+import catalog_sources
+from normalize import parse_count
+
+DEFAULT_STATE_NAME = "ranking_state.json"
+DEFAULT_K = 20
+
+DEFAULT_WEIGHTS = {
+    "reviews": 0.35,
+    "rating": 0.2,
+    "price_band": 0.15,
+    "position": 0.1,
+    "sold": 0.2,
+}
+
+# Para birimine göre "satılabilir" fiyat aralığı; dışında kalan fiyatlar orantılı ceza alır
+DEFAULT_PRICE_BANDS = {"TRY": (150, 1500), "USD": (10, 150)}
+
+
+# =====================
+# Skor
+# =====================
+class ScoreConfig:
+    def __init__(self, weights=None, price_bands=None, review_scale=5000, sold_scale=1000,
+                 position_scale=200, rating_confidence=20):
+        """
+        :param weights: Bileşen -> ağırlık (verilmeyenler DEFAULT_WEIGHTS'ten alınır).
+        :param price_bands: Para birimi -> (alt, üst) fiyat bandı.
+        :param review_scale: Bu kadar değerlendirme tam puan sayılır (logaritmik).
+        :param sold_scale: Bu kadar satış tam puan sayılır (logaritmik).
+        :param position_scale: Listeleme sırasında bu sıradan sonrası 0 puan alır.
+        :param rating_confidence: Puan bileşeni bu kadar değerlendirmeye kadar orantılı kısılır.
+        """
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+        self.price_bands = dict(DEFAULT_PRICE_BANDS)
+        self.price_bands.update(price_bands or {})
+        self.review_scale = review_scale
+        self.sold_scale = sold_scale
+        self.position_scale = position_scale
+        self.rating_confidence = rating_confidence
+
+    def components(self, product):
+        """Ürünün mevcut alanlarından 0-1 arası skor bileşenlerini hesaplar."""
+        parts = {}
+        reviews = product.get("review_count")
+        if reviews is not None:
+            parts["reviews"] = min(1.0, math.log1p(reviews) / math.log1p(self.review_scale))
+        rating = product.get("rating")
+        if rating is not None:
+            # Tek değerlendirmeli 5 puanlık ürün, binlerce değerlendirmeli 4.7'yi geçmesin
+            confidence = min(1.0, (reviews or 0) / self.rating_confidence) if self.rating_confidence else 1.0
+            parts["rating"] = min(1.0, rating / 5.0) * confidence
+        price = product.get("price")
+        band = self.price_bands.get(product.get("currency"))
+        if price and band:
+            low, high = band
+            parts["price_band"] = price / low if price < low else (high / price if price > high else 1.0)
+        position = product.get("position")
+        if position:
+            parts["position"] = max(0.0, 1.0 - (position - 1) / self.position_scale)
+        sold = product.get("sold_count")
+        if sold is not None:
+            parts["sold"] = min(1.0, math.log1p(sold) / math.log1p(self.sold_scale))
+        return parts
+
+    def score(self, product):
+        parts = self.components(product)
+        total_weight = sum(self.weights.get(name, 0) for name in parts)
+        if not total_weight:
+            return 0.0, parts
+        score = sum(self.weights.get(name, 0) * value for name, value in parts.items()) / total_weight
+        return round(score, 6), parts
+
+
+# =====================
+# Kategori başına top-k
+# =====================
+class TopK:
+    """
+    Sabit boyutlu min-heap: kökte listenin en zayıf ürünü durur, yeni ürün ancak
+    ondan iyiyse girer. Listede olan bir ürün yeniden gelirse skoru güncellenir.
+    Listeden düşen ürünler saklanmaz; skoru düşen bir ürünün yerine, daha önce
+    elenmiş bir ürün geri gelmez (akış halinde yaklaşık sonuç).
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def push(self, key, score, entry):
+        """Ürünü listeye ekler/günceller; listeye girdiyse True döndürür."""
+        if key in self._entries:
+            self._entries[key] = (score, entry)
+            self._heap = [(item_score, item_key) if item_key != key else (score, key)
+                          for item_score, item_key in self._heap]
+            heapq.heapify(self._heap)
+            return True
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (score, key))
+        elif score > self._heap[0][0]:
+            _, evicted = heapq.heapreplace(self._heap, (score, key))
+            del self._entries[evicted]
+        else:
+            return False
+        self._entries[key] = (score, entry)
+        return True
+
+    def items(self):
+        """En yüksek skordan düşüğe (skor, kayıt) listesi."""
+        return sorted(self._entries.values(), key=lambda item: item[0], reverse=True)
+
+    def to_list(self):
+        return [dict(entry, key=key, score=score) for key, (score, entry) in self._entries.items()]
+
+    @classmethod
+    def from_list(cls, k, entries):
+        top = cls(k)
+        for entry in entries:
+            entry = dict(entry)
+            key = entry.pop("key")
+            top.push(key, entry.pop("score"), entry)
+        return top
+
+
+# =====================
+# Kayıt dönüştürme
+# =====================
+def product_fields(record, marketplace):
+    """Kaydı catalog_sources ile ortak alanlara çevirir; skor için fiyat float, listeleme sırası eklenir."""
+    fields = catalog_sources.NORMALIZERS[marketplace](record)
+    fields.pop("image_refs", None)
+    fields["price"] = float(fields["price"]) if fields["price"] is not None else None
+    fields["position"] = parse_count(record.get("position"))
+    return fields
+
+
+# =====================
+# Sıralama motoru
+# =====================
+class RankingEngine:
+    def __init__(self, sources=catalog_sources.DEFAULT_SOURCES, k=DEFAULT_K, config=None,
+                 state_path=DEFAULT_STATE_NAME):
+        """
+        :param sources: (pazar_yeri, kök klasör) listesi.
+        :param k: Kategori başına tutulacak ürün sayısı.
+        :param config: ScoreConfig; verilmezse varsayılan ağırlıklar.
+        :param state_path: Heap'lerin ve okuma konumlarının saklandığı JSON dosyası.
+        """
+        self.sources = list(sources)
+        self.k = k
+        self.config = config or ScoreConfig()
+        self.state_path = state_path
+        self.categories = {}
+        # Dosya yolu -> okunmuş bayt (JSONL) veya son okunan değişiklik zamanı (JSON)
+        self.offsets = {}
+        self.mtimes = {}
+        self._load_state()
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.info("Sıralama durumu okunamadı, baştan oluşturulacak (%s): %s", self.state_path, e)
+            return
+        if state.get("k") != self.k or state.get("weights") != self.config.weights:
+            # Farklı k/ağırlıklarla saklanmış skorlar geçersiz; katalog baştan okunur
+            logging.info("Sıralama ayarları değişmiş, katalog baştan okunacak.")
+            return
+        self.categories = {category: TopK.from_list(self.k, entries)
+                           for category, entries in state.get("categories", {}).items()}
+        self.offsets = state.get("offsets", {})
+        self.mtimes = state.get("mtimes", {})
+
+    def save(self):
+        state = {
+            "k": self.k,
+            "weights": self.config.weights,
+            "categories": {category: top.to_list() for category, top in self.categories.items()},
+            "offsets": self.offsets,
+            "mtimes": self.mtimes,
+        }
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def add(self, record, marketplace, category=""):
+        """
+        Tek bir ürün kaydını skorlayıp kategorisinin heap'ine sunar; tarayıcılar
+        yeni ürünleri doğrudan buradan da besleyebilir. Listeye girdiyse True.
+        """
+        fields = product_fields(record, marketplace)
+        if not fields["name"]:
+            return False
+        score, parts = self.config.score(fields)
+        if fields["url"]:
+            key = crawl_journal.canonical_url(fields["url"])
+        else:
+            key = f"{category}/{fields['name']}"
+        fields["category"] = category
+        fields["components"] = {name: round(value, 4) for name, value in parts.items()}
+        category_key = f"{marketplace}/{category}" if category else marketplace
+        top = self.categories.get(category_key)
+        if top is None:
+            top = self.categories[category_key] = TopK(self.k)
+        return top.push(key, score, fields)
+
+    # =====================
+    # Katalog tarama
+    # =====================
+    def _read_jsonl(self, marketplace, root, folder, path):
+        records, offset = record_sink.read_new(path, self.offsets.get(path, 0))
+        self.offsets[path] = offset
+        for record in records:
+            category_dir = catalog_sources.jsonl_category_dir(record, folder)
+            self.add(record, marketplace, catalog_sources.category_for(root, category_dir, record))
+        return len(records)
+
+    def _read_json(self, marketplace, root, folder, path, file_name):
+        mtime = os.path.getmtime(path)
+        if self.mtimes.get(path) == mtime:
+            return 0
+        self.mtimes[path] = mtime
+        records, category_dir = catalog_sources.json_records(catalog_sources.read_json(path), folder, file_name)
+        for record in records:
+            self.add(record, marketplace, catalog_sources.category_for(root, category_dir, record))
+        return len(records)
+
+    def update(self):
+        """Kaynaklardaki yeni/değişen kayıtları okuyup heap'leri günceller; okunan kayıt sayısını döndürür."""
+        total = 0
+        for marketplace, root in self.sources:
+            if not os.path.isdir(root):
+                continue
+            for folder, file_name, path in catalog_sources.iter_source_files(root):
+                if file_name.endswith(".jsonl"):
+                    total += self._read_jsonl(marketplace, root, folder, path)
+                else:
+                    total += self._read_json(marketplace, root, folder, path, file_name)
+        logging.info("Sıralama güncellendi: %d yeni/değişen kayıt, %d kategori.", total, len(self.categories))
+        return total
+
+    def shortlist(self, category=None, k=None):
+        """
+        Kategorinin (ör. "trendyol/Kozmetik") en iyi ürünlerini skor sırasıyla
+        döndürür. category verilmezse tüm kategorilerin listeleri birleştirilir.
+        """
+        if category is not None:
+            top = self.categories.get(category)
+            items = top.items() if top else []
+        else:
+            items = sorted((item for top in self.categories.values() for item in top.items()),
+                           key=lambda item: item[0], reverse=True)
+        return [dict(entry, score=score) for score, entry in items[:k or self.k]]
+
+
+def _parse_weights(value):
+    weights = {}
+    for part in filter(None, (value or "").split(",")):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_WEIGHTS:
+            raise SystemExit(f"Bilinmeyen ağırlık: {name} ({', '.join(DEFAULT_WEIGHTS)})")
+        weights[name] = float(weight)
+    return weights
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description="Katalog genelinde potansiyel ürün sıralaması")
+    parser.add_argument("sources", nargs="*", help="pazar_yeri=klasör (ör. ebay=ebay_data)")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Kategori başına ürün sayısı")
+    parser.add_argument("--category", help="Yalnızca bu kategori (ör. trendyol/Kozmetik)")
+    parser.add_argument("--weights", help="Ağırlıklar, ör. reviews=0.5,sold=0.3,position=0")
+    parser.add_argument("--state", default=DEFAULT_STATE_NAME, help="Durum dosyası")
+    args = parser.parse_args()
+
+    engine = RankingEngine(catalog_sources.parse_sources(args.sources) or catalog_sources.DEFAULT_SOURCES,
+                           k=args.k, config=ScoreConfig(weights=_parse_weights(args.weights)), state_path=args.state)
+    engine.update()
+    engine.save()
+    for rank, product in enumerate(engine.shortlist(args.category), start=1):
+        logging.info("%2d. %.3f  [%s] %s  %s", rank, product["score"], product["category"] or "-",
+                     product["name"], product["url"] or "")
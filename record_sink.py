@@ -0,0 +1,242 @@
+"""
+Ürün kayıtları için yalnızca-ekleme (append-only) JSONL çıktı hedefi.
+
+Her ürün için ayrı product.json ya da sayfa sonunda toplu products_<ts>.json
+yazmak yerine kayıtlar tek bir JSONL dosyasına, kompakt biçimde, satır satır
+eklenir. Yazma arka plandaki bir iş parçacığında yapılır (write-behind);
+çağıran taraf diske yazmayı beklemez. Dosya her fsync_every kayıtta ya da
+fsync_interval saniyede bir fsync edilir, böylece süreç yarıda kalsa bile o
+ana kadar toplanan ürünler kaybolmaz.
+
+Eski klasör düzenine ihtiyaç duyulursa kayda isteğe bağlı bir hedef verilir:
+folder (ürün klasörü; içine product.json yazılır) veya group (aynı dosyada
+liste olarak toplanacak kayıtlar, ör. products_<ts>.json). Bu bilgiler kayıtta
+"_folder" / "_group" anahtarlarında tutulur ve expand() ile JSONL eski düzene
+açılır. Her kayda yazıldığı an "_crawled_at" (Unix zamanı) olarak işlenir;
+dosya yalnızca eklendiği için dosya zamanı kaydın tarama zamanını vermez.
+
+    python record_sink.py expand "Trendyol Product/products.jsonl"
+"""
+
+import os
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+
+DEFAULT_SINK_NAME = "products.jsonl"
+
+FOLDER_KEY = "_folder"
+GROUP_KEY = "_group"
+CRAWLED_AT_KEY = "_crawled_at"
+
+# Kuyruğu kapatmak için iş parçacığına gönderilen işaret
+_STOP = object()
+
+
+class RecordSink:
+    def __init__(self, path, fsync_every=50, fsync_interval=2.0, max_pending=10000):
+        """
+        :param path: JSONL çıktı dosyasının yolu (yoksa oluşturulur, varsa sonuna eklenir).
+        :param fsync_every: Bu kadar kayıt yazılınca diske fsync edilir.
+        :param fsync_interval: İlk fsync edilmemiş kayıttan bu kadar saniye sonra fsync edilir.
+        :param max_pending: Yazılmayı bekleyen en fazla kayıt; dolarsa write() bekler.
+        """
+        self.path = str(path)
+        self.base_dir = os.path.dirname(os.path.abspath(self.path))
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._needs_newline():
+            # Önceki çalışmadan yarım kalmış son satırın üzerine yazmamak için
+            self._file.write("\n")
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="record-sink", daemon=True)
+        self._thread.start()
+
+    def _needs_newline(self):
+        if not os.path.getsize(self.path):
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _relative(self, folder):
+        folder = os.path.abspath(str(folder))
+        if os.path.commonpath([folder, self.base_dir]) == self.base_dir:
+            return os.path.relpath(folder, self.base_dir)
+        return folder
+
+    def write(self, record, folder=None, group=None):
+        """
+        Kaydı yazma kuyruğuna ekler ve hemen döner. folder/group yalnızca
+        expand() ile eski düzene açarken kullanılır. Kayıtta "_crawled_at" yoksa
+        yazma zamanı eklenir.
+        """
+        if self._closed:
+            raise ValueError("Kapatılmış kayıt hedefine yazılamaz.")
+        self._raise_error()
+        record = dict(record)
+        record.setdefault(CRAWLED_AT_KEY, time.time())
+        if folder is not None:
+            record[FOLDER_KEY] = self._relative(folder)
+        if group is not None:
+            record[GROUP_KEY] = str(group)
+        # Kayıt çağıranın iş parçacığında serileştirilir; sonradan değişen sözlükler etkilenmez.
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        self._queue.put(line + "\n")
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"Kayıt hedefine yazılamadı: {self._error}") from self._error
+
+    def _run(self):
+        unsynced = 0
+        first_unsynced_at = None
+        while True:
+            timeout = None
+            if unsynced:
+                timeout = max(0.0, first_unsynced_at + self.fsync_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            try:
+                if isinstance(item, str):
+                    self._file.write(item)
+                    self.written += 1
+                    unsynced += 1
+                    if first_unsynced_at is None:
+                        first_unsynced_at = time.monotonic()
+                # Zaman aşımı, flush/kapatma isteği veya eşik dolduysa diske fsync
+                if unsynced and (not isinstance(item, str) or unsynced >= self.fsync_every
+                                 or time.monotonic() - first_unsynced_at >= self.fsync_interval):
+                    self._sync()
+                    unsynced = 0
+                    first_unsynced_at = None
+            except OSError as e:
+                logging.error("Kayıt hedefine yazılamadı (%s): %s", self.path, e)
+                self._error = e
+            finally:
+                if item is not None:
+                    self._queue.task_done()
+            if isinstance(item, threading.Event):
+                # flush() isteği: o ana kadar kuyruğa girmiş her şey yazıldı ve fsync edildi
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def flush(self):
+        """Kuyruktaki tüm kayıtlar yazılıp fsync edilene kadar bekler."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_error()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+        logging.info("Kayıt hedefi kapatıldı: %d kayıt yazıldı (%s).", self.written, self.path)
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_records(path):
+    """JSONL dosyasındaki kayıtları sırayla döndürür; bozuk/yarım satırlar atlanır."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logging.info("Bozuk kayıt satırı atlandı: %s:%d", path, line_no)
+
+
+def read_new(path, offset=0):
+    """
+    JSONL dosyasının offset baytından sonraki tamamlanmış satırlarını okur ve
+    (kayıtlar, yeni offset) döndürür. Yazılmakta olan yarım son satır bir
+    sonraki okumaya bırakılır; dosya küçülmüşse baştan okunur.
+    """
+    if os.path.getsize(path) < offset:
+        offset = 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:end].splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line.decode("utf-8")))
+        except ValueError:
+            logging.info("Bozuk kayıt satırı atlandı: %s", path)
+    return records, offset + end
+
+
+def expand(path, root=None, indent=4, group_indent=2):
+    """
+    JSONL kayıtlarını eski düzene açar: "_folder" içeren kayıtlar o klasöre
+    product.json olarak, "_group" içerenler aynı adlı dosyaya liste olarak
+    yazılır. Göreli yollar root'a (varsayılan: JSONL dosyasının klasörü) göre
+    çözülür. Yazılan dosya sayısını döndürür.
+    """
+    root = root or os.path.dirname(os.path.abspath(path))
+    groups = {}
+    written = 0
+    for record in iter_records(path):
+        folder = record.pop(FOLDER_KEY, None)
+        group = record.pop(GROUP_KEY, None)
+        if folder is not None:
+            folder = os.path.join(root, folder)
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, "product.json"), "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False, indent=indent)
+            written += 1
+        if group is not None:
+            groups.setdefault(group, []).append(record)
+    for group, records in groups.items():
+        group_path = os.path.join(root, group)
+        os.makedirs(os.path.dirname(group_path) or root, exist_ok=True)
+        with open(group_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=group_indent)
+        written += 1
+    return written
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description="JSONL ürün kayıtları aracı")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    expand_parser = subparsers.add_parser("expand", help="JSONL'i eski klasör/dosya düzenine açar")
+    expand_parser.add_argument("path", help="JSONL dosyası")
+    expand_parser.add_argument("--root", help="Çıktı kök klasörü (varsayılan: JSONL'in klasörü)")
+    args = parser.parse_args()
+    if args.command == "expand":
+        count = expand(args.path, args.root)
+        logging.info("%d dosya yazıldı.", count)
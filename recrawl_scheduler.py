@@ -0,0 +1,258 @@
+"""
+Fiyat takibi için süreli (TTL) ve oynaklığa göre yeniden tarama zamanlayıcısı.
+
+Her ürün URL'si için son görülen fiyat ve değerlendirme sayısı saklanır. Her
+gözlemde değerlerin değişip değişmediğine bakılır ve ürünün günlük değişim
+oranı (yarı ömrü olan, üstel azalan sayaçlarla) tahmin edilir. Oranına göre
+ürün bir öncelik kovasına girer; her kovanın kendi TTL'i vardır:
+
+    hot   (2 günde >= 1 değişim)   6 saat
+    warm  (haftada >= 1 değişim)   1 gün
+    cool  (ayda >= 1 değişim)      7 gün
+    cold  (daha seyrek)            30 gün
+
+plan() yalnızca TTL'i dolmuş (ya da hiç görülmemiş) ürünleri seçer; önce yeni
+ürünler, sonra oynak kovalar gelir ve liste günlük tarayıcı dakikası
+bütçesine sığacak kadar kesilir. Böylece bütçe her ürüne eşit dağılmaz,
+sık değişenlere gider.
+
+Durum özeti:
+    python recrawl_scheduler.py Trendyol_Products/Deri/recrawl_schedule.json
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import datetime
+
+import crawl_journal
+from normalize import parse_price, parse_count
+
+DEFAULT_SCHEDULE_NAME = "recrawl_schedule.json"
+
+# (kova, günlük en az değişim oranı, TTL saniye); oranı karşılayan ilk kova seçilir
+DEFAULT_BUCKETS = [
+    ("hot", 0.5, 6 * 3600),
+    ("warm", 1.0 / 7, 24 * 3600),
+    ("cool", 1.0 / 30, 7 * 24 * 3600),
+    ("cold", 0.0, 30 * 24 * 3600),
+]
+NEW_BUCKET = "new"
+
+# Geçmişi olmayan ürün haftada bir değişiyormuş gibi başlar (warm)
+PRIOR_CHANGES = 0.5
+PRIOR_DAYS = 3.5
+# Eski gözlemlerin ağırlığı bu kadar günde yarıya iner
+HALF_LIFE_DAYS = 30
+# Bu orandan küçük fiyat farkları (yuvarlama, kur) değişim sayılmaz
+PRICE_TOLERANCE = 0.005
+
+
+class RecrawlScheduler:
+    def __init__(self, path=DEFAULT_SCHEDULE_NAME, daily_budget_minutes=None, buckets=DEFAULT_BUCKETS,
+                 default_cost=30.0, save_every=10):
+        """
+        :param path: Durumun saklandığı JSON dosyası (yoksa oluşturulur).
+        :param daily_budget_minutes: Günlük tarayıcı dakikası; None ise sınırsız.
+        :param buckets: (kova, en az günlük değişim, TTL saniye) listesi, oranı büyükten küçüğe.
+        :param default_cost: Ölçüm yokken ürün başına tahmini süre (saniye).
+        :param save_every: Bu kadar gözlemde bir durum diske yazılır.
+        """
+        self.path = str(path)
+        self.daily_budget_minutes = daily_budget_minutes
+        self.buckets = list(buckets)
+        self._ttls = {name: ttl for name, _, ttl in self.buckets}
+        self._ranks = {name: rank for rank, (name, _, _) in enumerate(self.buckets, start=1)}
+        self._ranks[NEW_BUCKET] = 0
+        self.save_every = save_every
+        self.products = {}
+        self.avg_cost = default_cost
+        self.spent = 0.0
+        self.spent_date = self._today()
+        self._unsaved = 0
+        self._load()
+
+    def _today(self):
+        return datetime.date.today().isoformat()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.info("Zamanlayıcı durumu okunamadı, boş başlanıyor (%s): %s", self.path, e)
+            return
+        self.products = state.get("products", {})
+        self.avg_cost = state.get("avg_cost", self.avg_cost)
+        if state.get("spent_date") == self.spent_date:
+            self.spent = state.get("spent", 0.0)
+
+    def save(self):
+        state = {
+            "products": self.products,
+            "avg_cost": round(self.avg_cost, 3),
+            "spent_date": self.spent_date,
+            "spent": round(self.spent, 3),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def close(self):
+        self.save()
+        logging.info("Zamanlayıcı: %s, bugün %.1f/%s dk harcandı.", self.summary(), self.spent / 60,
+                     self.daily_budget_minutes if self.daily_budget_minutes is not None else "-")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # =====================
+    # Gözlemler
+    # =====================
+    def _bucket_for(self, rate):
+        for name, min_rate, _ in self.buckets:
+            if rate >= min_rate:
+                return name
+        return self.buckets[-1][0]
+
+    def _changed(self, entry, price, reviews):
+        old_price = entry.get("price")
+        if price is not None and old_price is not None:
+            if abs(price - old_price) > PRICE_TOLERANCE * max(abs(old_price), 1e-9):
+                return True
+        old_reviews = entry.get("reviews")
+        return reviews is not None and old_reviews is not None and reviews != old_reviews
+
+    def observe(self, url, price=None, reviews=None, ts=None):
+        """
+        Ürünün yeni tarandığını ve görülen değerlerini kaydeder; ürünün yeni
+        kovasını döndürür. price float, reviews int (ya da None) olmalıdır.
+        """
+        ts = ts or time.time()
+        key = crawl_journal.canonical_url(url)
+        entry = self.products.get(key)
+        if entry is None:
+            entry = self.products[key] = {"url": url, "changes": 0.0, "days": 0.0, "observations": 0}
+        else:
+            days = max(0.0, (ts - entry["last_seen"]) / 86400)
+            decay = 0.5 ** (days / HALF_LIFE_DAYS)
+            entry["changes"] = entry["changes"] * decay + (1 if self._changed(entry, price, reviews) else 0)
+            entry["days"] = entry["days"] * decay + days
+        rate = (entry["changes"] + PRIOR_CHANGES) / (entry["days"] + PRIOR_DAYS)
+        bucket = self._bucket_for(rate)
+        if price is not None:
+            entry["price"] = price
+        if reviews is not None:
+            entry["reviews"] = reviews
+        entry.update({
+            "rate": round(rate, 4),
+            "bucket": bucket,
+            "last_seen": ts,
+            "next_due": ts + self._ttls[bucket],
+            "observations": entry["observations"] + 1,
+        })
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+        return bucket
+
+    def observe_record(self, record, url=None, default_currency="TRY"):
+        """Ürün kaydındaki (PC_Trendyol/TrendyolScraper alanları) fiyat ve değerlendirme sayısını gözlemler."""
+        url = url or record.get("ProductLink") or record.get("url")
+        if not url:
+            return None
+        price, _ = parse_price(record.get("price") or record.get("price_info"), default_currency)
+        reviews = parse_count(record.get("review") or record.get("rating_info"))
+        return self.observe(url, float(price) if price is not None else None, reviews)
+
+    # =====================
+    # Bütçe ve planlama
+    # =====================
+    def _roll_budget(self):
+        today = self._today()
+        if today != self.spent_date:
+            self.spent_date = today
+            self.spent = 0.0
+
+    def record_cost(self, seconds):
+        """Bir ürünün taranmasında harcanan süreyi bütçeden düşer ve ortalama maliyeti günceller."""
+        self._roll_budget()
+        self.spent += seconds
+        self.avg_cost = 0.8 * self.avg_cost + 0.2 * seconds
+
+    def budget_left(self):
+        """Bugün kalan tarayıcı süresi (saniye); bütçe yoksa None."""
+        if self.daily_budget_minutes is None:
+            return None
+        self._roll_budget()
+        return max(0.0, self.daily_budget_minutes * 60 - self.spent)
+
+    def bucket(self, url):
+        entry = self.products.get(crawl_journal.canonical_url(url))
+        return entry["bucket"] if entry else NEW_BUCKET
+
+    def is_due(self, url, now=None):
+        entry = self.products.get(crawl_journal.canonical_url(url))
+        return entry is None or entry["next_due"] <= (now or time.time())
+
+    def plan(self, items, key=None, now=None):
+        """
+        items içinden TTL'i dolmuş olanları öncelik sırasıyla (yeni, hot, warm,
+        cool, cold; kova içinde en çok geciken önce) döndürür ve listeyi kalan
+        günlük bütçeye sığacak kadar keser. key, öğeden URL'yi verir.
+        """
+        now = now or time.time()
+        key = key or (lambda item: item)
+        due = []
+        skipped = 0
+        for order, item in enumerate(items):
+            entry = self.products.get(crawl_journal.canonical_url(key(item)))
+            if entry is None:
+                due.append((0, 0, order, item))
+            elif entry["next_due"] <= now:
+                due.append((self._ranks.get(entry["bucket"], len(self._ranks)), entry["next_due"], order, item))
+            else:
+                skipped += 1
+        due.sort(key=lambda candidate: candidate[:3])
+        selected = [item for _, _, _, item in due]
+
+        left = self.budget_left()
+        if left is not None:
+            fits = int(left // max(self.avg_cost, 1e-3))
+            if fits < len(selected):
+                logging.info("Günlük bütçe %d ürüne yetiyor; %d ürün ertelendi.", fits, len(selected) - fits)
+                selected = selected[:fits]
+        logging.info("Yeniden tarama planı: %d ürün seçildi, %d ürünün süresi dolmamış.", len(selected), skipped)
+        return selected
+
+    def summary(self, now=None):
+        """Kova -> (ürün sayısı, süresi dolmuş) sözlüğü."""
+        now = now or time.time()
+        counts = {}
+        for entry in self.products.values():
+            total, due = counts.get(entry["bucket"], (0, 0))
+            counts[entry["bucket"]] = (total + 1, due + (1 if entry["next_due"] <= now else 0))
+        return counts
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    parser = argparse.ArgumentParser(description="Yeniden tarama zamanlayıcısı durum özeti")
+    parser.add_argument("path", nargs="?", default=DEFAULT_SCHEDULE_NAME, help="Zamanlayıcı durum dosyası")
+    args = parser.parse_args()
+
+    scheduler = RecrawlScheduler(args.path)
+    for name, _, ttl in DEFAULT_BUCKETS:
+        total, due = scheduler.summary().get(name, (0, 0))
+        logging.info("%-5s TTL %5.1f sa: %d ürün, %d ürünün süresi dolmuş.", name, ttl / 3600, total, due)
+    logging.info("Bugün harcanan: %.1f dk, ürün başına ortalama %.1f sn.", scheduler.spent / 60, scheduler.avg_cost)